@@ -14,6 +14,7 @@ class PostModel(admin.ModelAdmin):
         'location',
         'category',
         'is_published',
+        'is_visible',
         'created_at',
     )
 
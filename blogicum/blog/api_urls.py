@@ -0,0 +1,19 @@
+from django.urls import path
+
+from . import api_views
+
+app_name = 'api_v1'
+
+urlpatterns = [
+    path('posts/', api_views.PostListApiView.as_view(), name='posts'),
+    path('posts/<int:post_id>/', api_views.PostDetailApiView.as_view(),
+         name='post_detail'),
+    path('posts/<int:post_id>/comments/',
+         api_views.PostCommentsApiView.as_view(), name='post_comments'),
+    path('categories/', api_views.CategoryListApiView.as_view(),
+         name='categories'),
+    path('categories/<slug:category_slug>/posts/',
+         api_views.CategoryPostsApiView.as_view(), name='category_posts'),
+    path('profiles/<slug:username>/posts/',
+         api_views.ProfilePostsApiView.as_view(), name='profile_posts'),
+]
@@ -0,0 +1,144 @@
+"""Версионированный JSON API только для чтения.
+
+Представления наследуют HTML-страницы блога и отличаются только
+ответом: выборки, видимость публикаций и пагинация те же самые.
+Списки отдаются StreamingHttpResponse, элементы сериализуются
+по одному.
+"""
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.views.generic import ListView
+
+from blog.config import API_MAX_PAGE_SIZE
+from blog.models import Category
+from blog.pagination import page_query
+from blog.serializers import (
+    serialize_author, serialize_category, serialize_comment, serialize_post,
+    stream_json,
+)
+from blog.views import (
+    CategoryPostsView, PostCommentsView, PostDetailView, PostIndexView,
+    ProfileViews
+)
+
+
+class JsonListMixin:
+    """Отдаёт страницу списка потоковым JSON вместо шаблона."""
+
+    serialize = staticmethod(serialize_post)
+
+    def get_paginate_by(self, queryset):
+        try:
+            page_size = int(self.request.GET['page_size'])
+        except (KeyError, ValueError):
+            return super().get_paginate_by(queryset)
+        return max(1, min(page_size, API_MAX_PAGE_SIZE))
+
+    def page_link(self, **params):
+        return page_query(self.request.GET, **params)
+
+    def get_header(self, context):
+        page = context['page_obj']
+        if getattr(page, 'is_keyset', False):
+            return {
+                'next': self.page_link(after=page.next_cursor)
+                if page.has_next() else None,
+                'previous': self.page_link(before=page.previous_cursor)
+                if page.has_previous() else None,
+            }
+        paginator = page.paginator
+        return {
+            # Без точного подсчёта (PAGINATION_EXACT_COUNT) — null.
+            'count': paginator.count
+            if getattr(paginator, 'count_is_exact', True) else None,
+            'next': self.page_link(page=page.next_page_number())
+            if page.has_next() else None,
+            'previous': self.page_link(page=page.previous_page_number())
+            if page.has_previous() else None,
+        }
+
+    def get_items(self, context):
+        """Строки страницы для генератора ответа.
+
+        Под ASGI Django 3.2 читает потоковый ответ в цикле событий,
+        где ORM недоступен, поэтому строки выбираются заранее.
+        """
+        items = context['page_obj'].object_list
+        if isinstance(self.request, ASGIRequest):
+            return list(items)
+        if hasattr(items, 'iterator'):
+            return items.iterator()
+        return items
+
+    def render_to_response(self, context, **response_kwargs):
+        return StreamingHttpResponse(
+            stream_json(
+                self.get_header(context),
+                self.get_items(context),
+                self.serialize,
+            ),
+            content_type='application/json',
+        )
+
+
+class PostListApiView(JsonListMixin, PostIndexView):
+    """Лента публикаций, как на главной странице"""
+
+
+class CategoryPostsApiView(JsonListMixin, CategoryPostsView):
+    """Публикации категории"""
+
+    def get_header(self, context):
+        return {
+            'category': serialize_category(self.category),
+            **super().get_header(context),
+        }
+
+
+class ProfilePostsApiView(JsonListMixin, ProfileViews):
+    """Публикации автора; сам автор видит и скрытые"""
+
+    def get_header(self, context):
+        return {
+            'author': serialize_author(self.profile),
+            **super().get_header(context),
+        }
+
+
+class CategoryListApiView(JsonListMixin, ListView):
+    """Опубликованные категории"""
+
+    queryset = Category.objects.filter(is_published=True).order_by('title')
+    paginate_by = API_MAX_PAGE_SIZE
+    serialize = staticmethod(serialize_category)
+
+
+class PostDetailApiView(PostDetailView):
+    """Публикация и первая страница её комментариев"""
+
+    def render_to_response(self, context, **response_kwargs):
+        page = context['comments_page']
+        return JsonResponse(
+            {
+                **serialize_post(self.object),
+                'comments': [
+                    serialize_comment(comment) for comment in page.object_list
+                ],
+                'comments_next': reverse(
+                    'api_v1:post_comments', args=[self.object.id]
+                ) + page_query(self.request.GET, after=page.next_cursor)
+                if page.has_next() else None,
+            },
+            json_dumps_params={'ensure_ascii': False},
+        )
+
+
+class PostCommentsApiView(JsonListMixin, PostCommentsView):
+    """Следующие страницы комментариев по курсору"""
+
+    serialize = staticmethod(serialize_comment)
+
+    def render_to_response(self, context, **response_kwargs):
+        context['page_obj'] = context['comments_page']
+        return super().render_to_response(context, **response_kwargs)
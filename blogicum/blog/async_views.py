@@ -0,0 +1,221 @@
+"""Асинхронные варианты страниц чтения для запуска через ASGI.
+
+Представления наследуют синхронные CBV из blog.views и переиспользуют
+их выборки, шаблоны и кэш страниц, но независимые запросы к базе
+(число публикаций, строки страницы, автор или категория) выполняют
+одновременно в пуле потоков. Подключаются AsgiUrlconfMiddleware
+через settings.ASGI_URLCONF.
+"""
+import asyncio
+from functools import update_wrapper, wraps
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Page
+from django.db import close_old_connections
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+
+from blog.forms import CommentForm
+from blog.models import Category, Comment, Post, User
+from blog.post_filter_published import post_filter_count
+from blog.views import (
+    CategoryPostsView, PostDetailView, PostIndexView, ProfileViews
+)
+
+
+def run(func, *args, **kwargs):
+    """Выполняет синхронный func в отдельном потоке пула.
+
+    Потоки пула держат собственные соединения с базой, поэтому
+    после вызова они закрываются по тем же правилам, что и в конце
+    запроса (CONN_MAX_AGE).
+    """
+    @wraps(func)
+    def closing():
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(closing, thread_sensitive=False)()
+
+
+class AsyncPageMixin:
+    """Асинхронный dispatch с условным GET и кэшем страниц для анонимов.
+
+    Пользователь из сессии и кэш читаются в основном потоке
+    синхронного кода, шаблон рендерится там же: он может обращаться
+    к ленивым объектам запроса.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        """Django 3.2 считает CBV синхронными; отдаём корутинную функцию."""
+        view = super().as_view(**initkwargs)
+
+        async def async_view(request, *args, **kwargs):
+            return await view(request, *args, **kwargs)
+
+        return update_wrapper(async_view, view)
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return self.http_method_not_allowed(request, *args, **kwargs)
+        is_authenticated, validators = await sync_to_async(
+            lambda: (request.user.is_authenticated, self.get_validators())
+        )()
+        response = get_conditional_response(
+            request, etag=validators[0], last_modified=validators[1]
+        )
+        if response is None:
+            response = await self.get_page(request, is_authenticated)
+        return self.add_validators(response, *validators)
+
+    async def get_page(self, request, is_authenticated):
+        if is_authenticated:
+            return await self.get(request)
+        key = self.get_page_cache_key(request)
+        response = await sync_to_async(cache.get)(key)
+        if response is not None:
+            return response
+        response = await self.get(request)
+        if response.status_code == 200:
+            await sync_to_async(self.cache_page)(key, response)
+        return response
+
+    async def get(self, request, *args, **kwargs):
+        context = await self.get_context_data_async()
+        response = self.render_to_response(context)
+        await sync_to_async(response.render)()
+        return response
+
+
+class AsyncListMixin(AsyncPageMixin):
+    """Страница списка, где COUNT(*) и строки страницы идут параллельно."""
+
+    paginated = None
+
+    async def fetch(self, queryset, *others):
+        """Страница queryset и результаты others, вычисленные вместе."""
+        page_size = self.get_paginate_by(queryset)
+        if self.use_keyset_pagination():
+            results = await asyncio.gather(
+                run(self.paginate_keyset, queryset, page_size), *others
+            )
+            self.paginated = results[0]
+            return results[1:]
+        number = (
+            self.kwargs.get(self.page_kwarg)
+            or self.request.GET.get(self.page_kwarg)
+            or 1
+        )
+        paginator = self.get_paginator(queryset, page_size)
+        try:
+            number = int(number)
+        except ValueError:
+            # page=last и ошибки разбирает синхронная пагинация.
+            results = await asyncio.gather(
+                run(self.paginate_queryset, queryset, page_size), *others
+            )
+            self.paginated = results[0]
+            return results[1:]
+        paginator.bound_count(number)
+        bottom = (max(number, 1) - 1) * page_size
+        _, rows, *results = await asyncio.gather(
+            run(lambda: paginator.count),
+            run(lambda: list(queryset[bottom:bottom + page_size])),
+            *others,
+        )
+        try:
+            number = paginator.validate_number(number)
+        except InvalidPage as error:
+            raise Http404(str(error))
+        page = Page(rows, number, paginator)
+        self.paginated = (paginator, page, rows, page.has_other_pages())
+        return results
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.paginated is not None:
+            return self.paginated
+        return super().paginate_queryset(queryset, page_size)
+
+    def get_context_object_name(self, object_list):
+        return super().get_context_object_name(self.object_list)
+
+    async def get_context_data_async(self):
+        self.object_list = self.get_queryset()
+        await self.fetch(self.object_list)
+        return self.get_context_data()
+
+
+class AsyncPostIndexView(AsyncListMixin, PostIndexView):
+    """Главная страница: число публикаций и лента запрашиваются вместе."""
+
+
+class AsyncCategoryPostsView(AsyncListMixin, CategoryPostsView):
+    """Категория, её число публикаций и лента запрашиваются вместе."""
+
+    def get_queryset(self):
+        return super(CategoryPostsView, self).get_queryset().filter(
+            category__slug=self.kwargs['category_slug']
+        )
+
+    async def get_context_data_async(self):
+        self.object_list = self.get_queryset()
+        self.category, = await self.fetch(self.object_list, run(
+            get_object_or_404, Category,
+            slug=self.kwargs['category_slug'], is_published=True,
+        ))
+        return self.get_context_data()
+
+
+class AsyncProfileViews(AsyncListMixin, ProfileViews):
+    """Автор, число его публикаций и лента запрашиваются вместе.
+
+    Публикации выбираются по имени автора, а не по загруженному
+    объекту User, поэтому не ждут его.
+    """
+
+    def get_queryset(self):
+        return post_filter_count(
+            Post.objects.visible_to(self.request.user)
+        ).filter(author__username=self.kwargs['username'])
+
+    def get_count_signature(self):
+        return (
+            *super(ProfileViews, self).get_count_signature(),
+            self.request.user.get_username() == self.kwargs['username'],
+        )
+
+    async def get_context_data_async(self):
+        self.object_list = self.get_queryset()
+        self.profile, = await self.fetch(self.object_list, run(
+            get_object_or_404, User, username=self.kwargs['username']
+        ))
+        return self.get_context_data()
+
+
+class AsyncPostDetailView(AsyncPageMixin, PostDetailView):
+    """Публикация и первая страница комментариев запрашиваются вместе."""
+
+    async def get_context_data_async(self):
+        post_id = self.kwargs['post_id']
+        self.object, comments = await asyncio.gather(
+            run(self.get_object),
+            run(
+                self.paginate_keyset,
+                Comment.objects.filter(post_id=post_id)
+                .select_related('author'),
+                self.comments_paginate_by,
+            ),
+        )
+        _, comments_page, _, _ = comments
+        context = super(PostDetailView, self).get_context_data(
+            object=self.object
+        )
+        context['form'] = CommentForm()
+        context['comments_page'] = comments_page
+        context['comments'] = comments_page.object_list
+        return context
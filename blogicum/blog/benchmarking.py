@@ -0,0 +1,112 @@
+"""Замеры страниц блога для команд benchmark_*.
+
+Пороги хранятся в benchmark_thresholds.json рядом с модулем и
+проверяются командой benchmark_routes: для каждого маршрута —
+p95 задержки, SQL-запросы на запрос и размер ответа в байтах.
+Пороги в репозитории сняты на базе после
+``generate_data --seed 1 --posts 2000 --comments 10000``.
+"""
+import json
+import math
+import statistics
+import time
+from pathlib import Path
+
+from django.urls import URLPattern, URLResolver
+
+from blog.middleware import QueryCounter, wrap_queries
+
+THRESHOLDS_PATH = Path(__file__).with_name('benchmark_thresholds.json')
+# Проверяемые показатели и их подписи в отчёте.
+METRICS = {'p95_ms': 'p95, мс', 'queries': 'запросы', 'bytes': 'байты'}
+# Нижняя граница порога задержки: ответы из кэша быстрее шума замера.
+LATENCY_FLOOR_MS = 20
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(share * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def iter_routes(patterns, namespace):
+    """Имена маршрутов с пространством имён и их параметры."""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_routes(pattern.url_patterns, namespace)
+        elif isinstance(pattern, URLPattern):
+            yield (
+                f'{namespace}:{pattern.name}',
+                tuple(pattern.pattern.converters),
+            )
+
+
+def measure(client, url, repeat, before=None, warmup=1):
+    """Выполняет repeat GET-запросов к url и сводит их показатели.
+
+    Первые warmup запросов не учитываются: они наполняют кэши.
+    Потоковые ответы (ленты, API) читаются целиком: их SQL-запросы
+    и рендеринг происходят во время чтения. Считаются запросы ко всем
+    базам, включая реплики.
+    """
+    for _ in range(warmup):
+        b''.join(client.get(url))
+    timings, queries, sizes, statuses = [], [], [], set()
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        counter = QueryCounter()
+        with wrap_queries(counter):
+            started = time.perf_counter()
+            response = client.get(url)
+            if response.streaming:
+                size = sum(len(chunk) for chunk in response.streaming_content)
+            else:
+                size = len(response.content)
+            timings.append(time.perf_counter() - started)
+        response.close()
+        queries.append(counter.count)
+        sizes.append(size)
+        statuses.add(response.status_code)
+    return {
+        'status': ','.join(str(status) for status in sorted(statuses)),
+        'p50_ms': statistics.median(timings) * 1000,
+        'p95_ms': percentile(timings, 0.95) * 1000,
+        'p99_ms': percentile(timings, 0.99) * 1000,
+        'queries': max(queries),
+        'bytes': max(sizes),
+    }
+
+
+def load_thresholds(path=None):
+    try:
+        with open(path or THRESHOLDS_PATH, encoding='utf-8') as stream:
+            return json.load(stream)
+    except FileNotFoundError:
+        return {}
+
+
+def save_thresholds(thresholds, path=None):
+    with open(path or THRESHOLDS_PATH, 'w', encoding='utf-8') as stream:
+        json.dump(thresholds, stream, indent=2, sort_keys=True)
+        stream.write('\n')
+
+
+def limits(result, headroom):
+    """Пороги по результату замера с запасом headroom."""
+    return {
+        'p95_ms': max(
+            LATENCY_FLOOR_MS, math.ceil(result['p95_ms'] * headroom)
+        ),
+        'queries': result['queries'],
+        'bytes': math.ceil(result['bytes'] * headroom),
+    }
+
+
+def violations(result, thresholds):
+    """Показатели result, превысившие пороги thresholds."""
+    return [
+        f'{METRICS[metric]} {result[metric]:.0f} > {limit}'
+        for metric, limit in thresholds.items()
+        if metric in METRICS and result[metric] > limit
+    ]
@@ -0,0 +1,57 @@
+"""Версии групп данных, из которых строятся ключи кэша и ETag.
+
+Версии хранятся в кэше settings.VERSION_CACHE. Он должен быть общим
+для всех процессов сайта (Memcached, Redis, база): с LocMemCache
+каждый воркер видит только свои изменения и продолжает отдавать
+устаревшие страницы и ответы 304. Это проверяет check --deploy.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+
+POSTS_VERSION = 'posts'
+PAGES_VERSION = 'pages'
+RELATED_VERSION = 'related'
+
+
+def comments_version(post_id) -> str:
+    """Группа версий комментариев одной публикации."""
+    return f'comments:{post_id}'
+
+
+def version_cache():
+    return caches[getattr(settings, 'VERSION_CACHE', DEFAULT_CACHE_ALIAS)]
+
+
+def _version_key(name: str) -> str:
+    return f'blog:version:{name}'
+
+
+def get_version(name: str) -> float:
+    """Текущая версия группы данных (метка времени последнего изменения)."""
+    cache = version_cache()
+    key = _version_key(name)
+    version = cache.get(key)
+    if version is None:
+        version = time.time()
+        cache.add(key, version, timeout=None)
+        version = cache.get(key, version)
+    return version
+
+
+def bump_version(*names: str) -> None:
+    """Инвалидирует все ключи, построенные на версиях групп names."""
+    cache = version_cache()
+    for name in names:
+        key = _version_key(name)
+        version = max(time.time(), cache.get(key, 0) + 0.000001)
+        cache.set(key, version, timeout=None)
+
+
+def versioned_key(prefix: str, *parts, versions=(POSTS_VERSION,)) -> str:
+    """Ключ кэша, который устаревает при смене любой из версий."""
+    digest = hashlib.md5(repr(parts).encode()).hexdigest()
+    stamp = ':'.join(repr(get_version(name)) for name in versions)
+    return f'{prefix}:{digest}:{stamp}'
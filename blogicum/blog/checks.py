@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Tags, Warning, register
+
+
+@register(Tags.caches, deploy=True)
+def check_version_cache(app_configs, **kwargs):
+    """Версии данных (blog.cache) должны быть общими для процессов."""
+    alias = getattr(settings, 'VERSION_CACHE', DEFAULT_CACHE_ALIAS)
+    if not isinstance(caches[alias], (LocMemCache, DummyCache)):
+        return []
+    return [Warning(
+        f'Кэш версий данных «{alias}» не общий для процессов сайта.',
+        hint=(
+            'Укажите в settings.VERSION_CACHE кэш на Memcached, Redis'
+            ' или базе: иначе воркеры, не обработавшие изменение,'
+            ' отдают устаревшие страницы и ответы 304.'
+        ),
+        id='blog.W001',
+    )]
@@ -1,6 +1,31 @@
 MAX_LINE_SIZE: int = 256
 LINE_SLICE: int = 15
 POST_SLICE: int = 10
+COMMENT_SLICE: int = 20
 TEXT_SLICE: int = 50
 COLS_SLICE: int = 10
 ROWS_SLICE: int = 5
+# Режим пагинации лент: 'offset' (номера страниц) или 'keyset' (курсор).
+PAGINATION_MODE: str = 'offset'
+# Номера страниц в пагинаторе по обе стороны от текущей.
+PAGINATION_WINDOW: int = 2
+# False — не считать все публикации: пагинатор показывает только окно
+# вокруг текущей страницы, без ссылки на последнюю.
+PAGINATION_EXACT_COUNT: bool = True
+# Время жизни закэшированного числа публикаций для пагинатора, секунды.
+COUNT_CACHE_TIMEOUT: int = 60 * 15
+# Время жизни закэшированной страницы для анонимных посетителей, секунды.
+PAGE_CACHE_TIMEOUT: int = 60 * 5
+# Уменьшенные копии картинок публикаций: имя -> ширина в пикселях.
+IMAGE_VARIANTS: dict = {'card': 640, 'detail': 960, 'full': 1600}
+# Форматы копий в порядке предпочтения; берётся первый доступный в Pillow.
+IMAGE_FORMATS: tuple = ('WEBP', 'JPEG')
+IMAGE_QUALITY: int = 80
+# Наибольший размер страницы, который клиент API может запросить.
+API_MAX_PAGE_SIZE: int = 100
+# Число публикаций в RSS/Atom-лентах и время жизни их кэша, секунды.
+FEED_SIZE: int = 20
+FEED_CACHE_TIMEOUT: int = 60 * 60
+# Движок шаблонов лент, страницы публикации и комментариев:
+# 'django' или 'jinja2' (копии шаблонов в jinja2/, см. blog.templating).
+FEED_TEMPLATE_ENGINE: str = 'django'
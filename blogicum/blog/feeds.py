@@ -0,0 +1,187 @@
+"""RSS- и Atom-ленты публикаций: всего сайта, категории и автора.
+
+Готовый XML хранится в кэше на версии страниц, которую меняют
+сигналы Post, Comment и связанных моделей; валидаторы условного
+GET строятся из той же версии.
+"""
+import copy
+from io import StringIO
+
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import (
+    Atom1Feed, Rss201rev2Feed, SimplerXMLGenerator
+)
+
+from blog.cache import PAGES_VERSION, versioned_key
+from blog.config import FEED_CACHE_TIMEOUT, FEED_SIZE
+from blog.mixins import add_validators, get_validators
+from blog.models import Category, User
+from blog.post_filter_published import post_published
+
+
+class StreamingFeedMixin:
+    """Пишет ленту по частям: заголовок, каждый элемент, окончание."""
+
+    closing_tag = None
+
+    def stream(self, encoding):
+        latest = self.latest_post_date()
+        items, self.items = self.items, []
+        self.latest_post_date = lambda: latest
+        document = StringIO()
+        self.write(document, encoding)
+        head, tail = document.getvalue().rsplit(self.closing_tag, 1)
+        yield head
+        for item in items:
+            chunk = StringIO()
+            self.items = [item]
+            self.write_items(SimplerXMLGenerator(chunk, encoding))
+            yield chunk.getvalue()
+        yield self.closing_tag + tail
+
+
+class StreamingRssFeed(StreamingFeedMixin, Rss201rev2Feed):
+    closing_tag = '</channel>'
+
+
+class StreamingAtomFeed(StreamingFeedMixin, Atom1Feed):
+    closing_tag = '</feed>'
+
+
+FEED_TYPES = {
+    'rss': StreamingRssFeed,
+    'atom': StreamingAtomFeed,
+}
+
+
+class FeedFormatConverter:
+    regex = 'rss|atom'
+
+    def to_python(self, value):
+        return value
+
+    def to_url(self, value):
+        return value
+
+
+class PostFeed(Feed):
+    """Последние публикации сайта"""
+
+    title = 'Блогикум'
+    description = 'Новые публикации в Блогикуме'
+    feed_versions = (PAGES_VERSION,)
+
+    def __call__(self, request, feed_format, *args, **kwargs):
+        etag, last_modified = get_validators(request, self.feed_versions)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = self.get_response(request, feed_format, args, kwargs)
+        return add_validators(response, etag, last_modified)
+
+    def get_response(self, request, feed_format, args, kwargs):
+        key = versioned_key(
+            'feed', request.path, versions=self.feed_versions
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+        feed = copy.copy(self)
+        feed.feed_type = FEED_TYPES[feed_format]
+        generator = feed.get_feed(
+            feed.get_object(request, *args, **kwargs), request
+        )
+        content_type = generator.content_type
+        return StreamingHttpResponse(
+            self.cache_chunks(key, content_type, generator.stream('utf-8')),
+            content_type=content_type,
+        )
+
+    @staticmethod
+    def cache_chunks(key, content_type, chunks):
+        """Отдаёт части ленты и кладёт в кэш собранный документ."""
+        content = []
+        for chunk in chunks:
+            content.append(chunk)
+            yield chunk
+        cache.set(key, (''.join(content), content_type), FEED_CACHE_TIMEOUT)
+
+    def link(self):
+        return reverse('blog:index')
+
+    def get_queryset(self, obj):
+        return post_published()
+
+    def items(self, obj):
+        return self.get_queryset(obj)[:FEED_SIZE]
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return post.text
+
+    def item_link(self, post):
+        return reverse('blog:post_detail', args=[post.id])
+
+    def item_author_name(self, post):
+        return post.author.get_full_name() or post.author.username
+
+    def item_author_link(self, post):
+        return reverse('blog:profile', args=[post.author.username])
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_updateddate(self, post):
+        return post.updated_at
+
+    def item_categories(self, post):
+        return (post.category.title,) if post.category else ()
+
+
+class CategoryFeed(PostFeed):
+    """Последние публикации категории"""
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True
+        )
+
+    def title(self, category):
+        return f'{category.title} | Блогикум'
+
+    def description(self, category):
+        return category.description
+
+    def link(self, category):
+        return reverse('blog:category_posts', args=[category.slug])
+
+    def get_queryset(self, category):
+        return post_published().filter(category=category)
+
+
+class AuthorFeed(PostFeed):
+    """Последние публикации автора"""
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, author):
+        return f'{author.get_full_name() or author.username} | Блогикум'
+
+    def description(self, author):
+        return f'Публикации пользователя {author.username}'
+
+    def link(self, author):
+        return reverse('blog:profile', args=[author.username])
+
+    def get_queryset(self, author):
+        return post_published().filter(author=author)
@@ -0,0 +1,76 @@
+"""Потоковое чтение фикстур Django в формате JSON (как db.json).
+
+Документ — массив объектов {"model", "pk", "fields"}; он разбирается
+по одному объекту, поэтому память не зависит от размера файла.
+"""
+import json
+
+_WHITESPACE = ' \t\r\n'
+_decoder = json.JSONDecoder()
+
+
+class _Buffer:
+    """Окно в текстовый поток, которое дочитывается по мере разбора."""
+
+    def __init__(self, stream, chunk_size):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.text = ''
+        self.position = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Дочитывает следующий кусок; False, если поток закончился."""
+        chunk = self.stream.read(self.chunk_size)
+        self.eof = not chunk
+        self.text = self.text[self.position:] + chunk
+        self.position = 0
+        return not self.eof
+
+    def peek(self) -> str:
+        """Следующий непробельный символ или '' в конце потока."""
+        while True:
+            while (
+                self.position < len(self.text)
+                and self.text[self.position] in _WHITESPACE
+            ):
+                self.position += 1
+            if self.position < len(self.text):
+                return self.text[self.position]
+            if not self.fill():
+                return ''
+
+    def skip(self):
+        self.position += 1
+
+    def decode(self):
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.position)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # Значение на краю окна может быть обрезано: дочитываем.
+            if end == len(self.text) and self.fill():
+                continue
+            self.position = end
+            return value
+
+
+def iter_json_array(stream, chunk_size=1 << 16):
+    """Элементы JSON-массива из текстового потока stream."""
+    buffer = _Buffer(stream, chunk_size)
+    if buffer.peek() != '[':
+        raise ValueError('Фикстура должна быть JSON-массивом')
+    buffer.skip()
+    while True:
+        char = buffer.peek()
+        if char == ']':
+            return
+        if not char:
+            raise ValueError('Фикстура оборвалась до конца массива')
+        if char == ',':
+            buffer.skip()
+            continue
+        yield buffer.decode()
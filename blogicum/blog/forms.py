@@ -1,7 +1,13 @@
 from django import forms
+from django.contrib.auth.forms import PasswordResetForm
+from django.template import loader
 
 from blog.config import COLS_SLICE, ROWS_SLICE
+from blog.images import delete_variants, original_variant
 from blog.models import Comment, Post
+from blog.tasks import build_post_image_variants, send_email
+from jobs.config import PRIORITY_HIGH
+from jobs.queue import enqueue
 
 
 class PostForm(forms.ModelForm):
@@ -16,6 +22,26 @@ class PostForm(forms.ModelForm):
             )
         }
 
+    def save(self, commit=True):
+        post = super().save(commit)
+        if commit and 'image' in self.changed_data:
+            self.update_image_variants(post)
+        return post
+
+    @staticmethod
+    def update_image_variants(post):
+        """Удаляет копии прежней картинки и ставит сборку новых в очередь.
+
+        До работы воркера страницы показывают новый оригинал.
+        """
+        delete_variants(post.image_variants)
+        post.image_variants = (
+            original_variant(post.image) if post.image else {}
+        )
+        post.save(update_fields=('image_variants', 'updated_at'))
+        if post.image:
+            enqueue(build_post_image_variants, post.pk, post.image.name)
+
 
 class CommentForm(forms.ModelForm):
 
@@ -25,3 +51,23 @@ class CommentForm(forms.ModelForm):
         widgets = {
             'text': forms.Textarea({'cols': COLS_SLICE, 'rows': ROWS_SLICE}),
         }
+
+
+class QueuedPasswordResetForm(PasswordResetForm):
+    """Письмо со ссылкой собирается в запросе, а отправляется воркером."""
+
+    def send_mail(self, subject_template_name, email_template_name,
+                  context, from_email, to_email,
+                  html_email_template_name=None):
+        subject = ''.join(
+            loader.render_to_string(subject_template_name, context)
+            .splitlines()
+        )
+        body = loader.render_to_string(email_template_name, context)
+        html = None
+        if html_email_template_name is not None:
+            html = loader.render_to_string(html_email_template_name, context)
+        enqueue(
+            send_email, subject, body, from_email, [to_email], html=html,
+            priority=PRIORITY_HIGH,
+        )
@@ -0,0 +1,95 @@
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from blog.config import IMAGE_FORMATS, IMAGE_QUALITY, IMAGE_VARIANTS
+
+ORIGINAL = 'original'
+EXIF_ORIENTATION = 0x0112
+EXTENSIONS = {'WEBP': 'webp', 'AVIF': 'avif', 'JPEG': 'jpg'}
+
+
+def pick_format() -> str:
+    """Первый формат из IMAGE_FORMATS, который умеет сохранять Pillow."""
+    Image.init()
+    for image_format in IMAGE_FORMATS:
+        if image_format in Image.SAVE:
+            return image_format
+    return 'JPEG'
+
+
+def build_variants(image_field) -> dict:
+    """Сохраняет уменьшенные копии картинки и возвращает их описание.
+
+    Копии не бывают шире оригинала; одинаковые по ширине не дублируются.
+    Размеры самого оригинала лежат под ключом ORIGINAL.
+    """
+    image_format = pick_format()
+    extension = EXTENSIONS.get(image_format, image_format.lower())
+    image_field.open()
+    with Image.open(image_field) as original:
+        original = ImageOps.exif_transpose(original)
+        if image_format == 'JPEG' or original.mode not in ('RGB', 'RGBA'):
+            original = original.convert('RGB')
+        source = PurePosixPath(image_field.name)
+        variants = {
+            ORIGINAL: {
+                'name': image_field.name,
+                'width': original.width,
+                'height': original.height,
+            }
+        }
+        widths = {}
+        for name, width in IMAGE_VARIANTS.items():
+            width = min(width, original.width)
+            if width in widths:
+                variants[name] = widths[width]
+                continue
+            resized = original.copy()
+            resized.thumbnail((width, original.height * width))
+            buffer = BytesIO()
+            resized.save(buffer, image_format, quality=IMAGE_QUALITY)
+            path = default_storage.save(
+                str(source.parent / 'variants' / f'{source.stem}_{name}.'
+                    f'{extension}'),
+                ContentFile(buffer.getvalue())
+            )
+            variants[name] = widths[width] = {
+                'name': path,
+                'width': resized.width,
+                'height': resized.height,
+            }
+    return variants
+
+
+def original_variant(image_field) -> dict:
+    """Описание одного оригинала, пока копии не собраны.
+
+    Размеры читаются из заголовка файла с учётом поворота из EXIF,
+    как их получает build_variants.
+    """
+    image_field.open()
+    with Image.open(image_field) as original:
+        width, height = original.size
+        if original.getexif().get(EXIF_ORIENTATION) in (5, 6, 7, 8):
+            width, height = height, width
+    return {
+        ORIGINAL: {'name': image_field.name, 'width': width, 'height': height}
+    }
+
+
+def delete_variants(variants: dict) -> None:
+    """Удаляет файлы копий, не трогая оригинал."""
+    paths = {
+        variant['name'] for name, variant in variants.items()
+        if name != ORIGINAL
+    }
+    for path in paths:
+        default_storage.delete(path)
+
+
+def variant_url(variant: dict) -> str:
+    return default_storage.url(variant['name'])
@@ -0,0 +1,65 @@
+"""Пересчёт денормализованных данных после массовой загрузки.
+
+bulk_create, update() и loaddata (raw=True) не вызывают Post.save()
+и сигналы, поэтому после них is_visible, comment_count, индекс поиска
+и версии кэша нужно привести в порядок отдельно.
+"""
+import contextlib
+
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.cache import (
+    PAGES_VERSION, POSTS_VERSION, RELATED_VERSION, bump_version
+)
+from blog.models import Comment, Post
+from blog.post_filter_published import refresh_visibility
+from blog.search import is_available, rebuild_index
+
+
+@contextlib.contextmanager
+def keep_auto_dates(models):
+    """Отключает auto_now и auto_now_add, чтобы сохранить даты из файла.
+
+    bulk_create, в отличие от loaddata, вызывает pre_save у полей
+    и перезаписал бы created_at и updated_at текущим временем.
+    Возвращает множество отключённых полей.
+    """
+    changed = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            flags = {
+                name: getattr(field, name)
+                for name in ('auto_now', 'auto_now_add')
+                if getattr(field, name, False)
+            }
+            if flags:
+                changed.append((field, flags))
+                for name in flags:
+                    setattr(field, name, False)
+    try:
+        yield {field for field, _ in changed}
+    finally:
+        for field, flags in changed:
+            for name, value in flags.items():
+                setattr(field, name, value)
+
+
+def recount_comments(queryset=None) -> int:
+    """Пересчитывает Post.comment_count и возвращает число публикаций."""
+    if queryset is None:
+        queryset = Post.objects.all()
+    comments = Comment.objects.filter(
+        post=OuterRef('pk')
+    ).order_by().values('post').annotate(
+        total=Count('pk')
+    ).values('total')
+    return queryset.update(comment_count=Coalesce(Subquery(comments), 0))
+
+
+def rebuild_derived_data() -> None:
+    refresh_visibility()
+    recount_comments()
+    if is_available():
+        rebuild_index(Post.objects.all())
+    bump_version(POSTS_VERSION, PAGES_VERSION, RELATED_VERSION)
@@ -0,0 +1,158 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from blog.benchmarking import percentile
+from blogicum.asgi import application as asgi_application
+from blogicum.wsgi import application as wsgi_application
+
+HOST = 'localhost'
+# Адрес не из INTERNAL_IPS, чтобы не включалась debug-панель.
+CLIENT_ADDR = '10.0.0.1'
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает blogicum/wsgi.py и blogicum/asgi.py под параллельной'
+        ' нагрузкой: запросы идут прямо в приложения, без HTTP-сервера.'
+        ' Печатает запросы в секунду и задержки p50/p99.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths',
+            nargs='*',
+            default=['/'],
+            help='Адреса для проверки.',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Запросов на каждый адрес и точку входа.',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=16,
+            help='Одновременных запросов.',
+        )
+        parser.add_argument(
+            '--user',
+            help=(
+                'Имя пользователя, от которого идут запросы: анонимам'
+                ' страницы отдаются из кэша.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if settings.DEBUG:
+            self.stderr.write(
+                'DEBUG включён: журнал SQL и синхронные отладочные'
+                ' middleware искажают результат.'
+            )
+        cookie = self.session_cookie(options['user'])
+        total = options['requests']
+        concurrency = options['concurrency']
+        self.stdout.write(
+            f'{"адрес":<32} {"вход":<5} {"rps":>8} {"p50, мс":>9}'
+            f' {"p99, мс":>9} {"ошибки":>7}'
+        )
+        for path in options['paths']:
+            for name, bench in (('wsgi', self.wsgi), ('asgi', self.asgi)):
+                started = time.perf_counter()
+                results = bench(path, cookie, total, concurrency)
+                elapsed = time.perf_counter() - started
+                timings = [timing for _, timing in results]
+                errors = sum(status >= 400 for status, _ in results)
+                self.stdout.write(
+                    f'{path:<32} {name:<5} {total / elapsed:>8.1f}'
+                    f' {statistics.median(timings) * 1000:>9.1f}'
+                    f' {percentile(timings, 0.99) * 1000:>9.1f}'
+                    f' {errors:>7}'
+                )
+
+    def session_cookie(self, username):
+        if not username:
+            return ''
+        user = get_user_model().objects.filter(username=username).first()
+        if user is None:
+            raise CommandError(f'Пользователь {username} не найден.')
+        client = Client()
+        client.force_login(user)
+        cookie = client.cookies[settings.SESSION_COOKIE_NAME]
+        return f'{settings.SESSION_COOKIE_NAME}={cookie.value}'
+
+    @staticmethod
+    def wsgi(path, cookie, total, concurrency):
+        def call(_):
+            environ = {
+                'PATH_INFO': path.split('?')[0],
+                'QUERY_STRING': path.partition('?')[2],
+                'HTTP_HOST': HOST,
+                'REMOTE_ADDR': CLIENT_ADDR,
+                'HTTP_COOKIE': cookie,
+            }
+            setup_testing_defaults(environ)
+            status = []
+            started = time.perf_counter()
+            body = wsgi_application(
+                environ, lambda code, headers, *_: status.append(code)
+            )
+            for _ in body:
+                pass
+            body.close()
+            return int(status[0].split()[0]), time.perf_counter() - started
+
+        with ThreadPoolExecutor(concurrency) as pool:
+            return list(pool.map(call, range(total)))
+
+    @staticmethod
+    def asgi(path, cookie, total, concurrency):
+        path, _, query = path.partition('?')
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': query.encode(),
+            'headers': [
+                (b'host', HOST.encode()),
+                (b'cookie', cookie.encode()),
+            ],
+            'client': (CLIENT_ADDR, 50000),
+            'server': (HOST, 80),
+        }
+
+        async def call(semaphore):
+            status = []
+
+            async def receive():
+                return {'type': 'http.request', 'body': b''}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+
+            async with semaphore:
+                started = time.perf_counter()
+                await asgi_application(dict(scope), receive, send)
+                return status[0], time.perf_counter() - started
+
+        async def main():
+            semaphore = asyncio.Semaphore(concurrency)
+            return await asyncio.gather(
+                *(call(semaphore) for _ in range(total))
+            )
+
+        return asyncio.run(main())
@@ -0,0 +1,186 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F
+from django.test import Client
+from django.urls import NoReverseMatch, reverse
+
+from blog import urls as blog_urls
+from blog.benchmarking import (
+    iter_routes, limits, load_thresholds, measure, save_thresholds,
+    violations,
+)
+from blog.models import Comment, Post
+from pages import urls as pages_urls
+
+from .benchmark_entrypoints import CLIENT_ADDR, HOST
+
+# Маршруты, которым для осмысленной страницы нужна строка запроса.
+ROUTE_QUERIES = {'blog:search': 'q={word}'}
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогоняет каждый маршрут blog/urls.py и pages/urls.py через'
+        ' тестовый клиент Django на текущей базе (см. generate_data)'
+        ' и печатает задержки p50/p95/p99, SQL-запросы на запрос'
+        ' и размер ответа. Запросы только GET: формы отображаются,'
+        ' но ничего не меняют. Если показатели превышают пороги из'
+        ' blog/benchmark_thresholds.json для режима (user, anonymous,'
+        ' с суффиксом -cold при --cold), команда завершается с ошибкой.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'routes',
+            nargs='*',
+            help='Проверить только эти маршруты (например, blog:index).',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=20,
+            help='Запросов на каждый маршрут.',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=1,
+            help='Неучитываемых запросов перед замером.',
+        )
+        parser.add_argument(
+            '--anonymous',
+            action='store_true',
+            help=(
+                'Запросы от анонима: страницы отдаются из кэша, закрытые'
+                ' маршруты перенаправляют на вход.'
+            ),
+        )
+        parser.add_argument(
+            '--cold',
+            action='store_true',
+            help='Очищать кэш перед каждым запросом.',
+        )
+        parser.add_argument(
+            '--update-thresholds',
+            action='store_true',
+            help='Записать пороги по результатам вместо проверки.',
+        )
+        parser.add_argument(
+            '--headroom',
+            type=float,
+            default=2.0,
+            help='Запас для задержки и размера при --update-thresholds.',
+        )
+
+    def handle(self, *args, **options):
+        if settings.DEBUG:
+            self.stderr.write(
+                'DEBUG включён: журнал SQL и debug-панель искажают'
+                ' задержки.'
+            )
+        sample = self.sample()
+        client = Client(HTTP_HOST=HOST, REMOTE_ADDR=CLIENT_ADDR)
+        mode = 'anonymous' if options['anonymous'] else 'user'
+        if options['cold']:
+            mode += '-cold'
+        if not options['anonymous']:
+            client.force_login(sample['user'])
+        before = cache.clear if options['cold'] else None
+        thresholds = load_thresholds()
+        current = thresholds.get(mode, {})
+        results = {}
+        failures = []
+        self.stdout.write(
+            f'{"маршрут":<24} {"код":>7} {"p50, мс":>8} {"p95, мс":>8}'
+            f' {"p99, мс":>8} {"запросы":>7} {"байты":>8}'
+        )
+        for name, url in self.urls(sample, options['routes']):
+            result = results[name] = measure(
+                client, url, options['requests'], before, options['warmup']
+            )
+            self.stdout.write(
+                f'{name:<24} {result["status"]:>7}'
+                f' {result["p50_ms"]:>8.1f} {result["p95_ms"]:>8.1f}'
+                f' {result["p99_ms"]:>8.1f} {result["queries"]:>7}'
+                f' {result["bytes"]:>8}'
+            )
+            failures.extend(
+                f'{name}: {problem}'
+                for problem in violations(result, current.get(name, {}))
+            )
+        if options['update_thresholds']:
+            thresholds[mode] = {
+                **current,
+                **{
+                    name: limits(result, options['headroom'])
+                    for name, result in results.items()
+                },
+            }
+            save_thresholds(thresholds)
+            self.stdout.write(self.style.SUCCESS('Пороги обновлены.'))
+        elif failures:
+            raise CommandError(
+                'Превышены пороги:\n' + '\n'.join(failures)
+            )
+
+    @staticmethod
+    def sample():
+        """Объекты для параметров маршрутов.
+
+        Берётся самая обсуждаемая видимая публикация, которую автор
+        сам комментировал: тогда страницы редактирования поста
+        и комментария открываются у него без перенаправления.
+        """
+        comment = (
+            Comment.objects.filter(
+                post__is_visible=True, author=F('post__author')
+            )
+            .select_related('post__author', 'post__category')
+            .order_by('-post__comment_count', 'pk')
+            .first()
+        )
+        if comment is not None:
+            post = comment.post
+        else:
+            post = (
+                Post.objects.published()
+                .select_related('author', 'category')
+                .order_by('-comment_count').first()
+            )
+            comment = post and post.comments.order_by('pk').first()
+        if post is None or comment is None:
+            raise CommandError(
+                'Нет видимых публикаций с комментариями:'
+                ' заполните базу командой generate_data.'
+            )
+        return {
+            'user': post.author,
+            'word': post.title.split()[0],
+            'kwargs': {
+                'post_id': post.id,
+                'comment_id': comment.id,
+                'username': post.author.username,
+                'category_slug': post.category.slug,
+                'feed_format': 'rss',
+            },
+        }
+
+    @staticmethod
+    def urls(sample, only):
+        routes = [
+            *iter_routes(blog_urls.urlpatterns, blog_urls.app_name),
+            *iter_routes(pages_urls.urlpatterns, pages_urls.app_name),
+        ]
+        for name, keys in routes:
+            if only and name not in only:
+                continue
+            try:
+                url = reverse(name, kwargs={
+                    key: sample['kwargs'][key] for key in keys
+                })
+            except (KeyError, NoReverseMatch) as error:
+                raise CommandError(f'Не удалось построить {name}: {error}')
+            if name in ROUTE_QUERIES:
+                url += '?' + ROUTE_QUERIES[name].format(**sample)
+            yield name, url
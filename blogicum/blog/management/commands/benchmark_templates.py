@@ -0,0 +1,110 @@
+import statistics
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.template import engines
+from django.test import RequestFactory
+from django.urls import resolve
+
+from blog.benchmarking import percentile
+from blog.cache import RELATED_VERSION, get_version
+from blog.config import POST_SLICE
+from blog.pagination import CachedCountPaginator
+from blog.post_filter_published import post_published
+
+ENGINES = ('django', 'jinja2')
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время рендеринга страницы ленты шаблонами Django'
+        ' и их копиями для Jinja2 на одном и том же контексте: строки'
+        ' страницы выбираются заранее, SQL в замер не попадает.'
+        ' cold — кэш фрагментов {% cache %} очищается перед каждым'
+        ' рендерингом, warm — карточки берутся из кэша.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'templates',
+            nargs='*',
+            default=['blog/index.html'],
+            help=(
+                'Шаблоны лент: blog/index.html, blog/category.html,'
+                ' blog/profile.html или blog/search.html.'
+            ),
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Рендерингов на шаблон, движок и режим.',
+        )
+        parser.add_argument('--page', type=int, default=1)
+
+    def handle(self, *args, **options):
+        missing = [name for name in ENGINES if name not in engines.templates]
+        if missing:
+            raise CommandError(
+                f'Движок {", ".join(missing)} не настроен: установите Jinja2.'
+            )
+        context = self.get_context(options['page'])
+        request = RequestFactory().get('/', HTTP_HOST='localhost')
+        request.user = AnonymousUser()
+        request.resolver_match = resolve('/')
+        self.stdout.write(
+            f'{"шаблон":<20} {"движок":<7} {"режим":<5} {"p50, мс":>8}'
+            f' {"p95, мс":>8} {"ускорение":>10}'
+        )
+        for name in options['templates']:
+            outputs = set()
+            for mode in ('cold', 'warm'):
+                medians = {}
+                for engine in ENGINES:
+                    template = engines[engine].get_template(name)
+                    timings = []
+                    for _ in range(options['requests']):
+                        if mode == 'cold':
+                            cache.clear()
+                        started = time.perf_counter()
+                        html = template.render(context, request)
+                        timings.append(time.perf_counter() - started)
+                    outputs.add(html)
+                    medians[engine] = statistics.median(timings)
+                    speedup = medians[ENGINES[0]] / medians[engine]
+                    self.stdout.write(
+                        f'{name:<20} {engine:<7} {mode:<5}'
+                        f' {medians[engine] * 1000:>8.2f}'
+                        f' {percentile(timings, 0.95) * 1000:>8.2f}'
+                        f' {speedup:>9.2f}x'
+                    )
+            if len(outputs) > 1:
+                self.stderr.write(
+                    f'{name}: HTML движков различается, сравнение'
+                    ' некорректно.'
+                )
+
+    @staticmethod
+    def get_context(number):
+        paginator = CachedCountPaginator(post_published(), POST_SLICE)
+        page = paginator.page(number)
+        page.object_list = list(page.object_list)
+        if not page.object_list:
+            raise CommandError(
+                'Нет публикаций: заполните базу командой generate_data.'
+            )
+        # Число страниц тоже считается до замера.
+        paginator.num_pages
+        post = page.object_list[0]
+        return {
+            'category': post.category,
+            'profile': post.author,
+            'query': '',
+            'related_version': get_version(RELATED_VERSION),
+            'page_obj': page,
+            'paginator': paginator,
+            'is_paginated': page.has_other_pages(),
+            'object_list': page.object_list,
+        }
@@ -0,0 +1,112 @@
+import itertools
+import sys
+import time
+
+from django.apps import apps
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает данные в формате db.json потоком: строки читаются'
+        ' через QuerySet.iterator() пачками и сразу пишутся в файл.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'labels',
+            nargs='*',
+            help='Приложения или модели (app или app.Model); по умолчанию'
+                 ' все.',
+        )
+        parser.add_argument(
+            '-o', '--output',
+            default='-',
+            help='Файл для выгрузки; по умолчанию stdout.',
+        )
+        parser.add_argument(
+            '-e', '--exclude',
+            action='append',
+            default=[],
+            help='Пропустить приложение или модель.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Строк в одной выборке iterator().',
+        )
+        parser.add_argument('--indent', type=int, default=2)
+        parser.add_argument(
+            '--progress-every',
+            type=int,
+            default=10000,
+            help='Сообщать о ходе выгрузки каждые N объектов (0 — нет).',
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        models = self.get_models(options['labels'], options['exclude'])
+        querysets = (
+            model._base_manager.using(options['database']).order_by(
+                model._meta.pk.name
+            ).iterator(chunk_size=options['chunk_size'])
+            for model in models
+        )
+        objects = self.progress(
+            itertools.chain.from_iterable(querysets),
+            options['progress_every'],
+        )
+        if options['output'] == '-':
+            self.write(objects, sys.stdout, options['indent'])
+        else:
+            with open(options['output'], 'w', encoding='utf-8') as stream:
+                self.write(objects, stream, options['indent'])
+        self.stderr.write(f'Выгружено объектов: {self.total}')
+
+    @staticmethod
+    def write(objects, stream, indent):
+        serializers.serialize(
+            'json', objects, stream=stream, indent=indent,
+        )
+        stream.write('\n')
+
+    @staticmethod
+    def get_models(labels, exclude):
+        try:
+            if labels:
+                models = []
+                for label in labels:
+                    if '.' in label:
+                        models.append(apps.get_model(label))
+                    else:
+                        models.extend(
+                            apps.get_app_config(label).get_models()
+                        )
+            else:
+                models = [
+                    model for model in apps.get_models()
+                    if not model._meta.proxy and model._meta.managed
+                ]
+        except LookupError as error:
+            raise CommandError(str(error))
+        excluded = {label.lower() for label in exclude}
+        return serializers.sort_dependencies([
+            (None, [model]) for model in models
+            if model._meta.label_lower not in excluded
+            and model._meta.app_label not in excluded
+        ])
+
+    def progress(self, objects, every):
+        self.total = 0
+        started = time.monotonic()
+        for self.total, obj in enumerate(objects, 1):
+            if every and self.total % every == 0:
+                elapsed = time.monotonic() - started
+                self.stderr.write(
+                    f'Выгружено объектов: {self.total}'
+                    f' ({self.total / max(elapsed, 1e-9):.0f} в секунду)'
+                )
+            yield obj
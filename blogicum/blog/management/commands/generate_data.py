@@ -0,0 +1,235 @@
+import datetime
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from faker import Faker
+
+from blog.maintenance import keep_auto_dates, rebuild_derived_data
+from blog.models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+
+def share(value):
+    value = float(value)
+    if not 0 <= value <= 1:
+        raise ValueError(value)
+    return value
+
+
+def zipf_weights(count, skew):
+    """Веса рангов 1..count по закону Ципфа: первые забирают почти всё."""
+    return [1 / rank ** skew for rank in range(1, count + 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу правдоподобными данными Faker для нагрузочных'
+        ' проверок: пользователи, категории, местоположения, публикации'
+        ' (часть скрыта или отложена) и комментарии, сосредоточенные'
+        ' на немногих популярных публикациях.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--locations', type=int, default=20)
+        parser.add_argument('--posts', type=int, default=1000)
+        parser.add_argument('--comments', type=int, default=5000)
+        parser.add_argument(
+            '--unpublished',
+            type=share,
+            default=0.1,
+            help='Доля снятых с публикации постов и категорий.',
+        )
+        parser.add_argument(
+            '--scheduled',
+            type=share,
+            default=0.1,
+            help='Доля отложенных публикаций с датой в будущем.',
+        )
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=1.1,
+            help=(
+                'Показатель закона Ципфа для комментариев: 0 — поровну,'
+                ' больше 1 — почти всё у самых популярных публикаций.'
+            ),
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=365,
+            help='На сколько дней в прошлое растягиваются публикации.',
+        )
+        parser.add_argument(
+            '--password',
+            default='benchmark',
+            help='Пароль всех созданных пользователей.',
+        )
+        parser.add_argument('--locale', default='ru_RU')
+        parser.add_argument('--seed', type=int)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.random = random.Random(options['seed'])
+        self.fake = Faker(options['locale'])
+        if options['seed'] is not None:
+            self.fake.seed_instance(options['seed'])
+        self.now = timezone.now()
+        started = time.monotonic()
+        with transaction.atomic():
+            with keep_auto_dates((User, Category, Location, Post, Comment)):
+                users = self.create_users(options['users'])
+                categories = self.create_categories(options['categories'])
+                locations = self.create_locations(options['locations'])
+                posts = self.create_posts(
+                    options['posts'], users, categories, locations
+                )
+                comments = self.create_comments(
+                    options['comments'], users, posts
+                )
+            rebuild_derived_data()
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано: пользователей {len(users)}, категорий'
+            f' {len(categories)}, местоположений {len(locations)},'
+            f' публикаций {len(posts)}, комментариев {comments}'
+            f' за {time.monotonic() - started:.1f} с'
+        ))
+
+    def bulk_create(self, model, objects, *fields):
+        """Сохраняет objects и возвращает их из базы с ключами.
+
+        bulk_create на SQLite не заполняет pk, поэтому созданные
+        записи перечитываются по диапазону ключей (только fields).
+        """
+        start = self.next_number(model)
+        model.objects.bulk_create(
+            objects, batch_size=self.options['batch_size']
+        )
+        return list(
+            model.objects.filter(pk__gte=start).only('pk', *fields)
+        )
+
+    @staticmethod
+    def next_number(model):
+        return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+    def past(self, days=None):
+        days = self.options['days'] if days is None else days
+        return self.now - datetime.timedelta(
+            seconds=self.random.uniform(0, days * 24 * 60 * 60)
+        )
+
+    def is_unpublished(self):
+        return self.random.random() < self.options['unpublished']
+
+    def create_users(self, count):
+        # Хэш пароля считается один раз: это самая медленная часть.
+        password = make_password(self.options['password'])
+        start = self.next_number(User)
+        return self.bulk_create(User, [
+            User(
+                username=f'{self.fake.user_name()}{start + index}',
+                first_name=self.fake.first_name(),
+                last_name=self.fake.last_name(),
+                email=self.fake.email(),
+                password=password,
+                date_joined=self.past(),
+            )
+            for index in range(count)
+        ])
+
+    def create_categories(self, count):
+        start = self.next_number(Category)
+        return self.bulk_create(Category, [
+            Category(
+                title=self.fake.sentence(nb_words=2).rstrip('.'),
+                description=self.fake.paragraph(),
+                slug=f'category-{start + index}',
+                is_published=not self.is_unpublished(),
+                created_at=self.past(),
+            )
+            for index in range(count)
+        ])
+
+    def create_locations(self, count):
+        return self.bulk_create(Location, [
+            Location(
+                name=self.fake.city(),
+                is_published=not self.is_unpublished(),
+                created_at=self.past(),
+            )
+            for _ in range(count)
+        ])
+
+    def create_posts(self, count, users, categories, locations):
+        if count and not (users and categories):
+            raise CommandError(
+                'Для публикаций нужны пользователи и категории.'
+            )
+        posts = []
+        for _ in range(count):
+            if self.random.random() < self.options['scheduled']:
+                pub_date = self.now + datetime.timedelta(
+                    seconds=self.random.uniform(60, 30 * 24 * 60 * 60)
+                )
+            else:
+                pub_date = self.past()
+            created_at = min(pub_date, self.now) - datetime.timedelta(
+                minutes=self.random.randint(0, 24 * 60)
+            )
+            posts.append(Post(
+                title=self.fake.sentence(nb_words=5).rstrip('.'),
+                text='\n\n'.join(self.fake.paragraphs(
+                    nb=self.random.randint(1, 5)
+                )),
+                pub_date=pub_date,
+                author=self.random.choice(users),
+                category=self.random.choice(categories),
+                location=self.random.choice([None, *locations]),
+                is_published=not self.is_unpublished(),
+                created_at=created_at,
+                updated_at=created_at,
+            ))
+        return self.bulk_create(Post, posts, 'pub_date')
+
+    def create_comments(self, count, users, posts):
+        """Раздаёт комментарии по Ципфу; возвращает их число.
+
+        Комментируются только публикации с наступившей датой, а их
+        популярность не зависит от порядка в ленте.
+        """
+        targets = [post for post in posts if post.pub_date <= self.now]
+        if not count or not targets:
+            return 0
+        self.random.shuffle(targets)
+        chosen = self.random.choices(
+            targets,
+            weights=zipf_weights(len(targets), self.options['skew']),
+            k=count,
+        )
+        created = 0
+        batch_size = self.options['batch_size']
+        for start in range(0, count, batch_size):
+            Comment.objects.bulk_create([
+                Comment(
+                    text=self.fake.text(max_nb_chars=200),
+                    post=post,
+                    author=self.random.choice(users),
+                    created_at=post.pub_date + (
+                        self.now - post.pub_date
+                    ) * self.random.random(),
+                )
+                for post in chosen[start:start + batch_size]
+            ])
+            created += len(chosen[start:start + batch_size])
+        return created
@@ -0,0 +1,196 @@
+import contextlib
+import sys
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers import base, python
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from blog.cache import (
+    PAGES_VERSION, POSTS_VERSION, RELATED_VERSION, bump_version
+)
+from blog.fixtures_stream import iter_json_array
+from blog.maintenance import keep_auto_dates, rebuild_derived_data
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает фикстуру в формате db.json по частям: объекты читаются'
+        ' потоком и сохраняются пачками через bulk_create. Ссылки на'
+        ' категории, местоположения и пользователей проверяются в конце'
+        ' транзакции, поэтому порядок объектов в файле не важен.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixture', help='Путь к JSON-файлу или -.')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Объектов одной модели в пачке bulk_create.',
+        )
+        parser.add_argument(
+            '--progress-every',
+            type=int,
+            default=10000,
+            help='Сообщать о ходе загрузки каждые N объектов (0 — нет).',
+        )
+        parser.add_argument(
+            '-e', '--exclude',
+            action='append',
+            default=[],
+            help='Пропустить приложение или модель (app или app.Model).',
+        )
+        parser.add_argument(
+            '--skip-existing',
+            action='store_true',
+            help='Не вставлять строки, чей первичный или уникальный ключ'
+                 ' уже есть в базе (INSERT с ON CONFLICT DO NOTHING);'
+                 ' такие объекты остаются прежними. В loaddata такой'
+                 ' опции нет: она перезаписывает объекты с тем же pk.',
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        self.using = options['database']
+        self.batch_size = options['batch_size']
+        self.progress_every = options['progress_every']
+        self.skip_existing = options['skip_existing']
+        self.excluded = {label.lower() for label in options['exclude']}
+        self.pending = {}
+        self.m2m = {}
+        self.models = set()
+        self.total = 0
+        self.started = time.monotonic()
+        self.now = timezone.now()
+
+        connection = connections[self.using]
+        with self.open(options['fixture']) as stream:
+            with transaction.atomic(using=self.using):
+                with connection.constraint_checks_disabled():
+                    with keep_auto_dates(apps.get_models()) as auto_dates:
+                        self.auto_dates = auto_dates
+                        for record in iter_json_array(stream):
+                            self.add(record)
+                        self.flush_all()
+                table_names = [
+                    model._meta.db_table for model in self.models
+                ]
+                try:
+                    connection.check_constraints(table_names=table_names)
+                except Exception as error:
+                    raise CommandError(
+                        f'Фикстура ссылается на несуществующие объекты:'
+                        f' {error}'
+                    )
+                self.reset_sequences(connection)
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено объектов: {self.total} за'
+            f' {time.monotonic() - self.started:.1f} с'
+        ))
+        if self.models & {Post, Comment}:
+            rebuild_derived_data()
+        else:
+            bump_version(POSTS_VERSION, PAGES_VERSION, RELATED_VERSION)
+
+    @staticmethod
+    def open(path):
+        if path == '-':
+            return contextlib.nullcontext(sys.stdin)
+        return open(path, encoding='utf-8')
+
+    def is_excluded(self, label):
+        label = label.lower()
+        return label in self.excluded or label.split('.')[0] in self.excluded
+
+    def add(self, record):
+        if self.is_excluded(record.get('model', '')):
+            return
+        try:
+            deserialized, = python.Deserializer(
+                [record], using=self.using, ignorenonexistent=True,
+                handle_forward_references=True,
+            )
+        except base.DeserializationError as error:
+            raise CommandError(f'Ошибка в объекте {record!r}: {error}')
+        if deserialized.deferred_fields:
+            raise CommandError(
+                f'Натуральные ключи не поддерживаются: {record["model"]}'
+            )
+        instance = deserialized.object
+        model = type(instance)
+        for field in model._meta.concrete_fields:
+            # Даты, которых нет в файле, заполняются как при сохранении.
+            if field in self.auto_dates and (
+                getattr(instance, field.attname) is None
+            ):
+                setattr(instance, field.attname, self.now)
+        self.models.add(model)
+        self.pending.setdefault(model, []).append(instance)
+        if len(self.pending[model]) >= self.batch_size:
+            self.flush(model)
+        for name, values in (deserialized.m2m_data or {}).items():
+            rows = self.m2m.setdefault((model, name), [])
+            rows.extend((instance.pk, value) for value in values)
+            if len(rows) >= self.batch_size:
+                self.flush_m2m(model, name)
+
+    def flush(self, model):
+        objects = self.pending.pop(model, [])
+        if not objects:
+            return
+        model._base_manager.using(self.using).bulk_create(
+            objects, batch_size=self.batch_size,
+            ignore_conflicts=self.skip_existing,
+        )
+        self.total += len(objects)
+        self.report(len(objects))
+
+    def flush_m2m(self, model, name):
+        rows = self.m2m.pop((model, name), [])
+        if not rows:
+            return
+        field = model._meta.get_field(name)
+        through = field.remote_field.through
+        source = field.m2m_field_name()
+        target = field.m2m_reverse_field_name()
+        through._base_manager.using(self.using).bulk_create(
+            [
+                through(**{f'{source}_id': pk, f'{target}_id': value})
+                for pk, value in rows
+            ],
+            batch_size=self.batch_size,
+            ignore_conflicts=self.skip_existing,
+        )
+        self.models.add(through)
+
+    def flush_all(self):
+        for model in list(self.pending):
+            self.flush(model)
+        for model, name in list(self.m2m):
+            self.flush_m2m(model, name)
+
+    def report(self, added):
+        if not self.progress_every:
+            return
+        if self.total // self.progress_every == (
+            (self.total - added) // self.progress_every
+        ):
+            return
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(
+            f'Загружено объектов: {self.total}'
+            f' ({self.total / max(elapsed, 1e-9):.0f} в секунду)'
+        )
+
+    def reset_sequences(self, connection):
+        statements = connection.ops.sequence_reset_sql(
+            self.style, list(self.models)
+        )
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
@@ -0,0 +1,18 @@
+from django.core.management.commands import loaddata
+from django.db import DEFAULT_DB_ALIAS
+
+from blog.maintenance import rebuild_derived_data
+
+
+class Command(loaddata.Command):
+    help = (
+        loaddata.Command.help
+        + ' Затем пересчитывает is_visible, comment_count и индекс поиска:'
+        ' фикстуры сохраняются с raw=True, минуя Post.save() и сигналы.'
+    )
+
+    def handle(self, *fixture_labels, **options):
+        super().handle(*fixture_labels, **options)
+        loaded = self.loaded_object_count
+        if loaded and options['database'] == DEFAULT_DB_ALIAS:
+            rebuild_derived_data()
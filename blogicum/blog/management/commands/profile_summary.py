@@ -0,0 +1,90 @@
+import io
+import pstats
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from blog import profiling
+
+SORT_KEYS = ('cumulative', 'tottime', 'ncalls')
+
+
+class Command(BaseCommand):
+    help = (
+        'Сводит профили, записанные ProfilingMiddleware, по именам'
+        ' представлений и печатает самые дорогие функции каждого.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'views',
+            nargs='*',
+            help='Только эти представления (например, blog:index).',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=15,
+            help='Функций на представление.',
+        )
+        parser.add_argument(
+            '--sort',
+            choices=SORT_KEYS,
+            default='tottime',
+            help='tottime — собственное время функции, cumulative — с'
+                 ' вызванными.',
+        )
+        parser.add_argument(
+            '--last',
+            type=int,
+            help='Учитывать только N последних профилей.',
+        )
+        parser.add_argument(
+            '--dir',
+            help=f'Каталог профилей (по умолчанию {settings.PROFILING_DIR}).',
+        )
+        parser.add_argument(
+            '--token',
+            action='store_true',
+            help=(
+                'Напечатать значение заголовка, включающего профиль'
+                ' запроса, и выйти.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options['token']:
+            self.stdout.write(
+                f'{settings.PROFILING_HEADER}: {profiling.make_token()}'
+            )
+            return
+        paths = profiling.iter_profiles(
+            Path(options['dir']) if options['dir'] else None
+        )
+        if options['last']:
+            paths = paths[-options['last']:]
+        groups = defaultdict(list)
+        for path in paths:
+            groups[profiling.view_of(path)].append(path)
+        if options['views']:
+            groups = {
+                view: groups[view] for view in options['views']
+                if view in groups
+            }
+        if not groups:
+            raise CommandError('Профилей не найдено.')
+        for view, files in sorted(groups.items()):
+            # pstats печатает через print(), а self.stdout добавляет
+            # перевод строки к каждой записи.
+            buffer = io.StringIO()
+            stats = pstats.Stats(*map(str, files), stream=buffer)
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{view}: запросов {len(files)}, в среднем'
+                f' {stats.total_tt / len(files) * 1000:.1f} мс'
+            ))
+            stats.strip_dirs().sort_stats(options['sort']).print_stats(
+                options['limit']
+            )
+            self.stdout.write(buffer.getvalue(), ending='')
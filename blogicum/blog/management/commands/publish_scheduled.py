@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.post_filter_published import refresh_visibility
+
+
+class Command(BaseCommand):
+    help = (
+        'Открывает отложенные публикации, у которых наступила дата'
+        ' публикации, и пересчитывает Post.is_visible.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Повторять проверку каждые N секунд (0 — один проход).',
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+        while True:
+            changed = refresh_visibility()
+            self.stdout.write(f'Обновлено публикаций: {changed}')
+            if not interval:
+                return
+            time.sleep(interval)
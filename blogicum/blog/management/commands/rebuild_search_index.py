@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.models import Post
+from blog.search import is_available, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс публикаций (SQLite FTS5).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if not is_available():
+            raise CommandError('Полнотекстовый индекс есть только в SQLite.')
+        total = rebuild_index(Post.objects.all(), options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Проиндексировано публикаций: {total}')
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog.maintenance import recount_comments
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики комментариев Post.comment_count.'
+
+    def handle(self, *args, **options):
+        updated = recount_comments()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано публикаций: {updated}')
+        )
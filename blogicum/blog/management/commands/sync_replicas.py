@@ -0,0 +1,64 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from blog.cache import (
+    PAGES_VERSION, POSTS_VERSION, RELATED_VERSION, bump_version
+)
+from blog.routers import replica_aliases
+
+SQLITE = 'django.db.backends.sqlite3'
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную базу SQLite в файлы реплик через backup API'
+        ' — так реплики проверяются локально. Затем сбрасывает версии'
+        ' кэша: страницы, закэшированные с отстававшей реплики,'
+        ' перестраиваются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'aliases',
+            nargs='*',
+            help='Реплики из settings.DATABASES; по умолчанию все копии'
+                 ' default (TEST["MIRROR"]).',
+        )
+
+    def handle(self, *args, **options):
+        known = replica_aliases()
+        aliases = options['aliases'] or known
+        unknown = set(aliases) - set(known)
+        if unknown:
+            raise CommandError(
+                f'Не реплики default: {", ".join(sorted(unknown))}.'
+            )
+        if not aliases:
+            raise CommandError('В settings.DATABASES нет реплик.')
+        source = connections[DEFAULT_DB_ALIAS]
+        for alias in (DEFAULT_DB_ALIAS, *aliases):
+            if connections[alias].settings_dict['ENGINE'] != SQLITE:
+                raise CommandError(
+                    f'{alias}: копируются только базы SQLite, остальные'
+                    ' реплицирует сервер СУБД.'
+                )
+        source.ensure_connection()
+        for alias in aliases:
+            started = time.perf_counter()
+            # Соединение этого процесса с устаревшим файлом не нужно.
+            connections[alias].close()
+            target = sqlite3.connect(connections[alias].settings_dict['NAME'])
+            try:
+                source.connection.backup(target)
+            finally:
+                target.close()
+            self.stdout.write(
+                f'{alias}: {time.perf_counter() - started:.2f} с'
+            )
+        bump_version(POSTS_VERSION, PAGES_VERSION, RELATED_VERSION)
+        self.stdout.write(self.style.SUCCESS(
+            f'Синхронизировано реплик: {len(aliases)}'
+        ))
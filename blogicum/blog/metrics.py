@@ -0,0 +1,335 @@
+"""Метрики запросов в текстовом формате Prometheus.
+
+Каждый поток пишет в собственный шард, поэтому счётчики обновляются
+без блокировок; экспорт складывает шарды всех потоков процесса.
+Если задан settings.METRICS_DIR, процесс раз в METRICS_FLUSH_INTERVAL
+секунд сбрасывает свои суммы в отдельный файл каталога, а /metrics
+складывает файлы всех процессов — так считаются несколько воркеров
+WSGI. Каталог очищают при развёртывании, до запуска воркеров.
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache.backends import locmem
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+SIZE_BUCKETS = tuple(2 ** power for power in range(10, 22, 2))
+
+COUNTER = 'counter'
+HISTOGRAM = 'histogram'
+# Имя метрики -> тип, описание, границы корзин гистограммы.
+METRICS = {
+    'blog_requests_total': (
+        COUNTER, 'Обработанные запросы.', None
+    ),
+    'blog_request_duration_seconds': (
+        HISTOGRAM, 'Время обработки запроса.', LATENCY_BUCKETS
+    ),
+    'blog_db_duration_seconds': (
+        HISTOGRAM, 'Время SQL-запросов за один запрос.', LATENCY_BUCKETS
+    ),
+    'blog_db_queries': (
+        HISTOGRAM, 'SQL-запросов за один запрос.', QUERY_BUCKETS
+    ),
+    'blog_template_render_seconds': (
+        HISTOGRAM, 'Время рендеринга шаблона ответа.', LATENCY_BUCKETS
+    ),
+    'blog_response_size_bytes': (
+        HISTOGRAM, 'Размер тела ответа (кроме потоковых).', SIZE_BUCKETS
+    ),
+    'blog_cache_requests_total': (
+        COUNTER, 'Чтения кэша по назначению ключа.', None
+    ),
+}
+CACHE_RATIO = 'blog_cache_hit_ratio'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Shard:
+    """Метрики одного потока; пишет в них только сам поток."""
+
+    def __init__(self):
+        self.counters = defaultdict(float)
+        self.histograms = {}
+
+    def observe(self, name, labels, value):
+        key = (name, labels)
+        series = self.histograms.get(key)
+        buckets = METRICS[name][2]
+        if series is None:
+            # Корзины, затем сумма и число наблюдений.
+            series = self.histograms[key] = [0] * (len(buckets) + 3)
+        series[bisect.bisect_left(buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def merge(self, other) -> None:
+        for key, value in other.counters.items():
+            self.counters[key] += value
+        for key, series in other.histograms.items():
+            _add_series(self.histograms, key, list(series))
+
+
+def _reset() -> None:
+    """Пустое состояние процесса; после fork — заново в дочернем."""
+    global _local, _shards, _retired, _shards_lock, _flush_lock
+    global _last_flush, _file
+    _local = threading.local()
+    # Поток -> его шард; шарды завершившихся потоков collect()
+    # складывает в _retired.
+    _shards = {}
+    _retired = Shard()
+    _shards_lock = threading.Lock()
+    _flush_lock = threading.Lock()
+    _last_flush = 0.0
+    _file = None
+
+
+_reset()
+if hasattr(os, 'register_at_fork'):
+    # Воркеры gunicorn --preload не должны унаследовать счётчики
+    # и файл мастера.
+    os.register_at_fork(after_in_child=_reset)
+
+
+def _shard() -> Shard:
+    shard = getattr(_local, 'shard', None)
+    if shard is None:
+        shard = _local.shard = Shard()
+        # Блокировка нужна только при появлении нового потока.
+        with _shards_lock:
+            _shards[threading.current_thread()] = shard
+    return shard
+
+
+def file_name() -> str:
+    """Файл процесса в METRICS_DIR; имя строится по текущему pid."""
+    global _file
+    pid = os.getpid()
+    if _file is None or _file[0] != pid:
+        _file = (pid, f'{pid}-{time.time_ns()}.json')
+    return _file[1]
+
+
+def inc(name, value=1, **labels):
+    _shard().counters[name, tuple(sorted(labels.items()))] += value
+
+
+def observe(name, value, **labels):
+    _shard().observe(name, tuple(sorted(labels.items())), value)
+
+
+def collect() -> dict:
+    """Суммы метрик всех потоков процесса.
+
+    dict.copy() выполняется под GIL целиком, поэтому копия шарда
+    согласована, хотя поток продолжает в него писать. Шарды
+    завершившихся потоков складываются в один, чтобы серверы
+    с потоком на запрос не копили их бесконечно.
+    """
+    total = Shard()
+    with _shards_lock:
+        for thread, shard in list(_shards.items()):
+            if not thread.is_alive():
+                _retired.merge(shard)
+                del _shards[thread]
+        total.merge(_retired)
+        shards = list(_shards.values())
+    for shard in shards:
+        for key, value in shard.counters.copy().items():
+            total.counters[key] += value
+        for key, series in shard.histograms.copy().items():
+            _add_series(total.histograms, key, list(series))
+    return {
+        'counters': dict(total.counters), 'histograms': total.histograms
+    }
+
+
+def _add_series(histograms, key, series):
+    total = histograms.get(key)
+    if total is None:
+        histograms[key] = series
+    else:
+        for index, value in enumerate(series):
+            total[index] += value
+
+
+def _dump(snapshot) -> dict:
+    return {
+        kind: [[name, labels, value] for (name, labels), value in
+               snapshot[kind].items()]
+        for kind in ('counters', 'histograms')
+    }
+
+
+def _load(data) -> dict:
+    return {
+        kind: {
+            (name, tuple(map(tuple, labels))): value
+            for name, labels, value in data[kind]
+        }
+        for kind in ('counters', 'histograms')
+    }
+
+
+def get_directory():
+    directory = getattr(settings, 'METRICS_DIR', None)
+    return Path(directory) if directory else None
+
+
+def flush(force=False) -> None:
+    """Сбрасывает суммы процесса в его файл в settings.METRICS_DIR."""
+    global _last_flush
+    directory = get_directory()
+    if directory is None:
+        return
+    interval = settings.METRICS_FLUSH_INTERVAL
+    if not force and time.monotonic() - _last_flush < interval:
+        return
+    if not _flush_lock.acquire(False):
+        return
+    try:
+        _last_flush = time.monotonic()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / file_name()
+        temporary = path.with_suffix('.tmp')
+        temporary.write_text(json.dumps(_dump(collect())), encoding='utf-8')
+        # Читатели видят либо старый, либо новый файл целиком.
+        os.replace(temporary, path)
+    finally:
+        _flush_lock.release()
+
+
+def collect_all() -> dict:
+    """Суммы метрик всех процессов или, без METRICS_DIR, этого."""
+    directory = get_directory()
+    if directory is None:
+        return collect()
+    flush(force=True)
+    counters = defaultdict(float)
+    histograms = {}
+    for path in sorted(directory.glob('*.json')):
+        try:
+            snapshot = _load(json.loads(path.read_text(encoding='utf-8')))
+        except (OSError, ValueError):
+            continue
+        for key, value in snapshot['counters'].items():
+            counters[key] += value
+        for key, series in snapshot['histograms'].items():
+            _add_series(histograms, key, series)
+    return {'counters': dict(counters), 'histograms': histograms}
+
+
+def _format_labels(labels, *extra) -> str:
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', r'\\').replace('"', r'\"')
+         .replace('\n', r'\n'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def _format_number(value) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+def cache_ratios(counters) -> dict:
+    """Доля попаданий по назначению кэша."""
+    totals = defaultdict(lambda: [0, 0])
+    for (name, labels), value in counters.items():
+        if name != 'blog_cache_requests_total':
+            continue
+        labels = dict(labels)
+        totals[labels['cache']][labels['result'] == 'hit'] += value
+    return {
+        cache: hits / (hits + misses)
+        for cache, (misses, hits) in totals.items()
+    }
+
+
+def export() -> str:
+    """Все метрики в текстовом формате Prometheus."""
+    snapshot = collect_all()
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+        if kind == COUNTER:
+            for (series, labels), value in sorted(
+                snapshot['counters'].items()
+            ):
+                if series == name:
+                    lines.append(
+                        f'{name}{_format_labels(labels)}'
+                        f' {_format_number(value)}'
+                    )
+            continue
+        for (series, labels), values in sorted(
+            snapshot['histograms'].items()
+        ):
+            if series != name:
+                continue
+            cumulative = 0
+            for bound, count in zip((*buckets, '+Inf'), values):
+                cumulative += count
+                lines.append(
+                    f'{name}_bucket'
+                    f'{_format_labels(labels, ("le", bound))} {cumulative}'
+                )
+            lines.append(
+                f'{name}_sum{_format_labels(labels)}'
+                f' {_format_number(values[-2])}'
+            )
+            lines.append(
+                f'{name}_count{_format_labels(labels)} {values[-1]}'
+            )
+    lines += [
+        f'# HELP {CACHE_RATIO} Доля попаданий в кэш.',
+        f'# TYPE {CACHE_RATIO} gauge',
+    ]
+    for cache, ratio in sorted(cache_ratios(snapshot['counters']).items()):
+        lines.append(
+            f'{CACHE_RATIO}{_format_labels((("cache", cache),))} {ratio:.6g}'
+        )
+    return '\n'.join(lines) + '\n'
+
+
+def cache_label(key: str) -> str:
+    """Назначение ключа кэша: префикс до первого «:»."""
+    if key.startswith('template.cache.'):
+        # Фрагменты {% cache %}: template.cache.<имя>.<хэш>.
+        return '.'.join(key.split('.')[:3])
+    return key.split(':', 1)[0]
+
+
+class CacheMetricsMixin:
+    """Считает попадания и промахи чтений кэша для /metrics.
+
+    get_many и get_or_set базового класса читают через get().
+    """
+
+    _missing = object()
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, self._missing, version)
+        hit = value is not self._missing
+        inc('blog_cache_requests_total', cache=cache_label(key),
+            result='hit' if hit else 'miss')
+        return value if hit else default
+
+
+class LocMemCache(CacheMetricsMixin, locmem.LocMemCache):
+    """LocMemCache с метриками попаданий."""
@@ -0,0 +1,422 @@
+import asyncio
+import contextlib
+import cProfile
+import functools
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from debug_toolbar import middleware as debug_toolbar
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from blog import metrics, profiling, routers
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+_query_wrappers: ContextVar[tuple] = ContextVar(
+    'blog_query_wrappers', default=()
+)
+
+
+def _run_query_wrappers(execute, sql, params, many, context):
+    for wrapper in reversed(_query_wrappers.get()):
+        execute = functools.partial(wrapper, execute)
+    return execute(sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_query_wrappers(sender, connection, **kwargs):
+    if _run_query_wrappers not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_run_query_wrappers)
+
+
+@contextlib.contextmanager
+def wrap_queries(wrapper):
+    """Оборачивает SQL-запросы ко всем базам до конца блока.
+
+    Чтение может идти с реплик. Обёртки хранятся в contextvars, а не
+    в соединениях потока, поэтому под ASGI они видят и запросы,
+    которые sync_to_async выполняет в пуле потоков.
+    """
+    for connection in connections.all():
+        install_query_wrappers(None, connection)
+    token = _query_wrappers.set((*_query_wrappers.get(), wrapper))
+    try:
+        yield
+    finally:
+        _query_wrappers.reset(token)
+
+
+class SyncAsyncMiddleware:
+    """Middleware, которое работает и в синхронной, и в асинхронной цепочке.
+
+    Под ASGI Django переводит в поток всю цепочку снаружи первого
+    синхронного middleware, поэтому все middleware блога умеют
+    работать без sync_to_async. Подкласс задаёт around() — контекст
+    вокруг обработки запроса — и finish() для готового ответа.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Как в MiddlewareMixin: Django ждёт от экземпляра корутину.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        with self.around(request) as state:
+            response = self.get_response(request)
+        return self.finish(request, response, state)
+
+    async def __acall__(self, request):
+        with self.around(request) as state:
+            response = await self.get_response(request)
+        return self.finish(request, response, state)
+
+    def around(self, request):
+        return contextlib.nullcontext()
+
+    def finish(self, request, response, state):
+        return response
+
+
+class QueryCounter:
+    """Обёртка execute_wrapper, считающая выполненные SQL-запросы."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class QueryBudgetMiddleware(SyncAsyncMiddleware):
+    """Следит, чтобы представление не выходило за свой бюджет запросов.
+
+    Бюджет задаётся атрибутом query_budget у CBV или словарём
+    settings.QUERY_BUDGETS по имени представления ('blog:index').
+    Включается настройкой QUERY_BUDGET_ENABLED.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_BUDGET_ENABLED', False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    @contextlib.contextmanager
+    def around(self, request):
+        counter = QueryCounter()
+        with wrap_queries(counter):
+            yield counter
+
+    def finish(self, request, response, counter):
+        budget = self.get_budget(request)
+        if budget is not None and counter.count > budget:
+            self.report(request, counter.count, budget)
+        return response
+
+    def get_budget(self, request):
+        match = request.resolver_match
+        if match is None:
+            return None
+        budgets = getattr(settings, 'QUERY_BUDGETS', {})
+        if match.view_name in budgets:
+            return budgets[match.view_name]
+        view_class = getattr(match.func, 'view_class', None)
+        return getattr(
+            view_class, 'query_budget',
+            getattr(settings, 'QUERY_BUDGET_DEFAULT', None)
+        )
+
+    def report(self, request, count, budget):
+        message = (
+            f'{request.resolver_match.view_name} ({request.path}): '
+            f'{count} SQL-запросов при бюджете {budget}'
+        )
+        if getattr(settings, 'QUERY_BUDGET_RAISE', False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class AsgiUrlconfMiddleware(SyncAsyncMiddleware):
+    """Отдаёт запросам, пришедшим через ASGI, settings.ASGI_URLCONF.
+
+    Так одни и те же адреса обслуживают синхронные CBV под WSGI
+    и их асинхронные варианты из blog.async_views под ASGI.
+    """
+
+    def __init__(self, get_response):
+        self.urlconf = getattr(settings, 'ASGI_URLCONF', None)
+        if not self.urlconf:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def around(self, request):
+        if isinstance(request, ASGIRequest):
+            request.urlconf = self.urlconf
+        return super().around(request)
+
+
+class ProfiledStream:
+    """Тело потокового ответа, которое генерируется под профилировщиком.
+
+    Профиль сохраняется в close(): его вызывает сервер, закрывая
+    ответ, даже если тело не было прочитано.
+    """
+
+    def __init__(self, content, profiler, on_close):
+        self.content = content
+        self.profiler = profiler
+        self.on_close = on_close
+
+    def __iter__(self):
+        iterator = iter(self.content)
+        while True:
+            self.profiler.enable()
+            try:
+                chunk = next(iterator, None)
+            finally:
+                self.profiler.disable()
+            if chunk is None:
+                return
+            yield chunk
+
+    def close(self):
+        on_close, self.on_close = self.on_close, None
+        if on_close is not None:
+            on_close()
+
+
+class ProfilingMiddleware(SyncAsyncMiddleware):
+    """Пишет профиль cProfile выбранных запросов в settings.PROFILING_DIR.
+
+    Запрос профилируется, если в нём есть заголовок
+    settings.PROFILING_HEADER с подписанным значением
+    (manage.py profile_summary --token) или выпал жребий
+    settings.PROFILING_SAMPLE_RATE. Стоит первым в MIDDLEWARE, чтобы
+    в профиль попали остальные middleware, представление, ORM
+    и рендеринг шаблона; тело потокового ответа профилируется при
+    чтении. Под ASGI профилируется поток цикла событий: синхронный код
+    из пула потоков sync_to_async в профиль не попадает, а корутины
+    соседних запросов — попадают.
+    Включается настройкой PROFILING_ENABLED.
+    """
+
+    # cProfile не допускает двух активных профилировщиков в Python 3.12+,
+    # поэтому одновременно профилируется один запрос на процесс.
+    lock = threading.Lock()
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.header = 'HTTP_' + settings.PROFILING_HEADER.upper().replace(
+            '-', '_'
+        )
+
+    @contextlib.contextmanager
+    def around(self, request):
+        if not self.is_requested(request) or not self.lock.acquire(False):
+            yield None
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            try:
+                yield profiler
+            finally:
+                profiler.disable()
+        except BaseException:
+            self.lock.release()
+            raise
+
+    def finish(self, request, response, profiler):
+        if profiler is None:
+            return response
+        if response.streaming:
+            response.streaming_content = ProfiledStream(
+                response.streaming_content, profiler,
+                lambda: self.save(profiler, request),
+            )
+        else:
+            self.save(profiler, request)
+        return response
+
+    def is_requested(self, request):
+        token = request.META.get(self.header)
+        if token is not None:
+            return profiling.check_token(token)
+        return random.random() < settings.PROFILING_SAMPLE_RATE
+
+    def save(self, profiler, request):
+        try:
+            match = request.resolver_match
+            directory = profiling.get_directory()
+            directory.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(directory / profiling.file_name(
+                match.view_name if match else None
+            ))
+            profiling.rotate(directory)
+        except OSError:
+            logger.exception('Не удалось записать профиль %s', request.path)
+        finally:
+            self.lock.release()
+
+
+class QueryTimer(QueryCounter):
+    """QueryCounter, который ещё и суммирует время SQL-запросов."""
+
+    def __init__(self):
+        super().__init__()
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return super().__call__(execute, sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+
+
+class MetricsMiddleware(SyncAsyncMiddleware):
+    """Собирает метрики запросов для /metrics (blog.metrics).
+
+    Метки — имя представления из resolver_match. Время шаблона
+    измеряется у TemplateResponse, SQL — во всех потоках, где
+    выполняется запрос (wrap_queries). Включается настройкой
+    METRICS_ENABLED.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    @contextlib.contextmanager
+    def around(self, request):
+        request.template_render_seconds = None
+        timer = QueryTimer()
+        started = time.perf_counter()
+        with wrap_queries(timer):
+            yield timer
+        timer.elapsed = time.perf_counter() - started
+
+    def finish(self, request, response, timer):
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        metrics.inc(
+            'blog_requests_total', view=view, method=request.method,
+            status=str(response.status_code),
+        )
+        metrics.observe(
+            'blog_request_duration_seconds', timer.elapsed, view=view
+        )
+        metrics.observe('blog_db_duration_seconds', timer.seconds, view=view)
+        metrics.observe('blog_db_queries', timer.count, view=view)
+        if request.template_render_seconds is not None:
+            metrics.observe(
+                'blog_template_render_seconds',
+                request.template_render_seconds, view=view,
+            )
+        if not response.streaming:
+            metrics.observe(
+                'blog_response_size_bytes', len(response.content), view=view
+            )
+        metrics.flush()
+        return response
+
+    def process_template_response(self, request, response):
+        render = response.render
+
+        def timed_render():
+            started = time.perf_counter()
+            try:
+                return render()
+            finally:
+                request.template_render_seconds = (
+                    time.perf_counter() - started
+                )
+
+        response.render = timed_render
+        return response
+
+
+class ReplicaReadMiddleware(SyncAsyncMiddleware):
+    """Отдаёт GET-запросы к CBV с replica_reads = True репликам.
+
+    Пользователь и сессия загружаются до переключения, с основной
+    базы. Если запрос что-то записал, ответ ставит на
+    REPLICA_PIN_SECONDS cookie REPLICA_PIN_COOKIE, и пока она жива,
+    страницы этого посетителя читаются с основной базы — он сразу
+    видит свои изменения, даже если реплика отстаёт. Включается
+    непустым списком settings.DATABASE_REPLICAS.
+    """
+
+    def __init__(self, get_response):
+        if not routers.read_replicas():
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def around(self, request):
+        return routers.routing()
+
+    def finish(self, request, response, state):
+        if state.wrote:
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        if (
+            request.method not in ('GET', 'HEAD')
+            or not getattr(view_class, 'replica_reads', False)
+            or settings.REPLICA_PIN_COOKIE in request.COOKIES
+        ):
+            return None
+        # Загружает пользователя и сессию, пока чтение идёт в default.
+        request.user.is_authenticated
+        routers.use_replica()
+        return None
+
+
+class DebugToolbarMiddleware(debug_toolbar.DebugToolbarMiddleware):
+    """Панель debug_toolbar только для синхронных запросов.
+
+    DebugToolbarMiddleware 3.x работает лишь синхронно и перевела бы
+    в поток всю цепочку ASGI, поэтому асинхронные запросы идут мимо
+    панели.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.get_response(request)
+        return super().__call__(request)
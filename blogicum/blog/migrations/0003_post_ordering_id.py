@@ -0,0 +1,17 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:36
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_post_comment_count'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='post',
+            options={'ordering': ('-pub_date', 'title', 'id'), 'verbose_name': 'публикация', 'verbose_name_plural': 'Публикации'},
+        ),
+    ]
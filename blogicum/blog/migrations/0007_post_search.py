@@ -0,0 +1,32 @@
+from django.db import migrations
+
+# Копия blog.search.SEARCH_TABLE: миграция не зависит от кода приложения.
+# Таблица создаётся пустой — нормализация текста меняется вместе
+# с blog.search, и индекс публикаций строит rebuild_search_index.
+SEARCH_TABLE = 'blog_post_search'
+
+
+def create_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5('
+        "title, text, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
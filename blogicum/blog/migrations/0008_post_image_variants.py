@@ -0,0 +1,41 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:47
+
+from django.db import migrations, models
+
+
+def fill_image_dimensions(apps, schema_editor):
+    """Запоминает размеры уже загруженных картинок.
+
+    Копии для старых публикаций не строятся: до пересохранения
+    шаблоны показывают оригинал, но уже с width и height.
+    """
+    Post = apps.get_model('blog', 'Post')
+    for post in Post.objects.exclude(image='').iterator():
+        try:
+            width, height = post.image.width, post.image.height
+        except (OSError, ValueError):
+            continue
+        post.image_variants = {
+            'original': {
+                'name': post.image.name, 'width': width, 'height': height,
+            }
+        }
+        post.save(update_fields=('image_variants',))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_post_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Уменьшенные копии фото'),
+        ),
+        migrations.RunPython(
+            fill_image_dimensions, migrations.RunPython.noop
+        ),
+    ]
@@ -1,19 +1,229 @@
+import hashlib
+import math
+import time
+
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils.functional import SimpleLazyObject
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
 
-from blog.config import POST_SLICE
+from blog.cache import (
+    PAGES_VERSION, POSTS_VERSION, RELATED_VERSION, comments_version,
+    get_version, versioned_key,
+)
+from blog.config import (
+    COMMENT_SLICE, FEED_TEMPLATE_ENGINE, PAGE_CACHE_TIMEOUT,
+    PAGINATION_EXACT_COUNT, PAGINATION_MODE, PAGINATION_WINDOW, POST_SLICE,
+)
 from blog.forms import CommentForm, PostForm
 from blog.models import Comment, Post
+from blog.pagination import (
+    CachedCountPaginator, InvalidCursor, KeysetPaginator
+)
 from blog.post_filter_published import post_published
 
 
-class PaginateMixin:
+class KeysetPaginateMixin:
+    keyset_ordering = None
+
+    def paginate_keyset(self, queryset, page_size):
+        paginator = KeysetPaginator(
+            queryset, page_size, ordering=self.keyset_ordering
+        )
+        try:
+            page = paginator.page(
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before'),
+            )
+        except InvalidCursor as error:
+            raise Http404(str(error))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class PaginateMixin(KeysetPaginateMixin):
     paginate_by = POST_SLICE
+    paginator_class = CachedCountPaginator
+    pagination_mode = PAGINATION_MODE
+    exact_count = PAGINATION_EXACT_COUNT
+
+    def get_count_signature(self):
+        """Признаки выборки, от которых зависит число публикаций."""
+        return (type(self).__name__, *sorted(self.kwargs.items()))
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        return super().get_paginator(
+            queryset, per_page,
+            count_signature=self.get_count_signature(),
+            count_window=None if self.exact_count else PAGINATION_WINDOW,
+            **kwargs
+        )
+
+    def use_keyset_pagination(self):
+        return (
+            self.pagination_mode == 'keyset'
+            or 'after' in self.request.GET
+            or 'before' in self.request.GET
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_keyset_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        return self.paginate_keyset(queryset, page_size)
+
+
+def get_validators(request, versions, *parts):
+    """Пара (ETag, Last-Modified в секундах) для адреса запроса.
+
+    Строится только из версий групп данных в кэше и parts,
+    поэтому не требует запросов к базе. Last-Modified точен лишь
+    до секунды: пока секунда последнего изменения не прошла,
+    следующее изменение получило бы ту же дату, и клиент
+    с If-Modified-Since получил бы неверный 304, — тогда вместо
+    даты возвращается None и проверяется только ETag.
+    """
+    stamps = [get_version(name) for name in versions]
+    digest = hashlib.md5(
+        repr((request.get_full_path(), parts, stamps)).encode()
+    ).hexdigest()
+    last_modified = math.floor(max(stamps)) + 1
+    if time.time() < last_modified:
+        last_modified = None
+    return f'"{digest}"', last_modified
+
+
+def add_validators(response, etag, last_modified):
+    if response.status_code in (200, 304):
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+class ConditionalGetMixin:
+    """Отвечает 304 на GET, если страница не менялась.
+
+    ETag и Last-Modified строятся из версий групп данных в кэше,
+    адреса страницы, пользователя и CSRF-cookie, поэтому проверка
+    не выполняет ни основного запроса, ни рендеринга шаблона.
+    Вход на сайт меняет CSRF-токен в формах страницы, а дата его
+    не учитывает, поэтому авторизованным Last-Modified не отдаётся.
+    """
+
+    conditional_versions = (PAGES_VERSION,)
+
+    def get_conditional_versions(self):
+        return self.conditional_versions
+
+    def get_validators(self):
+        etag, last_modified = get_validators(
+            self.request, self.get_conditional_versions(),
+            self.request.user.pk, self.request.META.get('CSRF_COOKIE')
+        )
+        if self.request.user.is_authenticated:
+            last_modified = None
+        return etag, last_modified
+
+    def add_validators(self, response, etag, last_modified):
+        patch_vary_headers(response, ('Cookie',))
+        return add_validators(response, etag, last_modified)
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        etag, last_modified = self.get_validators()
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+        return self.add_validators(response, etag, last_modified)
+
+
+class PostConditionalGetMixin(ConditionalGetMixin):
+    """Валидаторы страницы публикации.
+
+    Страница зависит от самой публикации, её комментариев, категории,
+    местоположения и автора.
+    """
 
+    def get_conditional_versions(self):
+        return (
+            POSTS_VERSION, RELATED_VERSION,
+            comments_version(self.kwargs['post_id']),
+        )
+
+
+class AnonymousPageCacheMixin:
+    """Кэширует страницу целиком для неавторизованных GET-запросов.
+
+    Ключ строится из пути и параметров пагинации, а версия страниц
+    меняется сигналами Post, Category, Location, Comment и User.
+    """
+
+    page_cache_params = ('page', 'after', 'before')
+
+    def get_page_cache_key(self, request):
+        return versioned_key(
+            'page', request.path,
+            *(request.GET.get(name) for name in self.page_cache_params),
+            versions=(PAGES_VERSION,)
+        )
+
+    @staticmethod
+    def cache_page(key, response):
+        cache.set(
+            key,
+            HttpResponse(
+                response.content, content_type=response['Content-Type']
+            ),
+            PAGE_CACHE_TIMEOUT,
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method != 'GET' or request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        key = self.get_page_cache_key(request)
+        response = cache.get(key)
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and hasattr(response, 'render'):
+            response.add_post_render_callback(
+                lambda rendered: self.cache_page(key, rendered)
+            )
+        return response
+
+
+def get_identity_map(request):
+    """Словарь объектов, уже загруженных за время этого запроса."""
+    if not hasattr(request, '_identity_map'):
+        request._identity_map = {}
+    return request._identity_map
+
+
+class IdentityMapMixin:
+    """Переиспользует объект get_object() в пределах одного запроса.
 
-class CheckMixin:
+    CheckMixin загружает объект в dispatch, а UpdateView и DeleteView
+    запрашивают его повторно — второй раз он берётся из карты.
+    """
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        key = (self.model._meta.label, self.kwargs.get(self.pk_url_kwarg))
+        identity_map = get_identity_map(self.request)
+        if key not in identity_map:
+            identity_map[key] = super().get_object()
+        return identity_map[key]
+
+
+class CheckMixin(IdentityMapMixin):
     def dispatch(self, request, *args, **kwargs):
-        if self.get_object().author != request.user:
+        if self.get_object().author_id != request.user.pk:
             return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
         return super().dispatch(request, *args, **kwargs)
 
@@ -36,6 +246,9 @@ class PostEditandCreateMixin:
     template_name = 'blog/create.html'
     pk_url_kwarg = 'post_id'
 
+    def get_queryset(self):
+        return Post.objects.visible_to(self.request.user)
+
     def form_valid(self, form):
         form.instance.author = self.request.user
         return super().form_valid(form)
@@ -48,6 +261,20 @@ class CommentMixin:
     template_name = 'blog/comment.html'
 
 
+class CommentPageMixin(KeysetPaginateMixin):
+    """Курсорная пагинация комментариев по (created_at, id)."""
+
+    keyset_ordering = ('created_at', 'id')
+    comments_paginate_by = COMMENT_SLICE
+
+    def get_comments_page(self, post):
+        _, page, _, _ = self.paginate_keyset(
+            post.comments.select_related('author'),
+            self.comments_paginate_by,
+        )
+        return page
+
+
 class CommentEditDelete(CommentMixin):
 
     def get_success_url(self):
@@ -56,8 +283,24 @@ class CommentEditDelete(CommentMixin):
         )
 
 
-class BasicPostViewMixin(PaginateMixin):
+class FeedTemplatesMixin:
+    """Рендерит страницу движком FEED_TEMPLATE_ENGINE."""
+
+    template_engine = FEED_TEMPLATE_ENGINE
+
+
+class BasicPostViewMixin(FeedTemplatesMixin, ConditionalGetMixin,
+                         AnonymousPageCacheMixin, PaginateMixin):
     model = Post
 
     def get_queryset(self):
         return post_published()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # Версия для ключа кэша карточек: одно чтение кэша версий
+        # на страницу, и только если карточки рендерятся.
+        context['related_version'] = SimpleLazyObject(
+            lambda: get_version(RELATED_VERSION)
+        )
+        return context
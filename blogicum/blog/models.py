@@ -1,12 +1,31 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils import timezone
 
 from abstractions.models import PublishedModel, TitleModel
 from blog.config import LINE_SLICE, MAX_LINE_SIZE, TEXT_SLICE
+from blog.images import ORIGINAL, variant_url
 
 User = get_user_model()
 
 
+class PostQuerySet(models.QuerySet):
+
+    def with_related(self):
+        return self.select_related('author', 'location', 'category')
+
+    def published(self):
+        return self.filter(is_visible=True)
+
+    def visible_to(self, user):
+        """Автор видит свои черновики, остальные — только опубликованное."""
+        if user.is_authenticated:
+            return self.filter(
+                models.Q(is_visible=True) | models.Q(author=user)
+            )
+        return self.published()
+
+
 class Post(PublishedModel, TitleModel):
     text = models.TextField(verbose_name='Текст')
     pub_date = models.DateTimeField(
@@ -18,6 +37,10 @@ class Post(PublishedModel, TitleModel):
         )
     )
     image = models.ImageField('Фото', upload_to='post_images', blank=True)
+    image_variants = models.JSONField(
+        default=dict, blank=True, editable=False,
+        verbose_name='Уменьшенные копии фото',
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -38,11 +61,99 @@ class Post(PublishedModel, TitleModel):
         null=True,
         verbose_name='Категория',
     )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев',
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменено'
+    )
+    is_visible = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Видна в ленте',
+        help_text=(
+            'Вычисляется автоматически: публикация, категория и'
+            ' наступившая дата публикации.'
+        )
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
-        ordering = ('-pub_date', 'title')
+        ordering = ('-pub_date', 'title', 'id')
+        indexes = (
+            models.Index(
+                fields=('-pub_date', 'title', 'id'),
+                condition=models.Q(is_visible=True),
+                name='post_visible_feed_idx',
+            ),
+            models.Index(
+                fields=('category', '-pub_date', 'title', 'id'),
+                condition=models.Q(is_visible=True),
+                name='post_category_feed_idx',
+            ),
+            models.Index(
+                fields=('author', '-pub_date', 'title', 'id'),
+                name='post_author_feed_idx',
+            ),
+        )
+
+    def save(self, *args, **kwargs):
+        self.is_visible = self.check_visibility()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'is_visible'}
+        super().save(*args, **kwargs)
+
+    def get_image(self, name):
+        """Копия картинки name или оригинал, если копий ещё нет."""
+        variant = self.image_variants.get(name)
+        if variant:
+            return {**variant, 'url': variant_url(variant)}
+        return {
+            **self.image_variants.get(ORIGINAL, {}),
+            'url': self.image.url,
+        }
+
+    @property
+    def card_image(self):
+        return self.get_image('card')
+
+    @property
+    def detail_image(self):
+        return self.get_image('detail')
+
+    @property
+    def full_image(self):
+        return self.get_image('full')
+
+    @property
+    def image_srcset(self):
+        variants = {
+            variant['name']: variant
+            for name, variant in self.image_variants.items()
+            if name != ORIGINAL
+        }
+        return ', '.join(
+            f'{variant_url(variant)} {variant["width"]}w'
+            for variant in sorted(
+                variants.values(), key=lambda variant: variant['width']
+            )
+        )
+
+    def check_visibility(self) -> bool:
+        """Проверяет, должна ли публикация показываться в ленте."""
+        return bool(
+            self.is_published
+            and self.pub_date <= timezone.now()
+            and self.category is not None
+            and self.category.is_published
+        )
 
 
 class Category(PublishedModel, TitleModel):
@@ -94,6 +205,12 @@ class Comment(models.Model):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at', 'id'),
+                name='comment_post_created_idx',
+            ),
+        )
 
     def __str__(self) -> str:
         return f'{self.author}: {self.text[:TEXT_SLICE]}'
@@ -0,0 +1,260 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+
+from blog.cache import versioned_key
+from blog.config import COUNT_CACHE_TIMEOUT, PAGINATION_WINDOW
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """Сохраняет микросекунды, которые DjangoJSONEncoder отбрасывает."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values) -> str:
+    """Упаковывает значения ключа сортировки в непрозрачный токен."""
+    raw = json.dumps(list(values), cls=CursorEncoder).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token: str, fields) -> list:
+    """Распаковывает токен обратно в значения полей сортировки."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor('Некорректный курсор')
+    if not isinstance(values, list) or len(values) != len(fields):
+        raise InvalidCursor('Некорректный курсор')
+    try:
+        return [
+            field.to_python(value) for field, value in zip(fields, values)
+        ]
+    except Exception:
+        raise InvalidCursor('Некорректный курсор')
+
+
+def page_query(query, **params) -> str:
+    """Строка запроса query с заменёнными параметрами пагинации."""
+    query = query.copy()
+    for name in ('page', 'after', 'before'):
+        query.pop(name, None)
+    for name, value in params.items():
+        query[name] = value
+    return f'?{query.urlencode()}'
+
+
+def reverse_ordering(ordering):
+    return tuple(
+        name[1:] if name.startswith('-') else f'-{name}' for name in ordering
+    )
+
+
+def keyset_filter(ordering, values) -> Q:
+    """Условие «строго после values» для заданной сортировки.
+
+    Для сортировки (-pub_date, title, id) получается
+    pub_date < a OR (pub_date = a AND title > b)
+    OR (pub_date = a AND title = b AND id > c).
+    """
+    condition = Q()
+    equal = Q()
+    for name, value in zip(ordering, values):
+        lookup = 'lt' if name.startswith('-') else 'gt'
+        name = name.lstrip('-')
+        condition |= equal & Q(**{f'{name}__{lookup}': value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator, который хранит COUNT(*) в кэше.
+
+    Ключ строится из сигнатуры выборки и версии публикаций,
+    поэтому любое изменение Post или Category сбрасывает число.
+
+    С count_window точное число не нужно: считаются только строки
+    до конца окна page_window вокруг запрошенной страницы
+    (COUNT по подзапросу с LIMIT), а count_is_exact сообщает,
+    есть ли страницы дальше окна.
+    """
+
+    def __init__(self, *args, count_signature=None, count_window=None,
+                 **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_signature = count_signature
+        self.count_window = count_window
+        self.count_limit = None
+
+    def bound_count(self, number):
+        """Ограничивает подсчёт окном вокруг страницы number."""
+        if self.count_window is None or 'count' in self.__dict__:
+            return
+        try:
+            number = max(int(number), 1)
+        except (TypeError, ValueError):
+            return
+        self.count_limit = (number + self.count_window) * self.per_page + 1
+
+    def validate_number(self, number):
+        self.bound_count(number)
+        return super().validate_number(number)
+
+    @cached_property
+    def count(self):
+        if self.count_limit is not None:
+            window = self.object_list[:self.count_limit]
+            if isinstance(window, QuerySet):
+                return window.count()
+            return len(window)
+        if self.count_signature is None:
+            return super().count
+        key = versioned_key('paginator-count', *self.count_signature)
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, COUNT_CACHE_TIMEOUT)
+        return count
+
+    @property
+    def count_is_exact(self):
+        return self.count_limit is None or self.count < self.count_limit
+
+
+def page_window(page, on_each_side=PAGINATION_WINDOW, on_ends=1) -> list:
+    """Номера страниц для пагинатора, None — на месте пропуска.
+
+    Как Paginator.get_elided_page_range: первые и последние on_ends
+    страниц и on_each_side страниц по обе стороны от текущей.
+    Если число страниц известно не точно (count_is_exact), последние
+    не показываются, а за окном ставится пропуск.
+    """
+    paginator = page.paginator
+    number = page.number
+    last = paginator.num_pages
+    exact = getattr(paginator, 'count_is_exact', True)
+    numbers = set(range(
+        max(number - on_each_side, 1), min(number + on_each_side, last) + 1
+    ))
+    numbers.update(range(1, min(on_ends, last) + 1))
+    if exact:
+        numbers.update(range(max(last - on_ends + 1, 1), last + 1))
+    window = []
+    previous = 0
+    for current in sorted(numbers):
+        if current - previous == 2:
+            # Пропуск ровно одной страницы короче показать номером.
+            window.append(previous + 1)
+        elif current - previous > 2:
+            window.append(None)
+        window.append(current)
+        previous = current
+    if previous < last:
+        window.append(None)
+    return window
+
+
+class KeysetPage:
+    """Страница курсорной пагинации.
+
+    Повторяет интерфейс django.core.paginator.Page в той части,
+    которая нужна шаблонам, но не знает общего числа объектов.
+    """
+
+    is_keyset = True
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<KeysetPage of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if not self.has_next():
+            return None
+        return self.paginator.cursor_for(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous():
+            return None
+        return self.paginator.cursor_for(self.object_list[0])
+
+
+class KeysetPaginator:
+    """Курсорная (seek) пагинация по сортировке модели.
+
+    Каждая страница выбирается условием по ключу сортировки и LIMIT,
+    поэтому её стоимость не зависит от глубины и не требует COUNT(*).
+    """
+
+    def __init__(self, object_list, per_page, ordering=None):
+        model = object_list.model
+        ordering = tuple(ordering or model._meta.ordering)
+        if 'id' not in ordering and 'pk' not in ordering:
+            ordering += ('id',)
+        self.ordering = ordering
+        self.fields = [
+            model._meta.get_field(name.lstrip('-')) for name in ordering
+        ]
+        self.object_list = object_list
+        self.per_page = int(per_page)
+
+    def cursor_for(self, obj) -> str:
+        return encode_cursor(
+            getattr(obj, field.attname) for field in self.fields
+        )
+
+    def page(self, after=None, before=None):
+        if before:
+            values = decode_cursor(before, self.fields)
+            ordering = reverse_ordering(self.ordering)
+            rows = list(
+                self.object_list.filter(keyset_filter(ordering, values))
+                .order_by(*ordering)[:self.per_page + 1]
+            )
+            has_previous = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            return KeysetPage(rows, self, True, has_previous)
+
+        queryset = self.object_list.order_by(*self.ordering)
+        if after:
+            values = decode_cursor(after, self.fields)
+            queryset = queryset.filter(keyset_filter(self.ordering, values))
+        rows = list(queryset[:self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        return KeysetPage(rows[:self.per_page], self, has_next, bool(after))
@@ -1,29 +1,40 @@
-from django.db.models import Count
+from django.db.models import Q
 from django.utils import timezone
 
+from blog.cache import PAGES_VERSION, POSTS_VERSION, bump_version
 from blog.models import Post
 
 
 def post_filter_count(queryset):
-    """Функция для подсчета комментариев в профиле."""
-    return queryset.select_related(
-        'author',
-        'location',
-        'category',
-    ).annotate(
-        comment_count=Count('comments')
-    ).order_by('-pub_date')
+    """Функция подгружает связанные модели для ленты.
+
+    Количество комментариев хранится в поле Post.comment_count.
+    """
+    return queryset.with_related().order_by(*Post._meta.ordering)
 
 
 def post_published():
-    """Функция возвращает проверки.
+    """Функция возвращает публикации, видимые в ленте.
 
-    Времени,
-    флага публикации,
-    публикации категории.
+    Проверки времени, флага публикации и публикации категории
+    заранее сведены в поле Post.is_visible.
     """
-    return post_filter_count(Post.objects).filter(
+    return post_filter_count(Post.objects.published())
+
+
+def refresh_visibility(queryset=None):
+    """Пересчитывает Post.is_visible и возвращает число изменённых постов."""
+    if queryset is None:
+        queryset = Post.objects.all()
+    visible = Q(
         pub_date__lte=timezone.now(),
         is_published=True,
         category__is_published=True,
     )
+    shown = queryset.filter(visible, is_visible=False).update(is_visible=True)
+    hidden = queryset.exclude(visible).filter(
+        is_visible=True
+    ).update(is_visible=False)
+    if shown or hidden:
+        bump_version(POSTS_VERSION, PAGES_VERSION)
+    return shown + hidden
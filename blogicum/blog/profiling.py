@@ -0,0 +1,69 @@
+"""Файлы профилей запросов, которые пишет ProfilingMiddleware.
+
+Профиль — это вывод cProfile (pstats) в settings.PROFILING_DIR.
+Имя файла начинается со времени записи, поэтому при ротации
+удаляются первые по алфавиту, и содержит имя представления:
+
+    1700000000000000000-4242-blog.post_detail.prof
+"""
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+
+SUFFIX = '.prof'
+TOKEN_SALT = 'blog.profiling'
+UNRESOLVED = 'unresolved'
+
+
+def get_directory() -> Path:
+    return Path(settings.PROFILING_DIR)
+
+
+def make_token() -> str:
+    """Значение заголовка settings.PROFILING_HEADER, включающего профиль."""
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign('profile')
+
+
+def check_token(token: str) -> bool:
+    try:
+        signing.TimestampSigner(salt=TOKEN_SALT).unsign(
+            token, max_age=settings.PROFILING_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def file_name(view_name) -> str:
+    view = (view_name or UNRESOLVED).replace(':', '.').replace(os.sep, '_')
+    return f'{time.time_ns()}-{os.getpid()}-{view}{SUFFIX}'
+
+
+def view_of(path: Path) -> str:
+    """Имя представления, записанное в имени файла профиля."""
+    view = path.name[:-len(SUFFIX)].split('-', 2)[-1]
+    if view == UNRESOLVED:
+        return view
+    return view.replace('.', ':')
+
+
+def iter_profiles(directory=None):
+    """Файлы профилей от старых к новым."""
+    directory = directory or get_directory()
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob(f'*{SUFFIX}'))
+
+
+def rotate(directory=None, keep=None) -> int:
+    """Оставляет keep последних профилей; возвращает число удалённых."""
+    keep = settings.PROFILING_KEEP if keep is None else keep
+    profiles = iter_profiles(directory)
+    stale = profiles[:max(len(profiles) - keep, 0)]
+    for path in stale:
+        # Файл мог уже удалить соседний процесс.
+        path.unlink(missing_ok=True)
+    return len(stale)
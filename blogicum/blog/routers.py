@@ -0,0 +1,98 @@
+"""Чтение страниц с реплик базы (settings.DATABASE_REPLICAS).
+
+ReplicaReadMiddleware включает реплику на время запроса к CBV
+с атрибутом replica_reads: её выбирает db_for_read, а запись всегда
+идёт в основную базу. Состояние запроса хранится в contextvars,
+поэтому не смешивается между потоками и корутинами ASGI.
+
+Реплики — копии основной базы: в тестах они зеркалят её
+(TEST['MIRROR']), а локально их файлы SQLite обновляет команда
+sync_replicas.
+"""
+import contextlib
+import random
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+@dataclass
+class RoutingState:
+    """Реплика для чтения в текущем запросе и признак записи в нём."""
+
+    replica: Optional[str] = None
+    wrote: bool = False
+
+
+_state: ContextVar[Optional[RoutingState]] = ContextVar(
+    'blog_routing_state', default=None
+)
+
+
+def replica_aliases() -> list:
+    """Псевдонимы всех копий основной базы из settings.DATABASES."""
+    return [
+        alias for alias, database in settings.DATABASES.items()
+        if database.get('TEST', {}).get('MIRROR') == DEFAULT_DB_ALIAS
+    ]
+
+
+def read_replicas() -> list:
+    """Копии, с которых разрешено читать страницы."""
+    return list(getattr(settings, 'DATABASE_REPLICAS', ()))
+
+
+@contextlib.contextmanager
+def routing():
+    """Отслеживает запись в базу внутри блока."""
+    state = RoutingState()
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+def use_replica() -> Optional[str]:
+    """Направляет чтение до конца блока routing() на случайную реплику."""
+    state = _state.get()
+    replicas = read_replicas()
+    if state is None or not replicas:
+        return None
+    state.replica = random.choice(replicas)
+    return state.replica
+
+
+class ReplicaRouter:
+    """Чтение — с реплики запроса, запись — в основную базу."""
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None:
+            return None
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db in replica_aliases():
+            # Объект, прочитанный с реплики, сохраняется в основную базу.
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Схему реплики приносит sync_replicas вместе с данными.
+        if db in replica_aliases():
+            return False
+        return None
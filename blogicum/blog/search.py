@@ -0,0 +1,118 @@
+"""Полнотекстовый поиск по публикациям на SQLite FTS5.
+
+Во встроенных токенизаторах FTS5 нет русского стемминга, поэтому
+в таблицу blog_post_search попадает уже нормализованный текст:
+слова приводятся к основе стеммером Snowball (пакет snowballstemmer),
+а запрос проходит ту же обработку перед MATCH.
+"""
+import re
+import threading
+
+import snowballstemmer
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+SEARCH_TABLE = 'blog_post_search'
+TITLE_WEIGHT = 10.0
+TEXT_WEIGHT = 1.0
+
+_WORD = re.compile(r'\w+')
+_stemmers = threading.local()
+
+
+def stem(word: str) -> str:
+    """Основа русского слова по алгоритму Snowball."""
+    # Стеммеры snowballstemmer хранят состояние: свой на каждый поток.
+    stemmer = getattr(_stemmers, 'russian', None)
+    if stemmer is None:
+        stemmer = _stemmers.russian = snowballstemmer.stemmer('russian')
+    return stemmer.stemWord(word.lower().replace('ё', 'е'))
+
+
+def normalize(text: str) -> list:
+    return [stem(word) for word in _WORD.findall(text or '')]
+
+
+def document(title: str, text: str) -> tuple:
+    """Строка для таблицы поиска: нормализованные заголовок и текст."""
+    return ' '.join(normalize(title)), ' '.join(normalize(text))
+
+
+def is_available() -> bool:
+    return connection.vendor == 'sqlite'
+
+
+def index_post(post):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [post.pk]
+        )
+        cursor.execute(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, title, text) '
+            'VALUES (%s, %s, %s)',
+            [post.pk, *document(post.title, post.text)]
+        )
+
+
+def unindex_post(pk):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [pk])
+
+
+def rebuild_index(queryset, batch_size=1000):
+    """Заполняет таблицу поиска заново и возвращает число публикаций."""
+    total = 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        rows = queryset.values_list('pk', 'title', 'text').iterator(
+            chunk_size=batch_size
+        )
+        batch = []
+        for pk, title, text in rows:
+            batch.append((pk, *document(title, text)))
+            if len(batch) >= batch_size:
+                total += _insert(cursor, batch)
+                batch = []
+        total += _insert(cursor, batch)
+    return total
+
+
+def _insert(cursor, batch):
+    cursor.executemany(
+        f'INSERT INTO {SEARCH_TABLE} (rowid, title, text) '
+        'VALUES (%s, %s, %s)',
+        batch
+    )
+    return len(batch)
+
+
+def search_posts(queryset, query: str):
+    """Публикации из queryset, подходящие под query, по убыванию BM25."""
+    words = normalize(query)
+    if not words:
+        return queryset.none()
+    if not is_available():
+        condition = Q()
+        for word in _WORD.findall(query):
+            condition &= Q(title__icontains=word) | Q(text__icontains=word)
+        return queryset.filter(condition)
+    match = ' '.join(f'"{word}"*' for word in words)
+    table = connection.ops.quote_name(SEARCH_TABLE)
+    posts = connection.ops.quote_name(queryset.model._meta.db_table)
+    matched = RawSQL(
+        f'SELECT rowid FROM {table} WHERE {table} MATCH %s', [match]
+    )
+    # bm25() доступна только в запросе с MATCH к самой таблице поиска.
+    rank = RawSQL(
+        f'SELECT bm25({table}, {TITLE_WEIGHT}, {TEXT_WEIGHT}) FROM {table}'
+        f' WHERE {table}.rowid = {posts}."id" AND {table} MATCH %s',
+        [match]
+    )
+    return queryset.filter(pk__in=matched).annotate(
+        rank=rank
+    ).order_by('rank', '-pub_date')
@@ -0,0 +1,77 @@
+"""Представление моделей блога в JSON для API."""
+from django.core.serializers.json import DjangoJSONEncoder
+from django.urls import reverse
+
+_encoder = DjangoJSONEncoder(ensure_ascii=False)
+
+
+def serialize_category(category):
+    if category is None:
+        return None
+    return {
+        'slug': category.slug,
+        'title': category.title,
+        'description': category.description,
+    }
+
+
+def serialize_author(user):
+    return {
+        'username': user.username,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+    }
+
+
+def serialize_post(post):
+    """Публикация вместе с автором, категорией и местом.
+
+    Связанные объекты должны быть подгружены заранее (with_related).
+    """
+    image = None
+    if post.image:
+        image = {**post.detail_image, 'srcset': post.image_srcset}
+        image.pop('name', None)
+    return {
+        'id': post.id,
+        'url': reverse('api_v1:post_detail', args=[post.id]),
+        'title': post.title,
+        'text': post.text,
+        'pub_date': post.pub_date,
+        'updated_at': post.updated_at,
+        'author': serialize_author(post.author),
+        'category': serialize_category(post.category),
+        'location': (
+            post.location.name
+            if post.location and post.location.is_published else None
+        ),
+        'comment_count': post.comment_count,
+        'image': image,
+    }
+
+
+def serialize_comment(comment):
+    return {
+        'id': comment.id,
+        'author': comment.author.username,
+        'text': comment.text,
+        'created_at': comment.created_at,
+    }
+
+
+def stream_json(header: dict, items, serialize, key='results'):
+    """Генератор JSON-объекта header с массивом key из items.
+
+    Элементы сериализуются по одному, поэтому память не растёт
+    с размером выборки.
+    """
+    head = ''.join(
+        f'{_encoder.encode(name)}: {_encoder.encode(value)}, '
+        for name, value in header.items()
+    )
+    yield f'{{{head}{_encoder.encode(key)}: ['
+    separator = ''
+    for item in items:
+        yield separator + _encoder.encode(serialize(item))
+        separator = ', '
+    yield ']}'
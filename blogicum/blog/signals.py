@@ -0,0 +1,148 @@
+from contextvars import ContextVar
+
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete, post_init, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from blog.cache import (
+    PAGES_VERSION, POSTS_VERSION, RELATED_VERSION, bump_version,
+    comments_version,
+)
+from blog.models import Category, Comment, Location, Post, User
+from blog.post_filter_published import refresh_visibility
+from blog.search import index_post, unindex_post
+from blog.tasks import delete_files
+from jobs.config import PRIORITY_LOW
+from jobs.queue import enqueue
+
+# Публикации, которые удаляются сейчас вместе с комментариями.
+_deleting_posts: ContextVar[frozenset] = ContextVar(
+    'blog_deleting_posts', default=frozenset()
+)
+
+
+@receiver(pre_save, sender=Post)
+def post_raw_dates(sender, instance, raw, **kwargs):
+    """loaddata сохраняет с raw=True, и auto_now не срабатывает."""
+    if raw and instance.updated_at is None:
+        instance.updated_at = instance.created_at or timezone.now()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def posts_changed(sender, **kwargs):
+    bump_version(POSTS_VERSION, PAGES_VERSION)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def categories_changed(sender, **kwargs):
+    bump_version(POSTS_VERSION, PAGES_VERSION, RELATED_VERSION)
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def related_changed(sender, **kwargs):
+    if kwargs.get('update_fields') == frozenset({'last_login'}):
+        return
+    bump_version(PAGES_VERSION, RELATED_VERSION)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comments_changed(sender, instance, **kwargs):
+    bump_version(PAGES_VERSION, comments_version(instance.post_id))
+
+
+def change_comment_count(post_id, delta):
+    """Сдвигает Post.comment_count, не опуская его ниже нуля."""
+    if post_id is None:
+        return
+    posts = Post.objects.filter(pk=post_id)
+    if delta < 0:
+        posts = posts.filter(comment_count__gte=-delta)
+    posts.update(comment_count=F('comment_count') + delta)
+
+
+@receiver(post_init, sender=Comment)
+def comment_loaded(sender, instance, **kwargs):
+    # Публикация, в счётчике которой комментарий уже учтён; через
+    # __dict__, чтобы отложенное поле не загружалось запросом.
+    instance._counted_post_id = instance.__dict__.get('post_id')
+
+
+@receiver(post_save, sender=Comment)
+def comment_counted(sender, instance, created, raw, **kwargs):
+    """Счётчик ведётся при любом сохранении: в представлениях и админке."""
+    if raw:
+        return
+    previous = None if created else instance._counted_post_id
+    if previous != instance.post_id:
+        change_comment_count(previous, -1)
+        change_comment_count(instance.post_id, 1)
+    instance._counted_post_id = instance.post_id
+
+
+@receiver(pre_delete, sender=Post)
+def post_deleting(sender, instance, **kwargs):
+    _deleting_posts.set(_deleting_posts.get() | {instance.pk})
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    _deleting_posts.set(_deleting_posts.get() - {instance.pk})
+
+
+@receiver(pre_delete, sender=Comment)
+def comment_deleting(sender, instance, **kwargs):
+    # Collector шлёт все pre_delete до первого post_delete, поэтому
+    # комментарий узнаёт об удалении публикации здесь, а порядок
+    # post_delete публикации и комментариев уже не важен.
+    instance._post_deleting = instance.post_id in _deleting_posts.get()
+
+
+@receiver(post_delete, sender=Comment)
+def comment_uncounted(sender, instance, **kwargs):
+    if getattr(instance, '_post_deleting', False):
+        # Счётчик удаляемой публикации обновлять незачем.
+        return
+    change_comment_count(instance.post_id, -1)
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, created, raw, **kwargs):
+    if created or raw:
+        return
+    refresh_visibility(Post.objects.filter(category=instance))
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    refresh_visibility(Post.objects.filter(category__isnull=True))
+
+
+@receiver(post_save, sender=Post)
+def post_indexed(sender, instance, raw, **kwargs):
+    if not raw:
+        index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def post_unindexed(sender, instance, **kwargs):
+    unindex_post(instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def post_files_deleted(sender, instance, **kwargs):
+    """Файлы картинки удаляются из хранилища в фоне."""
+    if not instance.image:
+        return
+    names = {instance.image.name} | {
+        variant['name'] for variant in instance.image_variants.values()
+    }
+    enqueue(delete_files, sorted(names), priority=PRIORITY_LOW)
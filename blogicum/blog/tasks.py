@@ -0,0 +1,25 @@
+"""Медленные действия блога, которые выполняет manage.py runworker."""
+from django.core.files.storage import default_storage
+from django.core.mail import send_mail
+
+from blog.images import build_variants, delete_variants
+from blog.models import Post
+
+
+def build_post_image_variants(post_id, image_name):
+    """Строит копии картинки, если у публикации та же картинка."""
+    post = Post.objects.filter(pk=post_id).first()
+    if post is None or post.image.name != image_name:
+        return
+    delete_variants(post.image_variants)
+    post.image_variants = build_variants(post.image)
+    post.save(update_fields=('image_variants', 'updated_at'))
+
+
+def delete_files(names):
+    for name in names:
+        default_storage.delete(name)
+
+
+def send_email(subject, body, from_email, recipients, html=None):
+    send_mail(subject, body, from_email, recipients, html_message=html)
@@ -0,0 +1,17 @@
+from django import template
+
+from blog import pagination
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def page_query(context, **params):
+    """Строка запроса текущей страницы с заменёнными параметрами."""
+    return pagination.page_query(context['request'].GET, **params)
+
+
+@register.simple_tag
+def page_window(page):
+    """Номера страниц вокруг текущей; None — пропуск («…»)."""
+    return pagination.page_window(page)
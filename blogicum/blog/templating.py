@@ -0,0 +1,105 @@
+"""Окружение Jinja2 для шаблонов лент из каталога jinja2/.
+
+Шаблоны jinja2/ — построчные копии шаблонов templates/ и выводят
+тот же HTML байт в байт: фильтры и экранирование берутся из Django
+(finalize делает с каждым {{ }} то же, что движок Django — переводит
+даты в текущий часовой пояс, локализует и экранирует), а фрагменты
+{% cache %} лежат под теми же ключами, что и у тега Django.
+Включается для лент настройкой blog.config.FEED_TEMPLATE_ENGINE.
+"""
+from django.core.cache import InvalidCacheBackendError, caches
+from django.core.cache.utils import make_template_fragment_key
+from django.template import defaultfilters
+from django.templatetags.static import static
+from django.urls import reverse
+from django.utils.formats import localize
+from django.utils.html import conditional_escape
+from django.utils.timezone import template_localtime
+from django_bootstrap5.templatetags.django_bootstrap5 import (
+    bootstrap_button, bootstrap_css, bootstrap_form
+)
+from jinja2 import Environment, nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from blog import pagination
+
+
+def finalize(value):
+    """Вывод значения, как в django.template.base.render_value_in_context."""
+    return conditional_escape(localize(template_localtime(value)))
+
+
+def date(value, arg=None):
+    return defaultfilters.date(template_localtime(value), arg)
+
+
+def linebreaksbr(value):
+    return defaultfilters.linebreaksbr(value, autoescape=True)
+
+
+def url(name, *args, **kwargs):
+    return reverse(name, args=args, kwargs=kwargs)
+
+
+def page_query(request, **params):
+    return pagination.page_query(request.GET, **params)
+
+
+def fragment_cache():
+    try:
+        return caches['template_fragments']
+    except InvalidCacheBackendError:
+        return caches['default']
+
+
+class FragmentCacheExtension(Extension):
+    """{% cache timeout, name, *vary_on %} ... {% endcache %}."""
+
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method('render_cached', [nodes.List(args)]),
+            [], [], body,
+        ).set_lineno(lineno)
+
+    @staticmethod
+    def render_cached(args, caller):
+        timeout, name, *vary_on = args
+        cache = fragment_cache()
+        key = make_template_fragment_key(name, vary_on)
+        value = cache.get(key)
+        if value is None:
+            value = caller()
+            cache.set(key, value, timeout)
+        return Markup(value)
+
+
+def environment(**options):
+    env = Environment(
+        extensions=[FragmentCacheExtension],
+        finalize=finalize,
+        keep_trailing_newline=True,
+        **options,
+    )
+    env.filters.update({
+        'date': date,
+        'linebreaksbr': linebreaksbr,
+        'truncatewords': defaultfilters.truncatewords,
+    })
+    env.globals.update({
+        'bootstrap_button': bootstrap_button,
+        'bootstrap_css': bootstrap_css,
+        'bootstrap_form': bootstrap_form,
+        'page_query': page_query,
+        'page_window': pagination.page_window,
+        'static': static,
+        'url': url,
+    })
+    return env
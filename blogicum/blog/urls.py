@@ -1,6 +1,8 @@
-from django.urls import path, include
+from django.urls import path, include, register_converter
 
-from . import views
+from . import feeds, views
+
+register_converter(feeds.FeedFormatConverter, 'feed')
 
 app_name = 'blog'
 
@@ -25,6 +27,10 @@ posts_urls = [
          name='add_comment'),
 
 
+    path('<int:post_id>/comments/', views.PostCommentsView.as_view(),
+         name='post_comments'),
+
+
     path('<int:post_id>/edit_comment/<int:comment_id>/',
          views.PostEditCommentView.as_view(),
          name='edit_comment'),
@@ -52,6 +58,16 @@ urlpatterns = [
     path('posts/', include(posts_urls)),
     path('profile/', include(profile_urls)),
 
+    # полнотекстовый поиск по публикациям
+    path('search/', views.PostSearchView.as_view(), name='search'),
+
+    # RSS- и Atom-ленты: /feeds/rss/, /feeds/category/<slug>/atom/ и т. д.
+    path('feeds/<feed:feed_format>/', feeds.PostFeed(), name='feed'),
+    path('feeds/category/<slug:category_slug>/<feed:feed_format>/',
+         feeds.CategoryFeed(), name='category_feed'),
+    path('feeds/author/<slug:username>/<feed:feed_format>/',
+         feeds.AuthorFeed(), name='author_feed'),
+
     # просмотр постов определенной категории
     path('category/<slug:category_slug>/', views.CategoryPostsView.as_view(),
          name='category_posts'),
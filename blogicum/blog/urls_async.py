@@ -0,0 +1,35 @@
+from django.urls import URLPattern, URLResolver
+
+from . import async_views
+
+ASYNC_VIEWS = {
+    'index': async_views.AsyncPostIndexView,
+    'post_detail': async_views.AsyncPostDetailView,
+    'profile': async_views.AsyncProfileViews,
+    'category_posts': async_views.AsyncCategoryPostsView,
+}
+
+
+def with_async_views(patterns, namespace=None):
+    """Копия patterns, где страницы чтения блога заменены асинхронными."""
+    result = []
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            pattern = URLResolver(
+                pattern.pattern,
+                with_async_views(
+                    pattern.url_patterns, pattern.namespace or namespace
+                ),
+                pattern.default_kwargs,
+                pattern.app_name,
+                pattern.namespace,
+            )
+        elif namespace == 'blog' and pattern.name in ASYNC_VIEWS:
+            pattern = URLPattern(
+                pattern.pattern,
+                ASYNC_VIEWS[pattern.name].as_view(),
+                pattern.default_args,
+                pattern.name,
+            )
+        result.append(pattern)
+    return result
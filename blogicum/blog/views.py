@@ -1,52 +1,63 @@
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.conf import settings
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.db import transaction
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils.crypto import constant_time_compare
 from django.views.generic import (
-    CreateView, DeleteView, DetailView, ListView, UpdateView
+    CreateView, DeleteView, DetailView, ListView, TemplateView, UpdateView,
+    View,
 )
 
+from blog import metrics
 from blog.forms import CommentForm, PostForm
 from blog.mixins import (
-    CheckMixin, PaginateMixin, PostEditandCreateMixin,
-    PostDetailandDeleteMixin, BasicPostViewMixin,
-    RedirectionMixin, CommentMixin, CommentEditDelete,
+    AnonymousPageCacheMixin, CheckMixin, FeedTemplatesMixin, PaginateMixin,
+    PostEditandCreateMixin, PostConditionalGetMixin, PostDetailandDeleteMixin,
+    BasicPostViewMixin, RedirectionMixin, CommentMixin, CommentEditDelete,
+    CommentPageMixin,
 )
 from blog.models import Category, Post, User
-from blog.post_filter_published import post_filter_count, post_published
+from blog.post_filter_published import post_filter_count
+from blog.search import search_posts
 
 
 class ProfileViews(BasicPostViewMixin, ListView):
     """CBV для страницы профиля"""
 
+    query_budget = 5
+    replica_reads = True
+
     template_name = 'blog/profile.html'
     ordering = ['-pub_date']
 
     def get_queryset(self):
-        posts = Post.objects
         self.profile = get_object_or_404(
             User,
             username=self.kwargs['username']
         )
-        posts = post_filter_count(posts).filter(
-            author=self.profile
+        return post_filter_count(
+            Post.objects.visible_to(self.request.user)
+        ).filter(author=self.profile)
+
+    def get_count_signature(self):
+        return (
+            *super().get_count_signature(),
+            self.request.user == self.profile,
         )
-        if self.request.user != self.profile:
-            posts = super().get_queryset().filter(
-                author=self.profile
-            )
-        return posts
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        username = self.kwargs['username']
-        profile = get_object_or_404(User, username=username)
-        context['profile'] = profile
+        context['profile'] = self.profile
         return context
 
 
 class EditProfileViews(LoginRequiredMixin, RedirectionMixin, UpdateView):
     """CBV для редактирования профиля"""
 
+    query_budget = 4
+
     model = User
     fields = (
         'first_name',
@@ -66,12 +77,15 @@ class PostCreateViews(LoginRequiredMixin, RedirectionMixin,
                       CreateView):
     """CBV для создание новых постов"""
 
-    pass
+    query_budget = 7
 
 
 class PostIndexView(BasicPostViewMixin, PaginateMixin, ListView):
     """CBV для оторожения постов на главной странице"""
 
+    query_budget = 4
+    replica_reads = True
+
     template_name = 'blog/index.html'
 
 
@@ -79,42 +93,83 @@ class PostEditView(LoginRequiredMixin, CheckMixin,
                    PostEditandCreateMixin, UpdateView):
     """СBV для редактирования поста"""
 
+    query_budget = 10
+
     def get_success_url(self):
         return reverse(
             'blog:post_detail', args=[self.kwargs['post_id']]
         )
 
 
-class PostDetailView(PostDetailandDeleteMixin, DetailView):
+class PostDetailView(FeedTemplatesMixin, PostConditionalGetMixin,
+                     AnonymousPageCacheMixin, CommentPageMixin,
+                     PostDetailandDeleteMixin, DetailView):
     """CBV для отоброжения отдельного поста и коммента"""
 
+    query_budget = 4
+    replica_reads = True
+
     def get_object(self):
-        post = get_object_or_404(Post, pk=self.kwargs['post_id'])
-        if self.request.user == post.author:
-            return post
-        return get_object_or_404(post_published(), pk=self.kwargs['post_id'])
+        return get_object_or_404(
+            self.get_queryset(), pk=self.kwargs['post_id']
+        )
 
     def get_queryset(self):
-        return super().get_queryset().select_related(
-            'author',
-            'location',
-            'category',
-        )
+        return Post.objects.visible_to(self.request.user).with_related()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = (
-            self.object.comments.select_related('author')
+        context['comments_page'] = self.get_comments_page(self.object)
+        context['comments'] = context['comments_page'].object_list
+        return context
+
+
+class PostCommentsView(FeedTemplatesMixin, PostConditionalGetMixin,
+                       AnonymousPageCacheMixin, CommentPageMixin,
+                       TemplateView):
+    """CBV для подгрузки следующей порции комментариев"""
+
+    query_budget = 4
+
+    template_name = 'includes/comment_list.html'
+    page_cache_params = ('after', 'before', 'format')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['post'] = get_object_or_404(
+            Post.objects.visible_to(self.request.user),
+            pk=self.kwargs['post_id']
         )
+        context['comments_page'] = self.get_comments_page(context['post'])
+        context['comments'] = context['comments_page'].object_list
         return context
 
+    def render_to_response(self, context, **response_kwargs):
+        if self.request.GET.get('format') != 'json':
+            return super().render_to_response(context, **response_kwargs)
+        page = context['comments_page']
+        return JsonResponse({
+            'comments': [
+                {
+                    'id': comment.id,
+                    'author': comment.author.username,
+                    'text': comment.text,
+                    'created_at': comment.created_at,
+                }
+                for comment in page.object_list
+            ],
+            'next': page.next_cursor,
+        })
+
 
 class PostDeleteView(LoginRequiredMixin, RedirectionMixin,
                      CheckMixin, PostEditandCreateMixin,
                      DeleteView):
     """CBV для удаления поста"""
 
+    query_budget = 9
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = PostForm(instance=self.object)
@@ -125,9 +180,15 @@ class CreateCommentView(LoginRequiredMixin, CommentMixin,
                         CreateView):
     """CBV для добавления комментариев"""
 
+    query_budget = 7
+
+    @transaction.atomic
     def form_valid(self, form):
         form.instance.author = self.request.user
-        form.instance.post = get_object_or_404(Post, pk=self.kwargs['post_id'])
+        form.instance.post = get_object_or_404(
+            Post.objects.visible_to(self.request.user),
+            pk=self.kwargs['post_id']
+        )
         return super().form_valid(form)
 
     def get_success_url(self):
@@ -140,19 +201,22 @@ class PostEditCommentView(LoginRequiredMixin, CommentEditDelete,
                           CheckMixin, UpdateView):
     """CBV для редактирование комментариев"""
 
-    pass
+    query_budget = 6
 
 
 class PostDeleteCommentView(LoginRequiredMixin, CommentEditDelete, CheckMixin,
                             DeleteView):
     """CBV для удаления комментариев"""
 
-    pass
+    query_budget = 10
 
 
 class CategoryPostsView(BasicPostViewMixin, ListView):
     """CBV для вывода постов по категориям"""
 
+    query_budget = 5
+    replica_reads = True
+
     model = Category
     template_name = 'blog/category.html'
 
@@ -170,3 +234,56 @@ class CategoryPostsView(BasicPostViewMixin, ListView):
         context = super().get_context_data(**kwargs)
         context['category'] = self.category
         return context
+
+
+class PostSearchView(BasicPostViewMixin, ListView):
+    """CBV для полнотекстового поиска по публикациям"""
+
+    query_budget = 5
+
+    template_name = 'blog/search.html'
+    page_cache_params = ('q', 'page')
+
+    def use_keyset_pagination(self):
+        return False
+
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        return search_posts(super().get_queryset(), self.query)
+
+    def get_count_signature(self):
+        return (*super().get_count_signature(), self.query)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
+        return context
+
+
+class MetricsView(UserPassesTestMixin, View):
+    """CBV для сборщика метрик Prometheus.
+
+    Отвечает 403 всем, кроме адресов settings.METRICS_ALLOWED_IPS,
+    сотрудников и запросов с settings.METRICS_TOKEN в заголовке
+    Authorization: Bearer.
+    """
+
+    raise_exception = True
+
+    def test_func(self):
+        token = getattr(settings, 'METRICS_TOKEN', None)
+        if token and constant_time_compare(
+            self.request.META.get('HTTP_AUTHORIZATION', ''),
+            f'Bearer {token}',
+        ):
+            return True
+        return (
+            self.request.META.get('REMOTE_ADDR')
+            in getattr(settings, 'METRICS_ALLOWED_IPS', ())
+            or self.request.user.is_staff
+        )
+
+    def get(self, request):
+        return HttpResponse(
+            metrics.export(), content_type=metrics.CONTENT_TYPE
+        )
@@ -1,3 +1,4 @@
+from importlib.util import find_spec
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -24,26 +25,83 @@ INSTALLED_APPS = [
     'debug_toolbar',
     'abstractions.apps.AbstractionsConfig',
     'blog.apps.BlogConfig',
+    'jobs.apps.JobsConfig',
     'pages.apps.PagesConfig',
 ]
 
 MIDDLEWARE = [
+    'blog.middleware.ProfilingMiddleware',
+    'blog.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'blog.middleware.AsgiUrlconfMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'blog.middleware.ReplicaReadMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
+    'blog.middleware.DebugToolbarMiddleware',
+    'blog.middleware.QueryBudgetMiddleware',
 ]
 
 INTERNAL_IPS = [
     '127.0.0.1',
 ]
 
+# Контроль числа SQL-запросов на представление (blog.middleware).
+QUERY_BUDGET_ENABLED = DEBUG
+
+QUERY_BUDGET_RAISE = False
+
+QUERY_BUDGET_DEFAULT = 10
+
+QUERY_BUDGETS = {}
+
+# Профили cProfile отдельных запросов (blog.middleware.ProfilingMiddleware):
+# по подписанному заголовку или случайной доле запросов.
+PROFILING_ENABLED = True
+
+PROFILING_SAMPLE_RATE = 0.0
+
+PROFILING_HEADER = 'X-Profile'
+
+PROFILING_TOKEN_MAX_AGE = 60 * 60
+
+PROFILING_DIR = BASE_DIR / 'profiles'
+
+PROFILING_KEEP = 500
+
+# Метрики для /metrics (blog.metrics). С несколькими процессами WSGI
+# задайте общий для воркеров METRICS_DIR и очищайте его при запуске.
+METRICS_ENABLED = True
+
+METRICS_DIR = None
+
+METRICS_FLUSH_INTERVAL = 5
+
+# /metrics отдаётся адресам METRICS_ALLOWED_IPS, сотрудникам (is_staff)
+# и сборщику с заголовком Authorization: Bearer <METRICS_TOKEN>.
+METRICS_ALLOWED_IPS = INTERNAL_IPS
+
+METRICS_TOKEN = None
+
+CACHES = {
+    'default': {
+        'BACKEND': 'blog.metrics.LocMemCache',
+    }
+}
+
+# Кэш версий данных для ключей кэша и ETag (blog.cache). С несколькими
+# процессами он должен быть общим для них: Memcached, Redis или база.
+VERSION_CACHE = 'default'
+
 ROOT_URLCONF = 'blogicum.urls'
 
+# Адреса для запросов через blogicum/asgi.py: страницы чтения
+# обслуживают асинхронные представления (blog.async_views).
+ASGI_URLCONF = 'blogicum.urls_async'
+
 TEMPLATES_DIR = BASE_DIR / 'templates'
 
 TEMPLATES = [
@@ -62,6 +120,24 @@ TEMPLATES = [
     },
 ]
 
+# Копии шаблонов лент для Jinja2 (blog.config.FEED_TEMPLATE_ENGINE);
+# движок подключается, только если пакет Jinja2 установлен.
+if find_spec('jinja2') is not None:
+    TEMPLATES.append({
+        'BACKEND': 'django.template.backends.jinja2.Jinja2',
+        'DIRS': [BASE_DIR / 'jinja2'],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            'environment': 'blog.templating.environment',
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    })
+
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 
@@ -72,9 +148,27 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    },
+    # Копия основной базы только для чтения; обновляется командой
+    # sync_replicas, в тестах зеркалит default.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.replica.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    },
 }
 
+DATABASE_ROUTERS = ['blog.routers.ReplicaRouter']
+
+# Реплики, с которых читают страницы лент и публикаций
+# (blog.middleware.ReplicaReadMiddleware), например ['replica'].
+DATABASE_REPLICAS = []
+
+# После записи посетитель читает с основной базы столько секунд.
+REPLICA_PIN_COOKIE = 'primary_reads'
+
+REPLICA_PIN_SECONDS = 30
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
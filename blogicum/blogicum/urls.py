@@ -2,9 +2,13 @@ from django.contrib import admin
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.views import PasswordResetView
 from django.views.generic.edit import CreateView
 from django.urls import path, include, reverse_lazy
 
+from blog.forms import QueuedPasswordResetForm
+from blog.views import MetricsView
+
 
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.server_error'
@@ -12,6 +16,11 @@ handler500 = 'pages.views.server_error'
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('pages/', include('pages.urls', namespace='pages')),
+    path(
+        'auth/password_reset/',
+        PasswordResetView.as_view(form_class=QueuedPasswordResetForm),
+        name='password_reset',
+    ),
     path('auth/', include('django.contrib.auth.urls')),
     path(
         'auth/registration/',
@@ -22,6 +31,8 @@ urlpatterns = [
         ),
         name='registration',
     ),
+    path('api/v1/', include('blog.api_urls', namespace='api_v1')),
+    path('metrics', MetricsView.as_view(), name='metrics'),
     path('', include('blog.urls', namespace='blog')),
 ]
 
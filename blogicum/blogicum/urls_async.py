@@ -0,0 +1,6 @@
+from blog.urls_async import with_async_views
+from blogicum.urls import handler404, handler500, urlpatterns
+
+__all__ = ('handler404', 'handler500', 'urlpatterns')
+
+urlpatterns = with_async_views(urlpatterns)
@@ -0,0 +1,19 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobModel(admin.ModelAdmin):
+    list_display = (
+        'task',
+        'status',
+        'priority',
+        'attempts',
+        'run_at',
+        'started_at',
+        'finished_at',
+    )
+    list_filter = ('status', 'task')
+    search_fields = ('task', 'last_error')
+    readonly_fields = ('created_at', 'started_at', 'finished_at')
@@ -0,0 +1,12 @@
+# Число попыток выполнить задачу, прежде чем пометить её упавшей.
+MAX_ATTEMPTS: int = 5
+# Пауза перед повтором, секунды; удваивается с каждой попыткой.
+RETRY_DELAY: int = 30
+# Как часто свободный поток воркера проверяет очередь, секунды.
+POLL_INTERVAL: float = 1.0
+# Задача в статусе running дольше этого срока считается брошенной.
+STALE_AFTER: int = 60 * 10
+# Приоритеты: больше — раньше.
+PRIORITY_LOW: int = -10
+PRIORITY_NORMAL: int = 0
+PRIORITY_HIGH: int = 10
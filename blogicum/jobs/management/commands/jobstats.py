@@ -0,0 +1,49 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from jobs.queue import purge, stats
+
+
+class Command(BaseCommand):
+    help = 'Показывает длину очереди фоновых задач и их задержки.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--window',
+            type=int,
+            default=60,
+            help='За сколько минут считать задержки завершённых задач.',
+        )
+        parser.add_argument(
+            '--purge',
+            type=int,
+            metavar='DAYS',
+            help='Удалить выполненные задачи старше DAYS дней.',
+        )
+
+    def handle(self, *args, **options):
+        if options['purge'] is not None:
+            deleted = purge(datetime.timedelta(days=options['purge']))
+            self.stdout.write(f'Удалено выполненных задач: {deleted}')
+        result = stats(datetime.timedelta(minutes=options['window']))
+        for status, total in result['counts'].items():
+            self.stdout.write(f'{status}: {total}')
+        self.stdout.write(f'Готово к выполнению: {result["ready"]}')
+        self.stdout.write(
+            f'Ждёт дольше всех: {self.seconds(result["oldest_ready_age"])}'
+        )
+        self.stdout.write(
+            f'Завершено за {options["window"]} мин: {result["finished"]}'
+        )
+        for name, title in (('wait', 'Ожидание'), ('run', 'Выполнение')):
+            self.stdout.write(
+                f'{title}: среднее {self.seconds(result[f"{name}_avg"])},'
+                f' максимум {self.seconds(result[f"{name}_max"])}'
+            )
+
+    @staticmethod
+    def seconds(value):
+        if value is None:
+            return '—'
+        return f'{value.total_seconds():.2f} с'
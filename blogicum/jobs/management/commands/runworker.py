@@ -0,0 +1,80 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from jobs.config import POLL_INTERVAL, STALE_AFTER
+from jobs.queue import claim, requeue_stale, run_job
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет фоновые задачи из очереди в пуле потоков.'
+        ' Можно запустить несколько процессов: задачи не задваиваются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=2,
+            help='Число потоков-исполнителей.',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=POLL_INTERVAL,
+            help='Пауза между проверками пустой очереди, секунды.',
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Выполнить готовые задачи и завершиться.',
+        )
+
+    def handle(self, *args, **options):
+        self.stopping = threading.Event()
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda *_: self.stopping.set())
+        requeued = requeue_stale(STALE_AFTER)
+        if requeued:
+            self.stdout.write(f'Возвращено в очередь задач: {requeued}')
+        self.processed = 0
+        self.lock = threading.Lock()
+        threads = [
+            threading.Thread(
+                target=self.work,
+                args=(options['poll_interval'], options['burst']),
+                name=f'runworker-{number}',
+                daemon=True,
+            )
+            for number in range(options['threads'])
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            self.stopping.set()
+            for thread in threads:
+                thread.join()
+        self.stdout.write(f'Выполнено задач: {self.processed}')
+
+    def work(self, poll_interval, burst):
+        try:
+            while not self.stopping.is_set():
+                job = claim()
+                if job is None:
+                    if burst:
+                        return
+                    self.stopping.wait(poll_interval)
+                    continue
+                run_job(job)
+                with self.lock:
+                    self.processed += 1
+                close_old_connections()
+        finally:
+            close_old_connections()
@@ -0,0 +1,54 @@
+from django.db import models
+from django.utils import timezone
+
+from jobs.config import MAX_ATTEMPTS, PRIORITY_NORMAL
+
+
+class Job(models.Model):
+    """Отложенный вызов функции, который выполнит manage.py runworker."""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Упала'),
+    )
+
+    task = models.CharField('Функция', max_length=256)
+    args = models.JSONField('Аргументы', default=list, blank=True)
+    kwargs = models.JSONField('Именованные аргументы', default=dict,
+                              blank=True)
+    priority = models.SmallIntegerField('Приоритет', default=PRIORITY_NORMAL)
+    status = models.CharField(
+        'Статус', max_length=16, choices=STATUSES, default=PENDING
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    max_attempts = models.PositiveSmallIntegerField(
+        'Максимум попыток', default=MAX_ATTEMPTS
+    )
+    run_at = models.DateTimeField('Выполнить не раньше', default=timezone.now)
+    created_at = models.DateTimeField('Добавлена', auto_now_add=True)
+    started_at = models.DateTimeField('Начата', null=True, blank=True)
+    finished_at = models.DateTimeField('Завершена', null=True, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        verbose_name = 'задача'
+        verbose_name_plural = 'Задачи'
+        ordering = ('-created_at',)
+        indexes = [
+            models.Index(
+                fields=['-priority', 'run_at', 'id'],
+                condition=models.Q(status='pending'),
+                name='job_ready_idx',
+            ),
+            models.Index(fields=['status', 'finished_at'],
+                         name='job_status_finished_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.task} [{self.status}]'
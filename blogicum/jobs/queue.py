@@ -0,0 +1,162 @@
+"""Очередь фоновых задач в таблице jobs_job.
+
+Задача — это путь к функции и её аргументы в JSON. Воркер забирает
+готовую задачу одним UPDATE ... WHERE status = 'pending', поэтому
+несколько потоков и процессов runworker не выполнят её дважды.
+"""
+import datetime
+import logging
+import traceback
+
+from django.db import close_old_connections, transaction
+from django.db.models import Avg, Count, DurationField, F, Max, Min
+from django.db.models import ExpressionWrapper
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from jobs.config import PRIORITY_NORMAL, RETRY_DELAY, STALE_AFTER
+from jobs.models import Job
+
+logger = logging.getLogger('jobs')
+
+
+def task_name(func) -> str:
+    if isinstance(func, str):
+        return func
+    return f'{func.__module__}.{func.__qualname__}'
+
+
+def enqueue(func, *args, priority=PRIORITY_NORMAL, delay=0,
+            max_attempts=None, **kwargs) -> Job:
+    """Ставит вызов func(*args, **kwargs) в очередь.
+
+    Запись создаётся в текущей транзакции: воркер увидит задачу
+    только вместе с данными, ради которых она поставлена.
+    """
+    job = Job(
+        task=task_name(func),
+        args=list(args),
+        kwargs=kwargs,
+        priority=priority,
+        run_at=timezone.now() + datetime.timedelta(seconds=delay),
+    )
+    if max_attempts is not None:
+        job.max_attempts = max_attempts
+    job.save()
+    return job
+
+
+def claim(now=None):
+    """Забирает самую приоритетную готовую задачу или возвращает None."""
+    now = now or timezone.now()
+    while True:
+        job = (
+            Job.objects.filter(status=Job.PENDING, run_at__lte=now)
+            .order_by('-priority', 'run_at', 'id')
+            .first()
+        )
+        if job is None:
+            return None
+        claimed = Job.objects.filter(pk=job.pk, status=Job.PENDING).update(
+            status=Job.RUNNING,
+            started_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def run_job(job: Job) -> bool:
+    """Выполняет задачу и записывает результат; True — если успешно."""
+    try:
+        with transaction.atomic():
+            import_string(job.task)(*job.args, **job.kwargs)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            job.status = Job.FAILED
+            job.finished_at = timezone.now()
+            logger.error('Задача %s #%s упала', job.task, job.pk)
+        else:
+            job.status = Job.PENDING
+            job.run_at = timezone.now() + datetime.timedelta(
+                seconds=RETRY_DELAY * 2 ** (job.attempts - 1)
+            )
+            logger.warning(
+                'Задача %s #%s упала, повтор в %s',
+                job.task, job.pk, job.run_at
+            )
+        job.save(
+            update_fields=('status', 'run_at', 'finished_at', 'last_error')
+        )
+        return False
+    job.status = Job.DONE
+    job.finished_at = timezone.now()
+    job.save(update_fields=('status', 'finished_at'))
+    return True
+
+
+def run_pending(limit=None) -> int:
+    """Выполняет готовые задачи в текущем потоке; возвращает их число."""
+    done = 0
+    while limit is None or done < limit:
+        job = claim()
+        if job is None:
+            break
+        run_job(job)
+        close_old_connections()
+        done += 1
+    return done
+
+
+def requeue_stale(stale_after=STALE_AFTER) -> int:
+    """Возвращает в очередь задачи, брошенные упавшим воркером."""
+    deadline = timezone.now() - datetime.timedelta(seconds=stale_after)
+    return Job.objects.filter(
+        status=Job.RUNNING, started_at__lt=deadline
+    ).update(status=Job.PENDING, run_at=timezone.now())
+
+
+def purge(older_than: datetime.timedelta) -> int:
+    """Удаляет выполненные задачи старше older_than."""
+    deleted, _ = Job.objects.filter(
+        status=Job.DONE, finished_at__lt=timezone.now() - older_than
+    ).delete()
+    return deleted
+
+
+def _duration(start, end):
+    return ExpressionWrapper(F(end) - F(start), output_field=DurationField())
+
+
+def stats(window: datetime.timedelta = datetime.timedelta(hours=1)) -> dict:
+    """Длина очереди и задержки задач, завершённых за последний window.
+
+    wait — сколько задача ждала воркера после run_at,
+    run — сколько она выполнялась.
+    """
+    now = timezone.now()
+    counts = dict(
+        Job.objects.order_by().values_list('status')
+        .annotate(total=Count('id'))
+    )
+    ready = Job.objects.filter(status=Job.PENDING, run_at__lte=now)
+    oldest = ready.aggregate(oldest=Min('run_at'))['oldest']
+    finished = Job.objects.filter(
+        status__in=(Job.DONE, Job.FAILED), finished_at__gte=now - window
+    ).aggregate(
+        finished=Count('id'),
+        wait_avg=Avg(_duration('run_at', 'started_at')),
+        wait_max=Max(_duration('run_at', 'started_at')),
+        run_avg=Avg(_duration('started_at', 'finished_at')),
+        run_max=Max(_duration('started_at', 'finished_at')),
+    )
+    return {
+        'counts': {
+            status: counts.get(status, 0) for status, _ in Job.STATUSES
+        },
+        'ready': ready.count(),
+        'oldest_ready_age': now - oldest if oldest else None,
+        **finished,
+    }
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from blog.config import POST_SLICE
+
+
+def get_json(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, (
+        f'Убедитесь, что API по адресу {url} отвечает 200.'
+    )
+    return json.loads(b''.join(
+        response.streaming_content if response.streaming
+        else [response.content]
+    ))
+
+
+@pytest.mark.django_db
+def test_post_list_api(client, many_posts_with_published_locations):
+    assert client.get('/api/v1/posts/').streaming, (
+        'Убедитесь, что списки API отдаются StreamingHttpResponse.'
+    )
+    data = get_json(client, '/api/v1/posts/')
+    assert data['count'] == len(many_posts_with_published_locations)
+    assert len(data['results']) == POST_SLICE
+    assert data['next'] == '?page=2' and data['previous'] is None
+    first = data['results'][0]
+    assert {'id', 'title', 'text', 'pub_date', 'author', 'category',
+            'location', 'comment_count', 'url'} <= set(first), (
+        'Убедитесь, что публикация в API содержит основные поля.'
+    )
+
+    data = get_json(client, '/api/v1/posts/?page_size=3&page=2')
+    assert len(data['results']) == 3 and data['previous'] == (
+        '?page_size=3&page=1'
+    ), 'Убедитесь, что API учитывает параметр page_size.'
+
+    data = get_json(client, '/api/v1/posts/?after=')
+    assert 'count' not in data and data['next'].startswith('?after='), (
+        'Убедитесь, что курсорная страница API ссылается на следующую.'
+    )
+
+
+@pytest.mark.django_db
+def test_api_follows_visibility_rules(
+        client, unpublished_posts_with_published_locations,
+        posts_with_unpublished_category, future_posts
+):
+    data = get_json(client, '/api/v1/posts/')
+    assert data['count'] == 0 and data['results'] == [], (
+        'Убедитесь, что API показывает только видимые в ленте публикации.'
+    )
+
+
+@pytest.mark.django_db
+def test_category_and_profile_api(
+        client, user_client, user, post_with_published_location
+):
+    post = post_with_published_location
+    data = get_json(
+        client, f'/api/v1/categories/{post.category.slug}/posts/'
+    )
+    assert data['category']['slug'] == post.category.slug
+    assert [item['id'] for item in data['results']] == [post.id]
+
+    post.is_published = False
+    post.save()
+    url = f'/api/v1/profiles/{post.author.username}/posts/'
+    assert get_json(client, url)['results'] == []
+    data = get_json(user_client, url)
+    assert [item['id'] for item in data['results']] == [post.id], (
+        'Убедитесь, что автор видит в API свои скрытые публикации.'
+    )
+    assert client.get('/api/v1/profiles/no-such-user/posts/').status_code \
+        == 404
+
+    data = get_json(client, '/api/v1/categories/')
+    assert [item['slug'] for item in data['results']] == [post.category.slug]
+
+
+@pytest.mark.django_db
+def test_post_detail_api(client, post_with_published_location, mixer):
+    post = post_with_published_location
+    mixer.cycle(25).blend('blog.Comment', post=post)
+    data = get_json(client, f'/api/v1/posts/{post.id}/')
+    assert data['id'] == post.id and len(data['comments']) == 20
+    assert data['comments_next'].startswith(
+        f'/api/v1/posts/{post.id}/comments/?after='
+    ), 'Убедитесь, что детальная публикация ссылается на комментарии.'
+
+    rest = get_json(client, data['comments_next'])
+    assert len(rest['results']) == 5 and rest['next'] is None
+    assert client.get('/api/v1/posts/100500/').status_code == 404
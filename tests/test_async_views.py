@@ -0,0 +1,124 @@
+import pytest
+from asgiref.sync import SyncToAsync, async_to_sync
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.test import override_settings
+
+from blog import async_views, metrics
+
+
+def asgi_get(async_client, url):
+    async def request():
+        return await async_client.get(url)
+
+    return async_to_sync(request)()
+
+
+@pytest.fixture
+def pages(post_with_published_location, comment_to_a_post):
+    post = post_with_published_location
+    return {
+        '/': async_views.AsyncPostIndexView,
+        f'/category/{post.category.slug}/':
+            async_views.AsyncCategoryPostsView,
+        f'/profile/{post.author.username}/': async_views.AsyncProfileViews,
+        f'/posts/{post.id}/': async_views.AsyncPostDetailView,
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+def test_asgi_pages_match_wsgi_pages(client, async_client, pages):
+    for url, view_class in pages.items():
+        cache.clear()
+        expected = client.get(url)
+        cache.clear()
+        response = asgi_get(async_client, url)
+        assert type(response.context['view']) is view_class, (
+            f'Убедитесь, что под ASGI страницу {url} обслуживает'
+            f' {view_class.__name__}.'
+        )
+        assert response.status_code == expected.status_code == 200
+        assert response.content == expected.content, (
+            f'Убедитесь, что асинхронная страница {url} совпадает'
+            ' с синхронной.'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_asgi_pages_return_404(async_client, post_with_published_location):
+    for url in (
+        '/category/no-such-category/',
+        '/profile/no-such-user/',
+        '/posts/100500/',
+        '/?page=100500',
+    ):
+        response = asgi_get(async_client, url)
+        assert response.status_code == 404, (
+            f'Убедитесь, что асинхронная страница {url} отвечает 404.'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_asgi_profile_shows_hidden_posts_to_owner(
+        client, async_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    client.force_login(post.author)
+    async_client.force_login(post.author)
+    url = f'/profile/{post.author.username}/'
+    content = asgi_get(async_client, url).content
+    assert content == client.get(url).content
+    assert post.title.encode() in content, (
+        'Убедитесь, что автор видит свои скрытые публикации'
+        ' и на асинхронной странице профиля.'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_streaming_api_under_asgi(async_client, post_with_published_location):
+    response = asgi_get(async_client, '/api/v1/posts/')
+    assert response.status_code == 200
+    assert str(post_with_published_location.id).encode() in b''.join(
+        response.streaming_content
+    ), 'Убедитесь, что потоковый ответ API работает и под ASGI.'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_asgi_pages_answer_conditional_get(client, async_client, pages):
+    for url in pages:
+        etag = client.get(url)['ETag']
+
+        async def request():
+            return await async_client.get(url, **{'if-none-match': etag})
+
+        assert async_to_sync(request)().status_code == 304, (
+            f'Убедитесь, что асинхронная страница {url} отвечает 304.'
+        )
+
+
+@override_settings(
+    QUERY_BUDGET_ENABLED=True, PROFILING_ENABLED=True, METRICS_ENABLED=True,
+    DATABASE_REPLICAS=['replica'],
+)
+def test_asgi_middleware_chain_is_async():
+    assert settings.ASGI_URLCONF
+    chain = ASGIHandler()._middleware_chain
+    assert not isinstance(chain, SyncToAsync), (
+        'Убедитесь, что все middleware из MIDDLEWARE умеют работать'
+        ' асинхронно и цепочка ASGI не уходит в поток целиком.'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_asgi_queries_are_measured(async_client, post_with_published_location):
+    key = ('blog_db_queries', (('view', 'blog:index'),))
+    before = metrics.collect()['histograms'].get(key, [0, 0])[-2]
+    asgi_get(async_client, '/?page=1')
+    after = metrics.collect()['histograms'][key][-2]
+    assert after > before, (
+        'Убедитесь, что под ASGI метрики blog_db_* учитывают запросы,'
+        ' выполненные в пуле потоков.'
+    )
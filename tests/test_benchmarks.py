@@ -0,0 +1,96 @@
+import io
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Count, Sum
+from django.test import Client, override_settings
+from django.utils import timezone
+
+from blog import benchmarking
+from blog.models import Category, Comment, Location, Post, User
+
+DATASET = {
+    'users': 6, 'categories': 3, 'locations': 2, 'posts': 60,
+    'comments': 300, 'seed': 1,
+}
+
+
+def generate(**options):
+    call_command('generate_data', **{**DATASET, **options},
+                 stdout=io.StringIO())
+
+
+@pytest.mark.django_db
+def test_generate_data_volumes():
+    generate(scheduled=0.2, unpublished=0.2)
+    assert (
+        User.objects.count(), Category.objects.count(),
+        Location.objects.count(), Post.objects.count(),
+        Comment.objects.count(),
+    ) == (6, 3, 2, 60, 300), (
+        'Убедитесь, что generate_data создаёт заданное число объектов.'
+    )
+    now = timezone.now()
+    assert Post.objects.filter(pub_date__gt=now).exists(), (
+        'Убедитесь, что часть публикаций отложена.'
+    )
+    assert not Post.objects.filter(
+        pub_date__gt=now, is_visible=True
+    ).exists(), 'Убедитесь, что после генерации пересчитан is_visible.'
+    assert Post.objects.filter(is_published=False).exists()
+    assert not Comment.objects.filter(post__pub_date__gt=now).exists(), (
+        'Убедитесь, что комментарии не попадают в отложенные публикации.'
+    )
+    assert Post.objects.aggregate(
+        total=Sum('comment_count')
+    )['total'] == 300, 'Убедитесь, что пересчитан Post.comment_count.'
+
+
+@pytest.mark.django_db
+def test_generate_data_skews_comments():
+    generate(scheduled=0, skew=1.5)
+    counts = sorted(
+        Post.objects.annotate(total=Count('comments'))
+        .values_list('total', flat=True),
+        reverse=True,
+    )
+    assert sum(counts[:6]) > sum(counts) / 2, (
+        'Убедитесь, что большую часть комментариев получают немногие'
+        ' популярные публикации.'
+    )
+
+
+@pytest.mark.django_db
+def test_benchmark_routes_reports_and_checks(tmp_path, monkeypatch):
+    generate(scheduled=0, unpublished=0)
+    path = tmp_path / 'thresholds.json'
+    monkeypatch.setattr(benchmarking, 'THRESHOLDS_PATH', path)
+    out = io.StringIO()
+    call_command('benchmark_routes', '--requests', '2',
+                 '--update-thresholds', stdout=out, stderr=io.StringIO())
+    report = out.getvalue()
+    for name in ('blog:index', 'blog:edit_comment', 'pages:rules'):
+        assert name in report, f'В отчёте нет маршрута `{name}`.'
+    thresholds = json.loads(path.read_text(encoding='utf-8'))
+    assert thresholds['user']['blog:index']['queries'] > 0
+
+    thresholds['user']['blog:index']['queries'] = 0
+    path.write_text(json.dumps(thresholds), encoding='utf-8')
+    with pytest.raises(CommandError, match='blog:index'):
+        call_command('benchmark_routes', 'blog:index', '--requests', '2',
+                     stdout=io.StringIO(), stderr=io.StringIO())
+
+
+@pytest.mark.django_db(transaction=True, databases=['default', 'replica'])
+def test_measure_counts_replica_queries(post_with_published_location):
+    client = Client()
+    client.force_login(post_with_published_location.author)
+    primary = benchmarking.measure(client, '/', repeat=1)
+    with override_settings(DATABASE_REPLICAS=['replica']):
+        client = Client()
+        client.force_login(post_with_published_location.author)
+        replica = benchmarking.measure(client, '/', repeat=1)
+    assert replica['queries'] == primary['queries'] > 0, (
+        'Убедитесь, что замер учитывает запросы к репликам.'
+    )
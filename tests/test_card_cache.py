@@ -0,0 +1,97 @@
+import io
+import json
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from blog import cache, search
+from blog.models import Post
+
+
+@pytest.mark.django_db
+def test_post_card_fragment_is_cached_by_version(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    original_title = post.title
+    user_client.get('/')
+
+    Post.objects.filter(pk=post.pk).update(title='Без смены версии')
+    content = user_client.get('/').content.decode('utf-8')
+    assert original_title in content, (
+        'Убедитесь, что карточка публикации берётся из кэша фрагментов.'
+    )
+
+    post.refresh_from_db()
+    post.title = 'Отредактированный заголовок'
+    post.save()
+    content = user_client.get('/').content.decode('utf-8')
+    assert post.title in content, (
+        'Убедитесь, что сохранение публикации сбрасывает кэш её карточки.'
+    )
+
+
+@pytest.mark.django_db
+def test_feed_reads_related_version_once(
+        client, monkeypatch, many_posts_with_published_locations
+):
+    versions = cache.version_cache()
+    reads = []
+
+    class CountingCache:
+        def __getattr__(self, name):
+            return getattr(versions, name)
+
+        def get(self, key, *args, **kwargs):
+            reads.append(key)
+            return versions.get(key, *args, **kwargs)
+
+    monkeypatch.setattr(cache, 'version_cache', CountingCache)
+    client.get('/')
+    assert reads.count('blog:version:related') <= 1, (
+        'Убедитесь, что версия связанных данных читается один раз'
+        ' на страницу, а не для каждой карточки.'
+    )
+
+
+@pytest.mark.django_db
+def test_db_json_loads_with_updated_at():
+    call_command(
+        'loaddata', settings.BASE_DIR.parent / 'db.json',
+        stdout=io.StringIO(),
+    )
+    assert Post.objects.exists()
+    assert not Post.objects.filter(updated_at__isnull=True).exists(), (
+        'Убедитесь, что loaddata заполняет updated_at публикаций.'
+    )
+
+
+@pytest.mark.django_db
+def test_db_json_fills_derived_data(client, tmp_path):
+    comments = tmp_path / 'comments.json'
+    comments.write_text(json.dumps([{
+        'model': 'blog.comment', 'pk': 1,
+        'fields': {
+            'text': 'Из фикстуры', 'post': 1, 'author': 3,
+            'created_at': '2022-12-19T00:00:00Z',
+        },
+    }]))
+    call_command(
+        'loaddata', settings.BASE_DIR.parent / 'db.json', comments,
+        stdout=io.StringIO(),
+    )
+    assert Post.objects.filter(is_visible=True).exists(), (
+        'Убедитесь, что loaddata пересчитывает is_visible.'
+    )
+    response = client.get('/')
+    assert response.context['page_obj'].paginator.count == (
+        Post.objects.filter(is_visible=True).count()
+    ), 'Убедитесь, что загруженные публикации видны в ленте.'
+    assert Post.objects.get(pk=1).comment_count == 1, (
+        'Убедитесь, что loaddata пересчитывает comment_count.'
+    )
+    if search.is_available():
+        assert search.search_posts(Post.objects.all(), 'Обед').filter(
+            pk=1
+        ).exists(), 'Убедитесь, что loaddata обновляет индекс поиска.'
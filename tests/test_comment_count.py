@@ -0,0 +1,105 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from blog.models import Comment, Post
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_views(
+        mixer: Mixer, user_client: Client, user, published_category
+):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        comment_count=0,
+    )
+    for text in ('Первый', 'Второй'):
+        user_client.post(f'/posts/{post.id}/comment', data={'text': text})
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        'Убедитесь, что при добавлении комментария увеличивается'
+        ' счётчик `comment_count` публикации.'
+    )
+
+    comment = Comment.objects.filter(post=post).first()
+    user_client.post(f'/posts/{post.id}/delete_comment/{comment.id}/')
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        'Убедитесь, что при удалении комментария уменьшается'
+        ' счётчик `comment_count` публикации.'
+    )
+
+
+@pytest.mark.django_db
+def test_recount_comments_command(mixer: Mixer, user, published_category):
+    post = mixer.blend('blog.Post', author=user, category=published_category)
+    mixer.cycle(3).blend('blog.Comment', post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=42)
+
+    call_command('recount_comments', stdout=StringIO())
+
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        'Убедитесь, что команда `recount_comments` пересчитывает'
+        ' счётчики комментариев.'
+    )
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_orm_changes(
+        mixer: Mixer, user, another_user, published_category
+):
+    first, second = mixer.cycle(2).blend(
+        'blog.Post', author=user, category=published_category,
+        comment_count=0,
+    )
+    comment = Comment.objects.create(post=first, author=user, text='Текст')
+    mixer.blend('blog.Comment', post=first, author=another_user)
+
+    comment = Comment.objects.get(pk=comment.pk)
+    comment.post = second
+    comment.save()
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert (first.comment_count, second.comment_count) == (1, 1), (
+        'Убедитесь, что перенос комментария в другую публикацию (например,'
+        ' в админке) переносит и счётчик `comment_count`.'
+    )
+
+    another_user.delete()
+    Post.objects.filter(pk=second.pk).update(comment_count=0)
+    comment.delete()
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert (first.comment_count, second.comment_count) == (0, 0), (
+        'Убедитесь, что каскадное удаление уменьшает счётчик, а счётчик'
+        ' не опускается ниже нуля.'
+    )
+
+
+@pytest.mark.django_db
+def test_post_delete_skips_comment_decrements(
+        mixer: Mixer, user, published_category
+):
+    post, other = mixer.cycle(2).blend(
+        'blog.Post', author=user, category=published_category,
+    )
+    mixer.cycle(5).blend('blog.Comment', post=post, author=user)
+    mixer.blend('blog.Comment', post=other, author=user)
+    with CaptureQueriesContext(connection) as queries:
+        post.delete()
+    assert not [
+        q for q in queries.captured_queries
+        if q['sql'].startswith('UPDATE "blog_post"')
+    ], (
+        'Убедитесь, что при удалении публикации её счётчик не уменьшается'
+        ' по одному запросу на каждый комментарий.'
+    )
+    Comment.objects.filter(post=other).delete()
+    other.refresh_from_db()
+    assert other.comment_count == 0
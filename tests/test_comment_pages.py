@@ -0,0 +1,50 @@
+from http import HTTPStatus
+
+import pytest
+
+from blog.config import COMMENT_SLICE
+
+
+@pytest.fixture
+def many_comments(mixer, post_with_published_location):
+    return mixer.cycle(COMMENT_SLICE + 5).blend(
+        'blog.Comment', post=post_with_published_location
+    )
+
+
+@pytest.mark.django_db
+def test_detail_page_shows_first_comments(
+        client, post_with_published_location, many_comments
+):
+    response = client.get(f'/posts/{post_with_published_location.id}/')
+    shown = response.context['comments']
+    assert len(shown) == COMMENT_SLICE, (
+        'Убедитесь, что на странице поста выводится только первая'
+        ' порция комментариев.'
+    )
+    page = response.context['comments_page']
+    assert page.next_cursor in response.content.decode('utf-8')
+
+    url = f'/posts/{post_with_published_location.id}/comments/'
+    fragment = client.get(f'{url}?after={page.next_cursor}')
+    assert fragment.status_code == HTTPStatus.OK
+    assert len(fragment.context['comments']) == 5
+    assert '<html' not in fragment.content.decode('utf-8')
+
+    data = client.get(
+        f'{url}?after={page.next_cursor}&format=json'
+    ).json()
+    expected = sorted(many_comments, key=lambda c: (c.created_at, c.id))
+    assert [item['id'] for item in data['comments']] == [
+        comment.id for comment in expected[COMMENT_SLICE:]
+    ]
+    assert data['next'] is None
+
+
+@pytest.mark.django_db
+def test_comments_endpoint_hides_unpublished_posts(
+        client, unpublished_posts_with_published_locations
+):
+    post = unpublished_posts_with_published_locations[0]
+    response = client.get(f'/posts/{post.id}/comments/')
+    assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,159 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from django.core.checks import run_checks
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from blog.cache import PAGES_VERSION, bump_version
+from blog.mixins import get_validators
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Часы версий кэша и get_validators."""
+    now = SimpleNamespace(value=time.time())
+    fake = SimpleNamespace(time=lambda: now.value)
+    monkeypatch.setattr('blog.cache.time', fake)
+    monkeypatch.setattr('blog.mixins.time', fake)
+    return now
+
+
+@pytest.mark.django_db
+def test_unchanged_pages_get_304(
+        client, clock, django_assert_num_queries, post_with_published_location
+):
+    post = post_with_published_location
+    for url in (
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{post.author.username}/',
+        f'/posts/{post.id}/',
+        '/api/v1/posts/',
+    ):
+        client.get(url)
+        # Секунда последнего изменения прошла: Last-Modified отдаётся.
+        clock.value += 2
+        response = client.get(url)
+        assert response.has_header('ETag') and response.has_header(
+            'Last-Modified'
+        ), f'Убедитесь, что страница {url} отдаёт ETag и Last-Modified.'
+
+        with django_assert_num_queries(0):
+            not_modified = client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        assert not_modified.status_code == 304, (
+            f'Убедитесь, что неизменившаяся страница {url} отвечает 304'
+            ' без запросов к базе.'
+        )
+        assert not_modified.content == b''
+        assert client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        ).status_code == 304
+
+
+@pytest.mark.django_db
+def test_validators_change_with_data(
+        client, user_client, post_with_published_location,
+        post_with_another_category, mixer
+):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    etag = client.get(url)['ETag']
+
+    assert user_client.get(url)['ETag'] != etag, (
+        'Убедитесь, что ETag зависит от пользователя.'
+    )
+
+    mixer.blend(
+        'blog.Comment', post=post_with_another_category, author=post.author
+    )
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304, (
+        'Убедитесь, что комментарий к другой публикации не меняет'
+        ' валидаторы этой.'
+    )
+
+    mixer.blend('blog.Comment', post=post, author=post.author)
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200 and response['ETag'] != etag, (
+        'Убедитесь, что новый комментарий меняет ETag публикации.'
+    )
+
+    etag = client.get('/')['ETag']
+    post.title = 'Новый заголовок'
+    post.save()
+    assert client.get('/', HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+        'Убедитесь, что изменение публикации меняет ETag ленты.'
+    )
+
+
+@pytest.mark.django_db
+def test_last_modified_changes_with_every_edit(rf, clock):
+    request = rf.get('/')
+    clock.value = 1000.2
+    bump_version(PAGES_VERSION)
+    clock.value = 1000.5
+    assert get_validators(request, (PAGES_VERSION,))[1] is None, (
+        'Убедитесь, что Last-Modified не отдаётся, пока не прошла секунда'
+        ' последнего изменения.'
+    )
+    clock.value = 1001.0
+    last_modified = get_validators(request, (PAGES_VERSION,))[1]
+    assert last_modified == 1001
+    bump_version(PAGES_VERSION)
+    clock.value = 1002.0
+    assert get_validators(request, (PAGES_VERSION,))[1] > last_modified, (
+        'Убедитесь, что каждое изменение меняет Last-Modified.'
+    )
+
+
+def test_version_cache_must_be_shared():
+    with override_settings(VERSION_CACHE='default'):
+        ids = {
+            message.id
+            for message in run_checks(include_deployment_checks=True)
+        }
+    assert 'blog.W001' in ids, (
+        'Убедитесь, что check --deploy предупреждает о кэше версий'
+        ' в памяти процесса.'
+    )
+
+
+@pytest.mark.django_db
+def test_relogin_gets_fresh_csrf_token(user, post_with_published_location):
+    user.set_password('password')
+    user.save()
+    client = Client(enforce_csrf_checks=True)
+
+    def login():
+        token = client.get('/auth/login/').context['csrf_token']
+        client.post('/auth/login/', {
+            'username': user.username, 'password': 'password',
+            'csrfmiddlewaretoken': token,
+        })
+
+    url = f'/posts/{post_with_published_location.id}/'
+    login()
+    response = client.get(url)
+    etag = response['ETag']
+    client.post('/auth/logout/', {
+        'csrfmiddlewaretoken': response.context['csrf_token'],
+    })
+    login()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        'Убедитесь, что после повторного входа страница с формой'
+        ' не отдаёт 304 со старым CSRF-токеном.'
+    )
+    assert not response.has_header('Last-Modified')
+    response = client.post(
+        reverse('blog:add_comment', args=[post_with_published_location.id]),
+        {'text': 'После входа', 'csrfmiddlewaretoken':
+            response.context['csrf_token']},
+    )
+    assert response.status_code == 302, (
+        'Убедитесь, что форма после повторного входа проходит проверку'
+        ' CSRF.'
+    )
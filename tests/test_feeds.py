@@ -0,0 +1,85 @@
+from xml.etree import ElementTree
+
+import pytest
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+
+
+def read(response):
+    assert response.status_code == 200
+    return b''.join(
+        response.streaming_content if response.streaming
+        else [response.content]
+    )
+
+
+@pytest.mark.django_db
+def test_site_feeds(
+        client, post_with_published_location,
+        unpublished_posts_with_published_locations
+):
+    post = post_with_published_location
+    rss = ElementTree.fromstring(read(client.get('/feeds/rss/')))
+    items = rss.findall('./channel/item')
+    assert [item.findtext('title') for item in items] == [post.title], (
+        'Убедитесь, что RSS-лента содержит только видимые публикации.'
+    )
+    assert items[0].findtext('link').endswith(f'/posts/{post.id}/')
+
+    atom = ElementTree.fromstring(read(client.get('/feeds/atom/')))
+    entries = atom.findall(f'{ATOM}entry')
+    assert [entry.findtext(f'{ATOM}title') for entry in entries] == [
+        post.title
+    ], 'Убедитесь, что Atom-лента содержит видимые публикации.'
+
+
+@pytest.mark.django_db
+def test_category_and_author_feeds(
+        client, post_with_published_location, post_with_another_category
+):
+    post = post_with_published_location
+    content = read(client.get(f'/feeds/category/{post.category.slug}/rss/'))
+    titles = [
+        item.findtext('title')
+        for item in ElementTree.fromstring(content).findall('./channel/item')
+    ]
+    assert titles == [post.title], (
+        'Убедитесь, что лента категории содержит только её публикации.'
+    )
+    content = read(client.get(f'/feeds/author/{post.author.username}/atom/'))
+    assert post.title.encode() in content
+    assert client.get('/feeds/category/no-such/rss/').status_code == 404
+    assert client.get('/feeds/author/no-such/rss/').status_code == 404
+    assert client.get('/feeds/json/').status_code == 404
+
+
+@pytest.mark.django_db
+def test_feeds_are_cached_and_conditional(
+        client, django_assert_num_queries, post_with_published_location,
+        mixer
+):
+    post = post_with_published_location
+    first = client.get('/feeds/rss/')
+    assert first.streaming, 'Убедитесь, что лента отдаётся по частям.'
+    content = read(first)
+
+    with django_assert_num_queries(0):
+        second = client.get('/feeds/rss/')
+        assert read(second) == content, (
+            'Убедитесь, что готовая лента берётся из кэша.'
+        )
+        assert client.get(
+            '/feeds/rss/', HTTP_IF_NONE_MATCH=second['ETag']
+        ).status_code == 304, (
+            'Убедитесь, что лента поддерживает условный GET.'
+        )
+
+    mixer.blend('blog.Comment', post=post, author=post.author)
+    assert client.get(
+        '/feeds/rss/', HTTP_IF_NONE_MATCH=second['ETag']
+    ).status_code == 200, (
+        'Убедитесь, что новый комментарий сбрасывает кэш ленты.'
+    )
+    post.title = 'Обновлённый заголовок'
+    post.save()
+    assert post.title.encode() in read(client.get('/feeds/rss/'))
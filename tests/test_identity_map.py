@@ -0,0 +1,51 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def object_selects(queries, table):
+    pattern = re.compile(
+        rf'^SELECT .* FROM "{table}" .*WHERE .*"{table}"."id" = '
+    )
+    return [
+        query['sql'] for query in queries.captured_queries
+        if pattern.match(query['sql'])
+    ]
+
+
+@pytest.fixture
+def own_comment(mixer, user, post_with_published_location):
+    return mixer.blend(
+        'blog.Comment', post=post_with_published_location, author=user
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url_template, table, num_queries', (
+    ('/posts/{post}/edit/', 'blog_post', 5),
+    ('/posts/{post}/delete/', 'blog_post', 4),
+    ('/posts/{post}/edit_comment/{comment}/', 'blog_comment', 3),
+    ('/posts/{post}/delete_comment/{comment}/', 'blog_comment', 3),
+))
+def test_edit_views_load_object_once(
+        user_client, own_comment, url_template, table, num_queries
+):
+    url = url_template.format(
+        post=own_comment.post_id, comment=own_comment.id
+    )
+    with CaptureQueriesContext(connection) as queries:
+        user_client.get(url)
+    assert len(object_selects(queries, table)) == 1, (
+        f'Убедитесь, что страница {url} загружает объект один раз за запрос.'
+    )
+    assert len(queries) == num_queries
+
+
+@pytest.mark.django_db
+def test_delete_comment_loads_comment_once(user_client, own_comment):
+    url = f'/posts/{own_comment.post_id}/delete_comment/{own_comment.id}/'
+    with CaptureQueriesContext(connection) as queries:
+        user_client.post(url)
+    assert len(object_selects(queries, 'blog_comment')) == 1
@@ -0,0 +1,120 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from blog.config import IMAGE_VARIANTS
+from blog.forms import PostForm
+from blog.images import ORIGINAL
+from jobs.queue import run_pending
+
+
+def make_image(width, height, name='photo.jpg'):
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), 'red').save(buffer, 'JPEG')
+    return SimpleUploadedFile(
+        name, buffer.getvalue(), content_type='image/jpeg'
+    )
+
+
+def save_post(author, category, image):
+    form = PostForm(
+        data={
+            'title': 'Фото', 'text': 'Текст', 'category': category.pk,
+            'pub_date': '2020-01-01 00:00', 'is_published': True,
+        },
+        files={'image': image},
+    )
+    assert form.is_valid(), form.errors
+    form.instance.author = author
+    post = form.save()
+    assert run_pending() == 1, (
+        'Убедитесь, что сборка копий картинки ставится в очередь задач.'
+    )
+    post.refresh_from_db()
+    return post
+
+
+@pytest.mark.django_db
+def test_post_form_builds_image_variants(user, published_category):
+    post = save_post(user, published_category, make_image(2000, 1000))
+
+    variants = post.image_variants
+    assert variants[ORIGINAL]['width'] == 2000, (
+        'Убедитесь, что размеры оригинала сохраняются вместе с копиями.'
+    )
+    for name, width in IMAGE_VARIANTS.items():
+        assert variants[name]['width'] == width, (
+            f'Убедитесь, что копия `{name}` уменьшается до ширины {width}.'
+        )
+        assert default_storage.exists(variants[name]['name']), (
+            'Убедитесь, что файлы копий сохраняются в хранилище.'
+        )
+    assert post.card_image['height'] == IMAGE_VARIANTS['card'] // 2, (
+        'Убедитесь, что копии сохраняют пропорции оригинала.'
+    )
+    assert post.image_srcset.count('w,') == len(IMAGE_VARIANTS) - 1, (
+        'Убедитесь, что srcset перечисляет все копии картинки.'
+    )
+
+    post.image = None
+    PostForm.update_image_variants(post)
+    assert not default_storage.exists(variants['card']['name']), (
+        'Убедитесь, что при удалении картинки удаляются и её копии.'
+    )
+    assert post.image_variants == {}, (
+        'Убедитесь, что без картинки список копий пуст.'
+    )
+    assert default_storage.exists(variants[ORIGINAL]['name']), (
+        'Убедитесь, что вместе с копиями не удаляется оригинал.'
+    )
+
+
+@pytest.mark.django_db
+def test_small_image_is_not_upscaled(user, published_category):
+    post = save_post(user, published_category, make_image(300, 200))
+    widths = {
+        variant['width'] for variant in post.image_variants.values()
+    }
+    assert widths == {300}, (
+        'Убедитесь, что копии не бывают шире оригинала.'
+    )
+    assert len({
+        variant['name'] for name, variant in post.image_variants.items()
+        if name != ORIGINAL
+    }) == 1, 'Убедитесь, что одинаковые по ширине копии не дублируются.'
+
+
+@pytest.mark.django_db
+def test_replaced_image_drops_old_variants(user, published_category):
+    post = save_post(user, published_category, make_image(2000, 1000))
+    old_card = post.image_variants['card']['name']
+
+    form = PostForm(
+        data={
+            'title': post.title, 'text': post.text,
+            'category': published_category.pk,
+            'pub_date': '2020-01-01 00:00', 'is_published': True,
+        },
+        files={'image': make_image(800, 600, 'other.jpg')},
+        instance=post,
+    )
+    assert form.is_valid(), form.errors
+    post = form.save()
+    post.refresh_from_db()
+    assert not default_storage.exists(old_card), (
+        'Убедитесь, что при замене картинки удаляются копии прежней.'
+    )
+    assert post.card_image['url'] == post.image.url, (
+        'Убедитесь, что до сборки копий показывается новый оригинал,'
+        ' а не копии прежней картинки.'
+    )
+    assert (post.card_image['width'], post.card_image['height']) == (
+        800, 600
+    ), 'Убедитесь, что до сборки копий известны размеры нового оригинала.'
+
+    assert run_pending() == 1
+    post.refresh_from_db()
+    assert post.image_variants['card']['width'] == IMAGE_VARIANTS['card']
@@ -0,0 +1,111 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from blog.fixtures_stream import iter_json_array
+from blog.models import Category, Location, Post
+
+FIXTURE = Path(__file__).resolve().parent.parent / 'db.json'
+EXCLUDE = ('admin', 'auth.permission', 'sessions', 'contenttypes')
+
+
+def load_fixture():
+    with open(FIXTURE, encoding='utf-8') as stream:
+        return json.load(stream)
+
+
+@pytest.mark.parametrize('chunk_size', (1, 7, 4096))
+def test_stream_parser_matches_json_module(chunk_size):
+    with open(FIXTURE, encoding='utf-8') as stream:
+        parsed = list(iter_json_array(stream, chunk_size=chunk_size))
+    assert parsed == load_fixture(), (
+        'Убедитесь, что потоковый разбор даёт те же объекты, что json.load.'
+    )
+
+
+def test_stream_parser_rejects_truncated_document():
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('[{"pk": 1}, {"pk"')))
+
+
+def import_fixture(*extra):
+    options = [
+        'import_data', str(FIXTURE), '--batch-size', '5',
+        '--progress-every', '10',
+    ]
+    for label in EXCLUDE:
+        options += ['--exclude', label]
+    output = io.StringIO()
+    call_command(*options, *extra, stdout=output)
+    return output.getvalue()
+
+
+@pytest.mark.django_db
+def test_import_data_loads_db_json():
+    output = import_fixture()
+    records = [
+        record for record in load_fixture()
+        if record['model'].startswith(('blog.', 'auth.user'))
+    ]
+    assert Post.objects.count() == sum(
+        record['model'] == 'blog.post' for record in records
+    )
+    assert Category.objects.count() == 6 and Location.objects.count() == 12
+    assert 'Загружено объектов: 10' in output, (
+        'Убедитесь, что импорт сообщает о ходе загрузки.'
+    )
+
+    record = next(r for r in records if r['model'] == 'blog.post')
+    post = Post.objects.get(pk=record['pk'])
+    assert post.created_at.isoformat().startswith(
+        record['fields']['created_at'][:19]
+    ), 'Убедитесь, что импорт сохраняет даты создания из файла.'
+    assert post.is_visible == post.check_visibility(), (
+        'Убедитесь, что после импорта пересчитывается Post.is_visible.'
+    )
+    assert Post.objects.filter(is_visible=True).exists()
+
+
+@pytest.mark.django_db
+def test_export_data_round_trip(tmp_path):
+    import_fixture()
+    target = tmp_path / 'export.json'
+    call_command(
+        'export_data', 'blog', 'auth.user', '--output', str(target),
+        '--chunk-size', '7', stderr=io.StringIO(),
+    )
+    exported = json.loads(target.read_text(encoding='utf-8'))
+    assert {record['model'] for record in exported} == {
+        'blog.category', 'blog.location', 'blog.post', 'auth.user'
+    }
+    assert len(exported) == Post.objects.count() + 6 + 12 + 4
+
+    Post.objects.all().delete()
+    call_command(
+        'import_data', str(target), '--skip-existing',
+        stdout=io.StringIO(),
+    )
+    assert Post.objects.count() == sum(
+        record['model'] == 'blog.post' for record in exported
+    ), 'Убедитесь, что выгрузку можно загрузить обратно.'
+
+
+@pytest.mark.django_db
+def test_import_data_rejects_dangling_references(tmp_path, user):
+    fixture = tmp_path / 'broken.json'
+    fixture.write_text(json.dumps([{
+        'model': 'blog.post', 'pk': 1,
+        'fields': {
+            'title': 'Сирота', 'text': 'Текст', 'author': user.pk,
+            'category': 100500, 'pub_date': '2020-01-01T00:00:00Z',
+            'is_published': True, 'created_at': '2020-01-01T00:00:00Z',
+        },
+    }]), encoding='utf-8')
+    with pytest.raises(CommandError):
+        call_command('import_data', str(fixture), stdout=io.StringIO())
+    assert not Post.objects.exists(), (
+        'Убедитесь, что импорт с битыми ссылками откатывается целиком.'
+    )
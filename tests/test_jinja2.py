@@ -0,0 +1,77 @@
+import io
+import re
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+
+from blog.mixins import FeedTemplatesMixin
+
+pytest.importorskip('jinja2')
+
+TEXT = 'Текст с "кавычками", <b>разметкой</b> & амперсандом\nи переносом\n'
+CSRF = re.compile(r'name="csrfmiddlewaretoken" value="[^"]+"')
+
+
+@pytest.fixture
+def feed_data(mixer, user, published_category, published_location):
+    posts = mixer.cycle(12).blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location, text=TEXT,
+        title="Заголовок с 'апострофом'",
+    )
+    mixer.cycle(3).blend(
+        'blog.Comment', post=posts[0], author=user, text=TEXT
+    )
+    return posts
+
+
+def render(client, url, monkeypatch, engine):
+    monkeypatch.setattr(FeedTemplatesMixin, 'template_engine', engine)
+    cache.clear()
+    response = client.get(url)
+    assert response.status_code == 200
+    django_templates = [
+        template.name for template in response.templates
+        if template.name.startswith(('blog/', 'includes/'))
+    ]
+    assert bool(django_templates) == (engine == 'django'), (
+        f'Убедитесь, что страница отрисована движком {engine}.'
+    )
+    return CSRF.sub('', response.content.decode())
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('client_name', ('client', 'user_client'))
+def test_jinja2_templates_match_django_byte_for_byte(
+        request, client_name, feed_data, published_category, user,
+        monkeypatch,
+):
+    client = request.getfixturevalue(client_name)
+    post = feed_data[0]
+    urls = (
+        reverse('blog:index'),
+        reverse('blog:index') + '?page=2',
+        reverse('blog:category_posts', args=[published_category.slug]),
+        reverse('blog:profile', args=[user.username]),
+        reverse('blog:search') + '?q=Заголовок',
+        reverse('blog:post_detail', args=[post.id]),
+        reverse('blog:post_comments', args=[post.id]),
+    )
+    for url in urls:
+        django_html = render(client, url, monkeypatch, 'django')
+        jinja2_html = render(client, url, monkeypatch, 'jinja2')
+        assert jinja2_html == django_html, (
+            f'Убедитесь, что шаблоны Jinja2 для `{url}` выводят тот же'
+            ' HTML, что и шаблоны Django.'
+        )
+
+
+@pytest.mark.django_db
+def test_benchmark_templates(feed_data):
+    out, err = io.StringIO(), io.StringIO()
+    call_command('benchmark_templates', 'blog/index.html', '--requests', '2',
+                 stdout=out, stderr=err)
+    assert out.getvalue().count('blog/index.html') == 4
+    assert not err.getvalue(), err.getvalue()
@@ -0,0 +1,113 @@
+import datetime
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from jobs.config import PRIORITY_HIGH, PRIORITY_LOW
+from jobs.models import Job
+from jobs.queue import claim, enqueue, requeue_stale, run_pending, stats
+
+CALLS = []
+
+
+def remember(value):
+    CALLS.append(value)
+
+
+def explode():
+    raise RuntimeError('Сбой задачи')
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    CALLS.clear()
+
+
+@pytest.mark.django_db
+def test_jobs_run_by_priority():
+    enqueue(remember, 'low', priority=PRIORITY_LOW)
+    enqueue(remember, 'normal')
+    enqueue(remember, 'high', priority=PRIORITY_HIGH)
+    enqueue(remember, 'later', delay=3600)
+
+    assert run_pending() == 3
+    assert CALLS == ['high', 'normal', 'low'], (
+        'Убедитесь, что задачи выполняются по убыванию приоритета,'
+        ' а отложенные ждут своего времени.'
+    )
+    assert Job.objects.filter(status=Job.DONE).count() == 3
+    assert Job.objects.get(status=Job.PENDING).args == ['later']
+
+
+@pytest.mark.django_db
+def test_claimed_job_is_not_claimed_again():
+    enqueue(remember, 'once')
+    job = claim()
+    assert job.status == Job.RUNNING and job.attempts == 1
+    assert claim() is None, (
+        'Убедитесь, что взятую воркером задачу не может взять другой.'
+    )
+
+
+@pytest.mark.django_db
+def test_failed_job_is_retried_with_backoff():
+    job = enqueue(explode, max_attempts=2)
+    run_pending()
+    job.refresh_from_db()
+    assert job.status == Job.PENDING and job.run_at > timezone.now(), (
+        'Убедитесь, что упавшая задача возвращается в очередь с паузой.'
+    )
+    assert 'Сбой задачи' in job.last_error
+
+    Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+    run_pending()
+    job.refresh_from_db()
+    assert job.status == Job.FAILED, (
+        'Убедитесь, что после max_attempts попыток задача помечается'
+        ' упавшей.'
+    )
+
+
+@pytest.mark.django_db
+def test_stale_jobs_are_requeued():
+    enqueue(remember, 'stale')
+    claim()
+    Job.objects.update(
+        started_at=timezone.now() - datetime.timedelta(hours=1)
+    )
+    assert requeue_stale(stale_after=60) == 1
+    assert run_pending() == 1 and CALLS == ['stale']
+
+
+@pytest.mark.django_db(transaction=True)
+def test_stats_and_runworker_command(capsys):
+    enqueue(remember, 'one')
+    enqueue(remember, 'two')
+    assert stats()['ready'] == 2
+
+    call_command('runworker', '--burst', '--threads', '1')
+    assert sorted(CALLS) == ['one', 'two']
+
+    result = stats()
+    assert result['counts'][Job.DONE] == 2 and result['ready'] == 0
+    assert result['finished'] == 2 and result['wait_avg'] is not None, (
+        'Убедитесь, что stats() считает задержку выполненных задач.'
+    )
+    call_command('jobstats')
+    assert 'Готово к выполнению: 0' in capsys.readouterr().out
+
+
+@pytest.mark.django_db
+def test_password_reset_mail_is_queued(user, mailoutbox, client):
+    user.email = 'reader@example.com'
+    user.save()
+    response = client.post(
+        '/auth/password_reset/', {'email': user.email}
+    )
+    assert response.status_code == 302
+    assert not mailoutbox, (
+        'Убедитесь, что письмо для сброса пароля отправляется в фоне.'
+    )
+    run_pending()
+    assert len(mailoutbox) == 1 and mailoutbox[0].to == [user.email]
@@ -0,0 +1,85 @@
+import datetime
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.mixins import PaginateMixin
+from conftest import N_PER_PAGE
+
+
+@pytest.fixture
+def keyset_mode(monkeypatch):
+    monkeypatch.setattr(PaginateMixin, 'pagination_mode', 'keyset')
+
+
+@pytest.mark.django_db
+def test_keyset_pagination_walks_feed(
+        keyset_mode, client, many_posts_with_published_locations
+):
+    expected = sorted(
+        many_posts_with_published_locations,
+        key=lambda post: (-post.pub_date.timestamp(), post.title, post.id)
+    )
+    response = client.get('/')
+    first_page = list(response.context['page_obj'])
+    assert [post.id for post in first_page] == [
+        post.id for post in expected[:N_PER_PAGE]
+    ]
+    next_cursor = response.context['page_obj'].next_cursor
+    assert f'?after={next_cursor}' in response.content.decode('utf-8'), (
+        'Убедитесь, что в курсорном режиме пагинатор выводит ссылку'
+        ' на более старые публикации.'
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f'/?after={next_cursor}')
+    second_page = list(response.context['page_obj'])
+    assert [post.id for post in second_page] == [
+        post.id for post in expected[N_PER_PAGE:]
+    ]
+    assert not any(
+        'COUNT(' in query['sql'] for query in queries.captured_queries
+    ), 'Курсорная пагинация не должна выполнять COUNT(*).'
+
+    previous_cursor = response.context['page_obj'].previous_cursor
+    response = client.get(f'/?before={previous_cursor}')
+    assert [post.id for post in response.context['page_obj']] == [
+        post.id for post in first_page
+    ]
+    assert not response.context['page_obj'].has_previous()
+
+
+@pytest.mark.django_db
+def test_keyset_pagination_rejects_broken_cursor(client):
+    response = client.get('/?after=not-a-cursor')
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_keyset_cursor_keeps_microseconds(
+        keyset_mode, client, mixer, user, published_category
+):
+    moment = timezone.now().replace(microsecond=0) - datetime.timedelta(
+        days=1
+    )
+    posts = mixer.cycle(N_PER_PAGE * 2).blend(
+        'blog.Post', author=user, category=published_category,
+        location=None,
+        pub_date=(
+            moment + datetime.timedelta(microseconds=step)
+            for step in range(N_PER_PAGE * 2)
+        ),
+    )
+    seen = []
+    url = '/'
+    while url:
+        page = client.get(url).context['page_obj']
+        seen += [post.id for post in page]
+        url = page.has_next() and f'/?after={page.next_cursor}'
+    assert sorted(seen) == sorted(post.id for post in posts), (
+        'Убедитесь, что курсор хранит время с микросекундами и публикации'
+        ' из одной миллисекунды не пропускаются.'
+    )
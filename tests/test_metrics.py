@@ -0,0 +1,176 @@
+import json
+import os
+import re
+import threading
+
+import pytest
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from blog import metrics
+
+SAMPLE = re.compile(r'^(?P<name>[a-z_]+)(?P<labels>\{.*\})? (?P<value>\S+)$')
+
+
+def scrape(client):
+    response = client.get(reverse('metrics'))
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+    samples = {}
+    for line in response.content.decode().splitlines():
+        if line.startswith('#'):
+            continue
+        match = SAMPLE.match(line)
+        assert match, f'Строка `{line}` не в формате Prometheus.'
+        samples[match['name'] + (match['labels'] or '')] = float(
+            match['value']
+        )
+    return samples
+
+
+def delta(before, after, key):
+    return after.get(key, 0) - before.get(key, 0)
+
+
+@pytest.mark.django_db
+def test_metrics_per_view(client, post_with_published_location):
+    url = reverse('blog:post_detail', args=[post_with_published_location.id])
+    before = scrape(client)
+    client.get(url)
+    client.get(url)
+    after = scrape(client)
+
+    view = '{view="blog:post_detail"}'
+    for name in (
+        'blog_request_duration_seconds_count',
+        'blog_db_queries_count',
+        'blog_db_duration_seconds_count',
+        'blog_response_size_bytes_count',
+    ):
+        assert delta(before, after, name + view) == 2, (
+            f'Убедитесь, что метрика `{name}` считается по представлению.'
+        )
+    assert delta(
+        before, after, 'blog_template_render_seconds_count' + view
+    ) == 1, (
+        'Убедитесь, что время шаблона измеряется, а ответ из кэша'
+        ' страниц не рендерится повторно.'
+    )
+    assert delta(before, after, (
+        'blog_requests_total{method="GET",status="200",'
+        'view="blog:post_detail"}'
+    )) == 2
+    assert delta(before, after, (
+        'blog_cache_requests_total{cache="page",result="hit"}'
+    )) == 1, 'Убедитесь, что считаются попадания в кэш страниц.'
+    assert 'blog_cache_hit_ratio{cache="page"}' in after
+
+
+def test_shards_are_summed_across_threads():
+    before = metrics.collect()['counters'].get(
+        ('blog_requests_total', (('view', 'test'),)), 0
+    )
+
+    def work():
+        for _ in range(1000):
+            metrics.inc('blog_requests_total', view='test')
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    after = metrics.collect()['counters'][
+        'blog_requests_total', (('view', 'test'),)
+    ]
+    assert after - before == 4000, (
+        'Убедитесь, что метрики потоков не теряются при сложении шардов.'
+    )
+    assert len(metrics._shards) <= threading.active_count(), (
+        'Убедитесь, что шарды завершившихся потоков не копятся.'
+    )
+    assert metrics.collect()['counters'][
+        'blog_requests_total', (('view', 'test'),)
+    ] == after
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='нужен os.fork')
+def test_forked_worker_gets_own_file(tmp_path):
+    metrics.inc('blog_requests_total', view='parent')
+    with override_settings(METRICS_DIR=tmp_path):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                metrics.inc('blog_requests_total', view='child')
+                metrics.flush(force=True)
+            finally:
+                os._exit(0)
+        os.waitpid(pid, 0)
+        metrics.flush(force=True)
+    files = {
+        path.name.split('-')[0]: json.loads(path.read_text())
+        for path in tmp_path.glob('*.json')
+    }
+    assert set(files) == {str(os.getpid()), str(pid)}, (
+        'Убедитесь, что дочерний процесс пишет метрики в свой файл.'
+    )
+    child = {tuple(labels[0]) for _, labels, _ in files[str(pid)]['counters']}
+    assert child == {('view', 'child')}, (
+        'Убедитесь, что после fork счётчики родителя не копируются.'
+    )
+
+
+@pytest.mark.django_db
+def test_multiprocess_files_are_merged(client, tmp_path):
+    other = {
+        'counters': [[
+            'blog_requests_total',
+            [['method', 'GET'], ['status', '200'], ['view', 'worker:2']],
+            5,
+        ]],
+        'histograms': [[
+            'blog_db_queries', [['view', 'worker:2']],
+            [0, 3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 3, 3],
+        ]],
+    }
+    (tmp_path / '99999-1.json').write_text(json.dumps(other))
+    with override_settings(METRICS_DIR=tmp_path):
+        samples = scrape(client)
+    assert samples[
+        'blog_requests_total{method="GET",status="200",view="worker:2"}'
+    ] == 5, 'Убедитесь, что /metrics складывает файлы всех процессов.'
+    assert samples['blog_db_queries_bucket{view="worker:2",le="1"}'] == 3
+    assert samples['blog_db_queries_bucket{view="worker:2",le="+Inf"}'] == 3
+    assert len(list(tmp_path.glob('*.json'))) == 2, (
+        'Убедитесь, что процесс сбрасывает свои метрики в METRICS_DIR.'
+    )
+
+
+@pytest.mark.django_db
+@override_settings(METRICS_ALLOWED_IPS=['10.0.0.1'], METRICS_TOKEN='secret')
+def test_metrics_are_not_public(client, user, another_user):
+    url = reverse('metrics')
+    assert client.get(url).status_code == 403, (
+        'Убедитесь, что /metrics недоступен посторонним.'
+    )
+    assert client.get(
+        url, HTTP_AUTHORIZATION='Bearer wrong'
+    ).status_code == 403
+    client.force_login(user)
+    assert client.get(url).status_code == 403, (
+        'Убедитесь, что /metrics недоступен обычным пользователям.'
+    )
+
+    assert client.get(
+        url, HTTP_AUTHORIZATION='Bearer secret'
+    ).status_code == 200, 'Убедитесь, что сборщик проходит по токену.'
+    assert Client(REMOTE_ADDR='10.0.0.1').get(url).status_code == 200, (
+        'Убедитесь, что /metrics доступен адресам METRICS_ALLOWED_IPS.'
+    )
+    staff = Client()
+    another_user.is_staff = True
+    another_user.save()
+    staff.force_login(another_user)
+    assert staff.get(url).status_code == 200, (
+        'Убедитесь, что /metrics доступен сотрудникам.'
+    )
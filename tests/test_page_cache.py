@@ -0,0 +1,42 @@
+import pytest
+
+
+@pytest.mark.django_db
+def test_anonymous_pages_are_cached(
+        client, django_assert_num_queries, post_with_published_location,
+        comment_to_a_post
+):
+    post = post_with_published_location
+    urls = (
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{post.author.username}/',
+        f'/posts/{post.id}/',
+    )
+    for url in urls:
+        first = client.get(url)
+        with django_assert_num_queries(0):
+            second = client.get(url)
+        assert second.content == first.content, (
+            f'Убедитесь, что страница {url} отдаётся анонимам из кэша.'
+        )
+
+    post.title = 'Заголовок после правки'
+    post.save()
+    for url in urls:
+        assert post.title in client.get(url).content.decode('utf-8'), (
+            'Убедитесь, что изменение публикации сбрасывает кэш страниц.'
+        )
+
+
+@pytest.mark.django_db
+def test_authenticated_pages_are_not_cached(
+        user_client, django_assert_max_num_queries,
+        post_with_published_location
+):
+    user_client.get('/')
+    with django_assert_max_num_queries(10) as queries:
+        user_client.get('/')
+    assert len(queries), (
+        'Страницы для авторизованных пользователей не должны кэшироваться.'
+    )
@@ -0,0 +1,72 @@
+import pytest
+from django.core.paginator import Paginator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.mixins import PaginateMixin
+from blog.pagination import CachedCountPaginator, page_window
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    return [q['sql'] for q in queries.captured_queries if 'COUNT(' in q['sql']]
+
+
+@pytest.mark.django_db
+def test_paginator_count_is_cached(
+        client, mixer, user, published_category,
+        many_posts_with_published_locations
+):
+    assert len(count_queries(client, '/')) == 1
+    assert not count_queries(client, '/?page=2'), (
+        'Убедитесь, что число публикаций для пагинатора берётся из кэша.'
+    )
+
+    mixer.blend('blog.Post', author=user, category=published_category)
+    assert len(count_queries(client, '/')) == 1, (
+        'Убедитесь, что кэш числа публикаций сбрасывается'
+        ' при изменении публикаций.'
+    )
+    response = client.get('/?page=3')
+    assert len(response.context['page_obj']) == 1
+
+
+@pytest.mark.parametrize('number, expected', [
+    (1, [1, 2, 3, None, 20]),
+    (5, [1, 2, 3, 4, 5, 6, 7, None, 20]),
+    (10, [1, None, 8, 9, 10, 11, 12, None, 20]),
+    (20, [1, None, 18, 19, 20]),
+])
+def test_page_window(number, expected):
+    page = Paginator(range(200), 10).page(number)
+    assert page_window(page) == expected
+
+
+def test_page_window_without_exact_count():
+    paginator = CachedCountPaginator(range(200), 10, count_window=2)
+    page = paginator.page(5)
+    assert paginator.count == 71, (
+        'Убедитесь, что считаются только строки до конца окна.'
+    )
+    assert not paginator.count_is_exact
+    assert page_window(page) == [1, 2, 3, 4, 5, 6, 7, None]
+
+
+@pytest.mark.django_db
+def test_feed_without_exact_count(
+        client, monkeypatch, many_posts_with_published_locations
+):
+    monkeypatch.setattr(PaginateMixin, 'exact_count', False)
+    monkeypatch.setattr('blog.mixins.PAGINATION_WINDOW', 0)
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get('/')
+    counts = [
+        q['sql'] for q in queries.captured_queries if 'COUNT(' in q['sql']
+    ]
+    assert len(counts) == 1 and 'LIMIT 11' in counts[0], (
+        'Убедитесь, что без точного подсчёта COUNT ограничен окном страниц.'
+    )
+    content = response.content.decode()
+    assert 'Последняя' not in content
+    assert '…' in content
@@ -0,0 +1,82 @@
+import io
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from django.test.client import Client
+from django.urls import reverse
+
+from blog import profiling
+
+
+@pytest.fixture
+def profile_dir(tmp_path):
+    with override_settings(PROFILING_DIR=tmp_path, PROFILING_KEEP=3):
+        yield tmp_path
+
+
+def profiled_client():
+    header = {'HTTP_X_PROFILE': profiling.make_token()}
+    return Client(**header)
+
+
+@pytest.mark.django_db
+def test_signed_header_writes_profile(
+        profile_dir, post_with_published_location
+):
+    url = reverse('blog:post_detail', args=[post_with_published_location.id])
+    response = profiled_client().get(url)
+    assert response.status_code == 200
+    files = profiling.iter_profiles(profile_dir)
+    assert [profiling.view_of(path) for path in files] == [
+        'blog:post_detail'
+    ], 'Убедитесь, что запрос с подписанным заголовком профилируется.'
+
+    out = io.StringIO()
+    call_command('profile_summary', '--sort', 'cumulative', '--limit', '40',
+                 stdout=out)
+    summary = out.getvalue()
+    assert 'blog:post_detail: запросов 1' in summary
+    assert 'render' in summary, (
+        'Убедитесь, что в профиль попадает рендеринг шаблона.'
+    )
+
+
+@pytest.mark.django_db
+def test_unsigned_requests_are_not_profiled(profile_dir, client):
+    client.get(reverse('blog:index'), HTTP_X_PROFILE='profile')
+    client.get(reverse('blog:index'))
+    assert not profiling.iter_profiles(profile_dir), (
+        'Убедитесь, что без верной подписи и при нулевой доле выборки'
+        ' запросы не профилируются.'
+    )
+    with pytest.raises(CommandError):
+        call_command('profile_summary', stdout=io.StringIO())
+
+
+@pytest.mark.django_db
+def test_sampling_and_rotation(profile_dir, client):
+    with override_settings(PROFILING_SAMPLE_RATE=1.0):
+        for _ in range(5):
+            client.get(reverse('pages:about'))
+    files = profiling.iter_profiles(profile_dir)
+    assert len(files) == 3, (
+        'Убедитесь, что в каталоге остаются только PROFILING_KEEP'
+        ' последних профилей.'
+    )
+    assert {profiling.view_of(path) for path in files} == {'pages:about'}
+
+
+@pytest.mark.django_db
+def test_streaming_body_is_profiled(
+        profile_dir, post_with_published_location
+):
+    response = profiled_client().get(
+        reverse('blog:feed', args=['rss'])
+    )
+    assert not profiling.iter_profiles(profile_dir), (
+        'Профиль потокового ответа должен записываться после чтения тела.'
+    )
+    b''.join(response.streaming_content)
+    files = profiling.iter_profiles(profile_dir)
+    assert [profiling.view_of(path) for path in files] == ['blog:feed']
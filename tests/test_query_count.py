@@ -0,0 +1,90 @@
+import logging
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, reverse
+
+from blog import urls as blog_urls
+from blog.middleware import QueryBudgetExceeded
+
+SIZES = (1, 10, 100)
+
+
+def iter_url_names(patterns, namespace='blog'):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_url_names(pattern.url_patterns, namespace)
+        elif isinstance(pattern, URLPattern):
+            yield (
+                f'{namespace}:{pattern.name}',
+                tuple(pattern.pattern.converters),
+            )
+
+
+def seed(mixer, user, category, post, count):
+    missing = count - post.author.posts.count()
+    if missing > 0:
+        mixer.cycle(missing).blend(
+            'blog.Post', author=user, category=category
+        )
+    missing = count - post.comments.count()
+    if missing > 0:
+        mixer.cycle(missing).blend('blog.Comment', post=post, author=user)
+
+
+def measure(client, url):
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    return len(queries)
+
+
+@pytest.mark.django_db
+def test_blog_urls_run_constant_queries(
+        mixer, user, user_client, published_category
+):
+    post = mixer.blend('blog.Post', author=user, category=published_category)
+    comment = mixer.blend('blog.Comment', post=post, author=user)
+    url_kwargs = {
+        'post_id': post.id,
+        'comment_id': comment.id,
+        'username': user.username,
+        'category_slug': published_category.slug,
+        'feed_format': 'rss',
+    }
+    urls = {
+        name: reverse(name, kwargs={key: url_kwargs[key] for key in keys})
+        for name, keys in iter_url_names(blog_urls.urlpatterns)
+    }
+
+    counts = {name: [] for name in urls}
+    for size in SIZES:
+        seed(mixer, user, published_category, post, size)
+        for name, url in urls.items():
+            counts[name].append(measure(user_client, url))
+
+    for name, per_size in counts.items():
+        assert len(set(per_size)) == 1, (
+            f'Число SQL-запросов страницы `{name}` зависит от объёма данных'
+            f' ({dict(zip(SIZES, per_size))}). Проверьте select_related'
+            ' и шаблоны на запросы N+1.'
+        )
+
+
+@pytest.mark.django_db
+def test_query_budget_middleware(user_client, caplog):
+    with override_settings(QUERY_BUDGETS={'blog:index': 0}):
+        with caplog.at_level(logging.WARNING, logger='blog.middleware'):
+            user_client.get('/')
+    assert 'blog:index' in caplog.text, (
+        'Убедитесь, что превышение бюджета запросов попадает в лог.'
+    )
+
+    with override_settings(
+            QUERY_BUDGETS={'blog:index': 0}, QUERY_BUDGET_RAISE=True
+    ):
+        with pytest.raises(QueryBudgetExceeded):
+            user_client.get('/')
@@ -0,0 +1,47 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+FULL_SCAN = re.compile(r'^SCAN (?!.*\bUSING\b)')
+TEMP_SORT = 'USE TEMP B-TREE'
+
+
+@pytest.fixture
+def feed_urls(
+        post_with_published_location, comment_to_a_post, published_category
+):
+    post = post_with_published_location
+    return (
+        '/',
+        f'/category/{published_category.slug}/',
+        f'/profile/{post.author.username}/',
+        f'/posts/{post.id}/',
+    )
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='План запроса проверяется в SQLite'
+)
+@pytest.mark.django_db
+@pytest.mark.parametrize('client_name', ('client', 'user_client'))
+def test_feed_queries_use_indexes(request, client_name, feed_urls):
+    client = request.getfixturevalue(client_name)
+    for url in feed_urls:
+        with CaptureQueriesContext(connection) as queries:
+            client.get(url)
+        for query in queries.captured_queries:
+            if not query['sql'].startswith('SELECT'):
+                continue
+            for step in explain(query['sql']):
+                assert not FULL_SCAN.match(step) and TEMP_SORT not in step, (
+                    f'Запрос страницы {url} выполняется без индекса: '
+                    f'{step}\n{query["sql"]}'
+                )
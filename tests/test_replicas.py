@@ -0,0 +1,124 @@
+import io
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connections
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from blog import metrics
+from blog.middleware import QueryBudgetExceeded
+
+REPLICA = 'replica'
+
+replica_db = pytest.mark.django_db(
+    transaction=True, databases=['default', REPLICA]
+)
+
+
+@pytest.fixture
+def replica_file(tmp_path):
+    """Реплика в отдельном файле SQLite вместо зеркала default."""
+    connection = connections[REPLICA]
+    name = connection.settings_dict['NAME']
+    connection.close()
+    connection.settings_dict['NAME'] = str(tmp_path / 'replica.sqlite3')
+    try:
+        with override_settings(DATABASE_REPLICAS=[REPLICA]):
+            yield connection
+    finally:
+        connection.close()
+        connection.settings_dict['NAME'] = name
+
+
+def post_queries(connection, client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    return response, [
+        q['sql'] for q in queries.captured_queries
+        if 'FROM "blog_post"' in q['sql']
+    ]
+
+
+@replica_db
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+@pytest.mark.parametrize('url', [
+    '/',
+    '/category/{category.slug}/',
+    '/profile/{user.username}/',
+    '/posts/{post.id}/',
+])
+def test_pages_read_from_replica(url, user, published_category, mixer):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        location=None,
+    )
+    url = url.format(category=published_category, user=user, post=post)
+    client = Client()
+    with CaptureQueriesContext(connections['default']) as primary:
+        response, replica = post_queries(connections[REPLICA], client, url)
+    assert response.status_code == 200
+    assert replica, 'Убедитесь, что страница читает публикации с реплики.'
+    assert not [
+        q for q in primary.captured_queries if 'blog_post' in q['sql']
+    ], 'Убедитесь, что чтение страницы не идёт в основную базу.'
+
+
+@replica_db
+def test_read_after_write_stays_on_primary(
+        replica_file, user, published_category, mixer
+):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        location=None,
+    )
+    call_command('sync_replicas', stdout=io.StringIO())
+    client = Client()
+    client.force_login(user)
+    url = reverse('blog:post_detail', args=[post.id])
+
+    response = client.post(
+        reverse('blog:add_comment', args=[post.id]), {'text': 'Свежий'}
+    )
+    assert settings.REPLICA_PIN_COOKIE in response.cookies, (
+        'Убедитесь, что после записи ставится cookie чтения с основной'
+        ' базы.'
+    )
+    assert 'Свежий' in client.get(url).content.decode(), (
+        'Убедитесь, что автор сразу видит свой комментарий.'
+    )
+
+    other = Client()
+    other.force_login(user)
+    assert 'Свежий' not in other.get(url).content.decode(), (
+        'Убедитесь, что без cookie страница читается с реплики.'
+    )
+    call_command('sync_replicas', stdout=io.StringIO())
+    assert 'Свежий' in other.get(url).content.decode(), (
+        'Убедитесь, что sync_replicas копирует основную базу в реплику.'
+    )
+
+
+@replica_db
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+def test_replica_queries_are_measured(user, published_category, mixer):
+    mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        location=None,
+    )
+    key = ('blog_db_queries', (('view', 'blog:index'),))
+    before = metrics.collect()['histograms'].get(key, [0, 0])[-2]
+    Client().get('/')
+    after = metrics.collect()['histograms'][key][-2]
+    assert after > before, (
+        'Убедитесь, что метрики blog_db_* учитывают запросы к репликам.'
+    )
+
+    with override_settings(
+            QUERY_BUDGETS={'blog:index': 0}, QUERY_BUDGET_RAISE=True
+    ):
+        with pytest.raises(QueryBudgetExceeded):
+            # Другой ключ кэша страниц, чтобы запросы выполнились.
+            Client().get('/?page=1')
@@ -0,0 +1,70 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from blog.search import stem
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='Поиск FTS5 работает в SQLite'
+)
+
+
+@pytest.mark.parametrize('word, expected', (
+    ('книги', 'книг'),
+    ('красивая', 'красив'),
+    ('публикации', 'публикац'),
+    ('прогулявшись', 'прогуля'),
+    ('ответственность', 'ответствен'),
+))
+def test_russian_stemmer(word, expected):
+    assert stem(word) == expected
+
+
+@pytest.fixture
+def searchable_posts(mixer, user, published_category):
+    return {
+        'title': mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            title='Прогулки по набережной', text='Про реку.'
+        ),
+        'text': mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            title='Выходные', text='Долгая прогулка вдоль набережных.'
+        ),
+        'draft': mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            is_published=False, title='Прогулка', text='Черновик.'
+        ),
+        'other': mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            title='Кулинария', text='Рецепт пирога.'
+        ),
+    }
+
+
+@pytest.mark.django_db
+def test_search_ranks_and_hides_drafts(client, searchable_posts):
+    response = client.get('/search/', {'q': 'прогулка набережная'})
+    found = [post.id for post in response.context['page_obj']]
+    assert found == [
+        searchable_posts['title'].id, searchable_posts['text'].id
+    ], (
+        'Убедитесь, что поиск учитывает словоформы, ставит совпадения'
+        ' в заголовке выше и не показывает неопубликованные посты.'
+    )
+
+
+@pytest.mark.django_db
+def test_search_index_follows_changes(client, searchable_posts):
+    post = searchable_posts['other']
+    post.text = 'Теперь здесь про прогулки.'
+    post.save()
+    response = client.get('/search/', {'q': 'прогулками'})
+    assert post in response.context['page_obj']
+
+    post.delete()
+    call_command('rebuild_search_index', stdout=StringIO())
+    response = client.get('/search/', {'q': 'пирог'})
+    assert not list(response.context['page_obj'])
@@ -0,0 +1,59 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Post
+
+
+@pytest.mark.django_db
+def test_scheduled_post_becomes_visible(future_posts):
+    post = future_posts[0]
+    assert not post.is_visible, (
+        'Убедитесь, что отложенная публикация не видна в ленте.'
+    )
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1)
+    )
+
+    call_command('publish_scheduled', stdout=StringIO())
+
+    post.refresh_from_db()
+    assert post.is_visible, (
+        'Убедитесь, что команда `publish_scheduled` открывает публикации,'
+        ' дата которых наступила.'
+    )
+
+
+@pytest.mark.django_db
+def test_category_change_updates_visibility(
+        post_with_published_location, published_category
+):
+    assert post_with_published_location.is_visible
+    published_category.is_published = False
+    published_category.save()
+
+    post_with_published_location.refresh_from_db()
+    assert not post_with_published_location.is_visible, (
+        'Убедитесь, что снятие категории с публикации скрывает её посты.'
+    )
+
+    published_category.is_published = True
+    published_category.save()
+    post_with_published_location.refresh_from_db()
+    assert post_with_published_location.is_visible
+
+
+@pytest.mark.django_db
+def test_visible_to_resolves_drafts_in_one_query(
+        user, another_user, unpublished_posts_with_published_locations,
+        django_assert_num_queries
+):
+    draft = unpublished_posts_with_published_locations[0]
+    with django_assert_num_queries(1):
+        assert Post.objects.visible_to(user).filter(pk=draft.pk).exists()
+    assert not Post.objects.visible_to(another_user).filter(
+        pk=draft.pk
+    ).exists(), 'Черновик не должен быть виден другим пользователям.'